@@ -384,13 +384,18 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
-REGISTRY="parallelus/manuals/subagent-registry.json"
-MANAGER_CMD="$(git rev-parse --show-toplevel)/parallelus/engine/bin/subagent_manager.sh"
+BIN_DIR="$(git rev-parse --show-toplevel)/parallelus/engine/bin"
+MANAGER_CMD="$BIN_DIR/subagent_manager.sh"
 STATUS_CMD=("$MANAGER_CMD" status)
 if [[ -n "$FILTER_ID" ]]; then
   STATUS_CMD+=("--id" "$FILTER_ID")
 fi
 
+# Run python3 with subagent_registry importable so rows come from the store.
+registry_python() {
+  PYTHONPATH="$BIN_DIR${PYTHONPATH:+:$PYTHONPATH}" python3 "$@"
+}
+
 trap 'echo; echo "Exiting monitor loop."' INT
 
 printf "Monitoring subagents (interval=%ss, log-threshold=%ss, runtime-threshold=%ss). Press Ctrl+C to exit." "$INTERVAL" "$THRESHOLD" "$RUNTIME_THRESHOLD"
@@ -408,21 +413,17 @@ while true; do
   output=$("${STATUS_CMD[@]}")
   if ! grep -q ' running ' <<<"$output"; then
     echo "$output"
-    pending_ids=$(python3 - <<'PY' "$REGISTRY" "$FILTER_ID"
-import json
+    pending_ids=$(registry_python - <<'PY' "$FILTER_ID"
 import sys
 
-registry_path, filter_id = sys.argv[1:3]
-try:
-    with open(registry_path, "r", encoding="utf-8") as fh:
-        entries = json.load(fh)
-except FileNotFoundError:
-    entries = []
+from subagent_registry import open_registry
+
+filter_id = sys.argv[1]
+with open_registry() as registry:
+    entries = registry.find(entry_id=filter_id or None)
 
 pending = []
 for row in entries:
-    if filter_id and row.get("id") != filter_id:
-        continue
     deliverables = row.get("deliverables") or []
     if not deliverables:
         continue
@@ -443,7 +444,7 @@ PY
     echo "No running subagents detected. Exiting monitor loop."
     break
   fi
-formatted=$(MONITOR_NOW_ISO="$now_iso" MONITOR_TABLE="$output" MONITOR_REGISTRY="$REGISTRY" python3 - "$THRESHOLD" "$RUNTIME_THRESHOLD" <<'PY'
+formatted=$(MONITOR_NOW_ISO="$now_iso" MONITOR_TABLE="$output" registry_python - "$THRESHOLD" "$RUNTIME_THRESHOLD" <<'PY'
 import datetime
 import json
 import os
@@ -459,14 +460,14 @@ if now_iso:
         current_dt = datetime.datetime.fromisoformat(now_iso.replace("Z", "+00:00"))
     except Exception:
         current_dt = None
-registry_path = os.environ.get("MONITOR_REGISTRY")
 registry_entries = []
-if registry_path and os.path.exists(registry_path):
-    try:
-        with open(registry_path, "r", encoding="utf-8") as fh:
-            registry_entries = json.load(fh)
-    except Exception:
-        registry_entries = []
+try:
+    from subagent_registry import open_registry
+
+    with open_registry() as registry:
+        registry_entries = registry.find()
+except (Exception, SystemExit):
+    registry_entries = []
 entry_map = {row.get("id"): row for row in registry_entries if isinstance(row, dict)}
 lines = table.splitlines()
 
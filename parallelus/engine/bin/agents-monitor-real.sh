@@ -9,7 +9,6 @@ ROOT=$(git rev-parse --show-toplevel 2>/dev/null || pwd)
 REPO_ROOT="$ROOT"
 cd "$ROOT"
 
-REGISTRY="$ROOT/parallelus/manuals/subagent-registry.json"
 SUBAGENT_MANAGER="$ROOT/parallelus/engine/bin/subagent_manager.sh"
 TEMPLATE_SCOPE_DIR="$ROOT/tests/guardrails/real_monitor/scopes"
 TEMPLATE_SCRIPT_DIR="$ROOT/tests/guardrails/real_monitor/scripts"
@@ -170,14 +169,20 @@ scenario_slug() {
   printf 'real-%s\n' "$1"
 }
 
+# Run python3 with subagent_registry importable so rows come from the store.
+registry_python() {
+  PYTHONPATH="$ROOT/parallelus/engine/bin${PYTHONPATH:+:$PYTHONPATH}" python3 "$@"
+}
+
 get_entry_field() {
   local entry_id=$1
   local field=$2
-  python3 - "$REGISTRY" "$entry_id" "$field" <<'PY'
-import json, sys
-registry_path, entry_id, field = sys.argv[1:4]
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
+  registry_python - "$entry_id" "$field" <<'PY'
+import sys
+from subagent_registry import open_registry
+entry_id, field = sys.argv[1:3]
+with open_registry() as registry:
+    data = registry.find(entry_id=entry_id)
 for row in data:
     if row.get("id") == entry_id:
         value = row
@@ -197,12 +202,12 @@ PY
 }
 
 has_running_entries() {
-  python3 - "$REGISTRY" "${ENTRY_IDS[@]}" <<'PY'
-import json, sys
-registry_path = sys.argv[1]
-ids = set(sys.argv[2:])
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
+  registry_python - "${ENTRY_IDS[@]}" <<'PY'
+import sys
+from subagent_registry import open_registry
+ids = set(sys.argv[1:])
+with open_registry() as registry:
+    data = registry.find(status="running")
 for row in data:
     if row.get("id") in ids and row.get("status") == "running":
         sys.exit(0)
@@ -225,16 +230,14 @@ require_scenario_ready() {
   local scenario=$1
   local slug
   slug=$(scenario_slug "$scenario")
-  python3 - "$REGISTRY" "$slug" <<'PY' || return 1
-import json
+  registry_python - "$slug" <<'PY' || return 1
 import sys
 
-path, slug = sys.argv[1:3]
-try:
-    with open(path, "r", encoding="utf-8") as fh:
-        data = json.load(fh)
-except FileNotFoundError:
-    data = []
+from subagent_registry import open_registry
+
+slug = sys.argv[1]
+with open_registry() as registry:
+    data = registry.find(slug=slug)
 
 running = []
 stale = []
@@ -267,11 +270,12 @@ record_entry() {
   local entry_id=$1
   local scenario=$2
   local entry_json
-  entry_json=$(python3 - "$REGISTRY" "$entry_id" <<'PY'
+  entry_json=$(registry_python - "$entry_id" <<'PY'
 import json, sys
-path, entry_id = sys.argv[1:3]
-with open(path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
+from subagent_registry import open_registry
+entry_id = sys.argv[1]
+with open_registry() as registry:
+    data = registry.find(entry_id=entry_id)
 for row in data:
     if row.get("id") == entry_id:
         print(json.dumps(row))
@@ -645,11 +649,12 @@ finalize_entries() {
     fi
 
     local review_targets
-    review_targets=$(python3 - "$REGISTRY" "$entry_id" <<'PY'
-import json, sys
-registry_path, entry_id = sys.argv[1:3]
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
+    review_targets=$(registry_python - "$entry_id" <<'PY'
+import sys
+from subagent_registry import open_registry
+entry_id = sys.argv[1]
+with open_registry() as registry:
+    data = registry.find(entry_id=entry_id)
 for row in data:
     if row.get("id") == entry_id:
         for deliverable in row.get("deliverables") or []:
@@ -62,3 +62,12 @@ parallelus_resolve_session_dir() {
 
   printf '%s/%s\n' "$(parallelus_sessions_write_root "$repo_root")" "$session_id"
 }
+
+# Print a PARALLELUS_REPO_CONTEXT snapshot (top level, HEAD, branch, cwd) using
+# one git call; see parallelus_repo_context.py. Fails outside a repository or
+# before the first commit, where callers fall back to their own git queries.
+parallelus_repo_context_snapshot() {
+  local facts
+  facts="$(git rev-parse --show-toplevel HEAD --abbrev-ref HEAD 2>/dev/null)" || return 1
+  printf '%s\n%s' "$facts" "$PWD"
+}
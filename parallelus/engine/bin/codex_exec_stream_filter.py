@@ -2,12 +2,20 @@
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import os
 import re
+import signal
 import sys
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+from parallelus_jsonl import loads
+from parallelus_redaction import redact_text
 
 
 def _write_text(path: str, content: str) -> None:
@@ -16,10 +24,330 @@ def _write_text(path: str, content: str) -> None:
         fh.write(content)
 
 
-def _append_bytes(path: str, data: bytes) -> None:
+def _replace_text(path: str, content: str) -> None:
     os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-    with open(path, "ab") as fh:
-        fh.write(data)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(content)
+    os.replace(tmp, path)
+
+
+class _ExecMetrics:
+    """Cumulative counters derived from the exec event stream.
+
+    Command wall time is measured between the arrival of ``item.started`` and
+    ``item.completed`` for the same item id, since exec events carry no
+    timestamps of their own.
+    """
+
+    def __init__(self, *, slowest: int = 5) -> None:
+        self.started_at = time.time()
+        self.session_id: Optional[str] = None
+        self.events = 0
+        self.turns = 0
+        self.input_tokens = 0
+        self.cached_input_tokens = 0
+        self.output_tokens = 0
+        self.commands_started = 0
+        self.commands_completed = 0
+        self.commands_nonzero_exit = 0
+        self.items_failed = 0
+        self.turns_failed = 0
+        self.command_seconds = 0.0
+        self.display_lines_dropped = 0
+        self._slowest_limit = slowest
+        self._slowest: list[tuple[float, int, dict[str, Any]]] = []
+        self._timed = 0
+        self._running: dict[str, float] = {}
+
+    def observe(self, evt: dict[str, Any], now: float) -> None:
+        self.events += 1
+        typ = evt.get("type")
+        if typ == "thread.started" and self.session_id is None:
+            tid = evt.get("thread_id")
+            if isinstance(tid, str) and tid:
+                self.session_id = tid
+        elif typ == "turn.completed":
+            self.turns += 1
+            usage = evt.get("usage") or {}
+            self.input_tokens += int(usage.get("input_tokens") or 0)
+            self.cached_input_tokens += int(usage.get("cached_input_tokens") or 0)
+            self.output_tokens += int(usage.get("output_tokens") or 0)
+        elif typ == "turn.failed":
+            self.turns_failed += 1
+        elif typ in {"item.started", "item.completed", "item.failed"}:
+            item = evt.get("item") or {}
+            if item.get("type") != "command_execution":
+                if typ == "item.failed":
+                    self.items_failed += 1
+                return
+            item_id = str(item.get("id") or "")
+            if typ == "item.started":
+                self.commands_started += 1
+                if item_id:
+                    self._running[item_id] = now
+                return
+            started = self._running.pop(item_id, None) if item_id else None
+            exit_code = item.get("exit_code")
+            if typ == "item.failed":
+                self.items_failed += 1
+            else:
+                self.commands_completed += 1
+                if exit_code not in (None, 0):
+                    self.commands_nonzero_exit += 1
+            if started is not None:
+                self._record_duration(item, now - started, exit_code if typ == "item.completed" else "failed")
+
+    def _record_duration(self, item: dict[str, Any], seconds: float, exit_code: Any) -> None:
+        self.command_seconds += seconds
+        self._timed += 1
+        entry = {
+            "command": _display_command(item.get("command")),
+            "seconds": round(seconds, 3),
+            "exit_code": exit_code,
+        }
+        key = (seconds, self._timed, entry)
+        if len(self._slowest) < self._slowest_limit:
+            heapq.heappush(self._slowest, key)
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, key)
+
+    def snapshot(self) -> dict[str, Any]:
+        total_input = self.input_tokens
+        timed = self._timed
+        return {
+            "version": 1,
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "elapsed_seconds": round(time.time() - self.started_at, 3),
+            "session_id": self.session_id,
+            "events": self.events,
+            "turns": self.turns,
+            "tokens": {
+                "input": self.input_tokens,
+                "cached_input": self.cached_input_tokens,
+                "output": self.output_tokens,
+            },
+            "cache_hit_ratio": round(self.cached_input_tokens / total_input, 4) if total_input else None,
+            "commands": {
+                "started": self.commands_started,
+                "completed": self.commands_completed,
+                "running": len(self._running),
+                "wall_seconds": round(self.command_seconds, 3),
+                "mean_seconds": round(self.command_seconds / timed, 3) if timed else None,
+            },
+            "slowest_commands": [entry for _, _, entry in sorted(self._slowest, key=lambda k: (-k[0], k[1]))],
+            "failures": {
+                "commands_nonzero_exit": self.commands_nonzero_exit,
+                "items_failed": self.items_failed,
+                "turns_failed": self.turns_failed,
+            },
+            "display_lines_dropped": self.display_lines_dropped,
+        }
+
+
+class _CaptureWriter:
+    """Buffered event capture plus deferred last-message and metrics snapshots.
+
+    The events file stays open for the whole run; its buffer is written out
+    whenever it fills (``flush_bytes``), and a background thread flushes all
+    outputs at most ``flush_interval`` seconds after they change, so tailers
+    keep seeing progress while the pipe is idle. ``close`` flushes everything
+    and is also run from the SIGTERM/SIGHUP handler, so a killed subagent
+    keeps the tail of its capture.
+    """
+
+    def __init__(
+        self,
+        events_path: Optional[str],
+        last_message_path: Optional[str],
+        *,
+        flush_bytes: int,
+        flush_interval: float,
+        metrics_path: Optional[str] = None,
+        dropped_lines: Optional[Callable[[], int]] = None,
+    ) -> None:
+        # Re-entrant: the signal handler may run while the main thread holds it.
+        self._lock = threading.RLock()
+        self._events = None
+        if events_path:
+            os.makedirs(os.path.dirname(events_path) or ".", exist_ok=True)
+            self._events = open(events_path, "ab", buffering=max(1, flush_bytes))
+        self._last_message_path = last_message_path
+        self._pending_message: Optional[str] = None
+        self._metrics_path = metrics_path
+        self.metrics = _ExecMetrics() if metrics_path else None
+        self._dropped_lines = dropped_lines
+        self._dirty = False
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0 and (self._events or last_message_path or metrics_path):
+            self._flusher = threading.Thread(target=self._flush_loop, args=(flush_interval,), daemon=True)
+            self._flusher.start()
+
+    def write_event(self, raw: bytes) -> None:
+        if self._events is None:
+            return
+        with self._lock:
+            self._events.write(raw)
+            self._dirty = True
+
+    def set_last_message(self, text: str) -> None:
+        if not self._last_message_path:
+            return
+        with self._lock:
+            self._pending_message = text
+            self._dirty = True
+
+    def observe(self, evt: dict[str, Any]) -> None:
+        if self.metrics is None:
+            return
+        with self._lock:
+            self.metrics.observe(evt, time.monotonic())
+            self._dirty = True
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._dirty:
+            return
+        if self._events is not None:
+            self._events.flush()
+        if self._pending_message is not None and self._last_message_path:
+            _replace_text(self._last_message_path, self._pending_message)
+            self._pending_message = None
+        if self.metrics is not None and self._metrics_path:
+            if self._dropped_lines is not None:
+                self.metrics.display_lines_dropped = self._dropped_lines()
+            _replace_text(self._metrics_path, json.dumps(self.metrics.snapshot(), indent=2) + "\n")
+        self._dirty = False
+
+    def _flush_loop(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def close(self, *, wait: bool = True) -> None:
+        """Flush and close; ``wait=False`` skips joining the flusher (it may be blocked on our lock)."""
+        self._closed.set()
+        if wait and self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            if self.metrics is not None:
+                self._dirty = True
+            self._flush_locked()
+            if self._events is not None:
+                self._events.close()
+                self._events = None
+
+
+class _DisplayWriter:
+    """Bounded, non-blocking stdout stage.
+
+    The filter only enqueues; a writer thread drains whatever is pending in
+    one ``write`` + ``flush``, so a slow or detached terminal stalls that
+    thread instead of the pipe from ``codex exec``. When the queue is full,
+    detail lines (output snippets, unparseable echoes) are dropped first;
+    after that the oldest summary lines are folded into a single
+    "… N more events" line. Agent messages are never evicted. Every line
+    not shown is counted in ``dropped`` and reported on close.
+    """
+
+    _MESSAGE, _SUMMARY, _DETAIL, _FOLDED = range(4)
+
+    def __init__(self, stream, *, max_pending: int, close_timeout: float = 5.0) -> None:
+        self._stream = stream
+        self._max_pending = max(1, max_pending)
+        self._close_timeout = close_timeout
+        # [kind, text]; a _FOLDED entry holds its count instead of text.
+        self._pending: deque[list] = deque()
+        self._folded: Optional[list] = None
+        self._cond = threading.Condition()
+        self._closing = False
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def emit(self, text: str, *, detail: bool = False) -> None:
+        self._enqueue(self._DETAIL if detail else self._SUMMARY, text)
+
+    def emit_message(self, text: str) -> None:
+        """Enqueue an agent message; these are kept even when the queue is full."""
+        self._enqueue(self._MESSAGE, text)
+
+    def emit_summary(self, summary: str) -> None:
+        """Enqueue a multi-line summary; continuation lines count as detail."""
+        head, _, rest = summary.partition("\n")
+        self.emit(head)
+        if rest:
+            for line in rest.split("\n"):
+                self.emit(line, detail=True)
+
+    def _enqueue(self, kind: int, text: str) -> None:
+        with self._cond:
+            while len(self._pending) >= self._max_pending and kind != self._MESSAGE:
+                if kind == self._DETAIL:
+                    self.dropped += 1
+                    return
+                if not self._evict_one():
+                    if self._folded is not None:
+                        self._folded[1] += 1
+                        self.dropped += 1
+                        return
+                    break
+            self._pending.append([kind, text])
+            self._cond.notify()
+
+    def _evict_one(self) -> bool:
+        """Drop the oldest detail line, else fold the oldest summary; False if neither exists."""
+        for idx, entry in enumerate(self._pending):
+            if entry[0] == self._DETAIL:
+                del self._pending[idx]
+                self.dropped += 1
+                return True
+        for idx, entry in enumerate(self._pending):
+            if entry[0] == self._SUMMARY:
+                if self._folded is None:
+                    entry[:] = [self._FOLDED, 1]
+                    self._folded = entry
+                else:
+                    del self._pending[idx]
+                    self._folded[1] += 1
+                self.dropped += 1
+                return True
+        return False
+
+    def _drain(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending and self._closing:
+                    return
+                batch = [
+                    f"- … {text} more events" if kind == self._FOLDED else text for kind, text in self._pending
+                ]
+                self._pending.clear()
+                self._folded = None
+            try:
+                self._stream.write("\n".join(batch) + "\n")
+                self._stream.flush()
+            except (OSError, ValueError):
+                # Reader went away; keep consuming so emit() never blocks.
+                pass
+
+    def close(self) -> None:
+        with self._cond:
+            if self.dropped:
+                self._pending.append(
+                    [self._MESSAGE, f"- ({self.dropped} display lines dropped: output was not keeping up)"]
+                )
+            self._closing = True
+            self._cond.notify()
+        self._thread.join(self._close_timeout)
 
 
 _SHELL_WRAPPER_RE = re.compile(r"^\s*(?:/bin/)?(?:ba)?sh\s+-lc\s+(.+)\s*$", re.DOTALL)
@@ -31,17 +359,17 @@ def _truthy_env(name: str) -> bool:
     return raw not in {"", "0", "false", "no", "off"}
 
 
-def _redact(text: str) -> str:
-    # Best-effort redaction; this is not a secrets scanner.
-    key_value = re.compile(r"(?i)\b(api[_-]?key|access[_-]?key|secret|token|password)\b\s*=\s*([^\s'\"\\]+)")
-    auth_bearer = re.compile(r"(?i)\b(authorization)\s*:\s*(bearer)\s+([^\s]+)")
-    cli_flag = re.compile(r"(?i)\b(--(?:api[-_]key|token|password|secret))\s+([^\s]+)")
+@dataclass(frozen=True)
+class _SummaryConfig:
+    verbose: bool = False
+    output_lines: int = 4
 
-    redacted = text
-    redacted = key_value.sub(lambda m: f"{m.group(1)}=REDACTED", redacted)
-    redacted = auth_bearer.sub(lambda m: f"{m.group(1)}: {m.group(2)} REDACTED", redacted)
-    redacted = cli_flag.sub(lambda m: f"{m.group(1)} REDACTED", redacted)
-    return redacted
+    @classmethod
+    def from_env(cls) -> "_SummaryConfig":
+        return cls(
+            verbose=_truthy_env("SUBAGENT_EXEC_SUMMARY_VERBOSE"),
+            output_lines=int(os.getenv("SUBAGENT_EXEC_OUTPUT_LINES") or "4"),
+        )
 
 
 def _unwrap_shell_command(command: str) -> str:
@@ -88,7 +416,7 @@ def _format_output_snippet(output: str, *, max_lines: int, max_chars: int) -> li
 
     rendered: list[str] = []
     for line in reversed(tail):
-        line = _truncate(_redact(line.rstrip()), max_chars)
+        line = _truncate(redact_text(line.rstrip()), max_chars)
         rendered.append(line)
     return rendered
 
@@ -97,6 +425,11 @@ def _format_output_snippet(output: str, *, max_lines: int, max_chars: int) -> li
 class _InflightItem:
     item_type: str
     command: Optional[str] = None
+    display_command: Optional[str] = None
+
+
+def _display_command(command: Any) -> str:
+    return _truncate(redact_text(_unwrap_shell_command(str(command or ""))), 140)
 
 
 def _summarize_event_compact(evt: dict[str, Any]) -> Optional[str]:
@@ -133,13 +466,14 @@ def _summarize_event_compact(evt: dict[str, Any]) -> Optional[str]:
     return None
 
 
-def _summarize_event_tui(evt: dict[str, Any], inflight: dict[str, _InflightItem]) -> Optional[str]:
+def _summarize_event_tui(
+    evt: dict[str, Any], inflight: dict[str, _InflightItem], config: _SummaryConfig
+) -> Optional[str]:
     typ = str(evt.get("type") or "")
     if not typ:
         return None
 
-    verbose = _truthy_env("SUBAGENT_EXEC_SUMMARY_VERBOSE")
-    output_lines = int(os.getenv("SUBAGENT_EXEC_OUTPUT_LINES") or "4")
+    verbose = config.verbose
 
     if typ == "thread.started":
         tid = evt.get("thread_id")
@@ -152,13 +486,12 @@ def _summarize_event_tui(evt: dict[str, Any], inflight: dict[str, _InflightItem]
         item = evt.get("item") or {}
         item_id = str(item.get("id") or "")
         item_type = str(item.get("type") or "")
+        cmd = _display_command(item.get("command")) if item_type == "command_execution" else None
         if item_id and item_type:
-            inflight[item_id] = _InflightItem(item_type=item_type, command=item.get("command"))
+            inflight[item_id] = _InflightItem(item_type=item_type, command=item.get("command"), display_command=cmd)
         if item_type == "reasoning":
             return "- Thinking…"
         if item_type == "command_execution":
-            cmd = _unwrap_shell_command(str(item.get("command") or ""))
-            cmd = _truncate(_redact(cmd), 140)
             return f"- Run {cmd}"
         if verbose and item_type:
             return f"- Starting {item_type}"
@@ -168,10 +501,9 @@ def _summarize_event_tui(evt: dict[str, Any], inflight: dict[str, _InflightItem]
         item = evt.get("item") or {}
         item_type = str(item.get("type") or "") or "item"
         error = item.get("error") or evt.get("error") or evt.get("message") or ""
-        error_text = _truncate(_redact(str(error).strip()), 200) if error else ""
+        error_text = _truncate(redact_text(str(error).strip()), 200) if error else ""
         if item_type == "command_execution":
-            cmd = _unwrap_shell_command(str(item.get("command") or ""))
-            cmd = _truncate(_redact(cmd), 140)
+            cmd = _display_command(item.get("command"))
             if error_text:
                 return f"- Command failed: {cmd}\n  └ {error_text}"
             return f"- Command failed: {cmd}"
@@ -183,21 +515,24 @@ def _summarize_event_tui(evt: dict[str, Any], inflight: dict[str, _InflightItem]
         item = evt.get("item") or {}
         item_id = str(item.get("id") or "")
         item_type = str(item.get("type") or "")
-        if item_id and item_id in inflight:
-            prior = inflight.pop(item_id)
+        prior = inflight.pop(item_id, None) if item_id else None
+        if prior is not None:
             item_type = item_type or prior.item_type
         if item_type == "agent_message":
             return None
         if item_type == "reasoning":
             return None
         if item_type == "command_execution":
-            cmd = _unwrap_shell_command(str(item.get("command") or ""))
-            cmd = _truncate(_redact(cmd), 140)
+            command = item.get("command")
+            if prior is not None and prior.display_command is not None and prior.command == command:
+                cmd = prior.display_command
+            else:
+                cmd = _display_command(command)
             exit_code = item.get("exit_code")
             prefix = "- Ran"
             suffix = f" (exit {exit_code})" if exit_code is not None else ""
             out = str(item.get("aggregated_output") or "")
-            snippet = _format_output_snippet(out, max_lines=output_lines if verbose else 1, max_chars=180)
+            snippet = _format_output_snippet(out, max_lines=config.output_lines if verbose else 1, max_chars=180)
             if not snippet:
                 return f"{prefix} {cmd}{suffix}"
             body = "\n".join(f"  └ {line}" for line in snippet)
@@ -228,28 +563,70 @@ def _summarize_event_tui(evt: dict[str, Any], inflight: dict[str, _InflightItem]
     return None
 
 
+def _close_on_signals(capture: _CaptureWriter) -> None:
+    """Flush and close ``capture`` when the subagent is terminated, then exit."""
+
+    def handle(signum, _frame) -> None:
+        try:
+            capture.close(wait=False)
+        except RuntimeError:
+            # Interrupted inside the buffered writer itself; the finally
+            # block in _run_json closes it once the stack has unwound.
+            pass
+        raise SystemExit(128 + signum)
+
+    for name in ("SIGTERM", "SIGHUP"):
+        signum = getattr(signal, name, None)
+        if signum is not None:
+            signal.signal(signum, handle)
+
+
 def _run_json(args: argparse.Namespace) -> int:
+    display = _DisplayWriter(sys.stdout, max_pending=args.display_queue)
+    capture = _CaptureWriter(
+        args.events_path,
+        args.last_message_path,
+        flush_bytes=args.flush_bytes,
+        flush_interval=args.flush_interval,
+        metrics_path=args.metrics_path,
+        dropped_lines=lambda: display.dropped,
+    )
+    _close_on_signals(capture)
+    try:
+        _filter_json_lines(args, capture, display)
+    finally:
+        # Capture first: the display may wait on a stalled terminal.
+        capture.close()
+        display.close()
+    return 0
+
+
+def _filter_json_lines(args: argparse.Namespace, capture: _CaptureWriter, display: _DisplayWriter) -> None:
     session_id: Optional[str] = None
     last_agent_text: Optional[str] = None
     inflight: dict[str, _InflightItem] = {}
+    config = _SummaryConfig.from_env()
+    summarize_tui = args.print_events and args.style == "tui"
 
     for raw in sys.stdin.buffer:
-        if args.events_path:
-            _append_bytes(args.events_path, raw)
+        capture.write_event(raw)
 
-        line = raw.decode("utf-8", "replace").strip()
-        if not line:
+        stripped = raw.strip()
+        if not stripped:
             continue
 
         try:
-            evt = json.loads(line)
+            evt = loads(stripped)
         except Exception:
+            evt = None
+        if not isinstance(evt, dict):
             # Preserve some visibility if parsing fails.
             if args.print_events:
-                sys.stdout.write(f"[exec] <unparseable> {line}\n")
-                sys.stdout.flush()
+                line = stripped.decode("utf-8", "replace")
+                display.emit(f"[exec] <unparseable> {line}", detail=True)
             continue
 
+        capture.observe(evt)
         typ = evt.get("type")
         if typ == "thread.started" and not session_id:
             tid = evt.get("thread_id")
@@ -264,22 +641,17 @@ def _run_json(args: argparse.Namespace) -> int:
                 text = item.get("text")
                 if text is not None:
                     last_agent_text = str(text)
-                    sys.stdout.write(last_agent_text.rstrip("\n") + "\n")
-                    sys.stdout.flush()
-                    if args.last_message_path:
-                        _write_text(args.last_message_path, last_agent_text.rstrip("\n") + "\n")
+                    display.emit_message(last_agent_text.rstrip("\n"))
+                    capture.set_last_message(last_agent_text.rstrip("\n") + "\n")
                     continue
 
         if args.print_events:
-            if args.style == "tui":
-                summary = _summarize_event_tui(evt, inflight)
+            if summarize_tui:
+                summary = _summarize_event_tui(evt, inflight, config)
             else:
                 summary = _summarize_event_compact(evt)
             if summary:
-                sys.stdout.write(summary + "\n")
-                sys.stdout.flush()
-
-    return 0
+                display.emit_summary(summary)
 
 
 def _run_text(args: argparse.Namespace) -> int:
@@ -309,6 +681,28 @@ def main() -> int:
     parser.add_argument("--events-path")
     parser.add_argument("--session-id-path")
     parser.add_argument("--last-message-path")
+    parser.add_argument(
+        "--metrics-path",
+        help="JSON sidecar with cumulative tokens, command timings and failure counts (json mode)",
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=1.0,
+        help="Seconds before buffered event/last-message writes reach disk (0 flushes only when full or on exit)",
+    )
+    parser.add_argument(
+        "--flush-bytes",
+        type=int,
+        default=64 * 1024,
+        help="Event capture buffer size; a full buffer is written immediately",
+    )
+    parser.add_argument(
+        "--display-queue",
+        type=int,
+        default=512,
+        help="Display lines held while stdout is slow before lines are dropped",
+    )
     parser.add_argument("--no-print-events", dest="print_events", action="store_false")
     parser.set_defaults(print_events=True)
     args = parser.parse_args()
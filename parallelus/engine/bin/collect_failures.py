@@ -1,22 +1,49 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import copy
+import hashlib
+import io
 import json
+import os
 import re
-import subprocess
-from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from parallelus_docs_paths import failures_write_dir, marker_read_path
+from parallelus_docs_paths import failures_stream_path, failures_write_dir, marker_read_path
+from parallelus_jsonl import loads
 from parallelus_paths import sessions_read_roots
+from parallelus_redaction import redact_text
+from parallelus_repo_context import repo_context
+
+DEFAULT_LOOKBACK_HOURS = 48.0
+TEXT_HIT_LIMIT = 50
+
+# The ledger records, per source, how far it has been scanned and the failures
+# found so far; files are append-only logs, so later runs only read new bytes.
+LEDGER_VERSION = 3
+LEDGER_CHUNK = 1 << 20
+LEDGER_GUARD_BYTES = 4096
+
+DEFAULT_MAX_EXAMPLES = 3
+MAX_CLUSTER_SOURCES = 10
+
+# (directory under .parallelus to walk, file name) in report order.
+PARALLELUS_SOURCES = [
+    ("", "subagent.exec_events.jsonl"),
+    ("", "subagent.session.jsonl"),
+    ("guardrails/runs", "session.jsonl"),
+]
 
 
 def git_root() -> Path:
-    out = subprocess.check_output(["git", "rev-parse", "--show-toplevel"], text=True)
-    return Path(out.strip())
+    return repo_context().root
 
 
 def current_branch() -> str:
-    out = subprocess.check_output(["git", "rev-parse", "--abbrev-ref", "HEAD"], text=True)
-    branch = out.strip()
+    branch = repo_context().branch or ""
     if branch in {"HEAD", ""}:
         raise SystemExit("collect_failures: detached HEAD not supported")
     return branch
@@ -34,171 +61,614 @@ def load_marker(repo: Path, slugged: str) -> dict:
         raise SystemExit(f"collect_failures: unable to parse {marker_path}: {exc}")
 
 
-def iter_jsonl(path: Path):
+def parse_timestamp(value) -> datetime | None:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
     try:
-        with path.open("r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    yield json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-    except FileNotFoundError:
-        return
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def load_session_meta(session_dir: Path) -> dict:
+    try:
+        meta = json.loads((session_dir / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def scan_cutoff(repo: Path, marker: dict, marker_dt: datetime | None, lookback_hours: float) -> float | None:
+    """Return the mtime before which sources are too old to matter.
+
+    Defaults to ``lookback_hours`` before the marker, widened to the start of
+    the marker's session so a long session is always covered in full.
+    """
+    if marker_dt is None or lookback_hours <= 0:
+        return None
+    cutoff = marker_dt - timedelta(hours=lookback_hours)
+    session_id = marker.get("session_id")
+    if isinstance(session_id, str) and session_id:
+        for root in sessions_read_roots(repo):
+            started = parse_timestamp(load_session_meta(root / session_id).get("started_at"))
+            if started is not None:
+                cutoff = min(cutoff, started)
+                break
+    return cutoff.timestamp()
+
+
+def walk_named_files(root: Path, names: set[str]) -> dict[str, list[Path]]:
+    """Collect files named in ``names`` under ``root`` in one pruned walk."""
+    found: dict[str, list[Path]] = {name: [] for name in names}
+    if not root.is_dir():
+        return found
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != ".git")
+        for name in sorted(names.intersection(filenames)):
+            found[name].append(Path(dirpath) / name)
+    return found
+
+
+def discover_sources(
+    repo: Path, branch: str, marker: dict, cutoff: float | None
+) -> tuple[list[Path], int]:
+    """Return (candidate sources in report order, number skipped as out of scope)."""
+    candidates: list[Path] = []
+    seen: set[Path] = set()
+    skipped = 0
+    marker_session = marker.get("session_id")
+
+    def stale(path: Path) -> bool:
+        if cutoff is None:
+            return False
+        try:
+            return path.stat().st_mtime < cutoff
+        except OSError:
+            return True
+
+    def add(path: Path, *, keep: bool = False) -> None:
+        nonlocal skipped
+        resolved = path.resolve()
+        if resolved in seen:
+            return
+        seen.add(resolved)
+        if not keep and stale(path):
+            skipped += 1
+            return
+        candidates.append(path)
+
+    for session_root in sessions_read_roots(repo):
+        for console in sorted(session_root.glob("*/console.log")):
+            session_dir = console.parent
+            if session_dir.name == marker_session:
+                add(console, keep=True)
+                continue
+            session_branch = load_session_meta(session_dir).get("branch")
+            if cutoff is not None and session_branch and session_branch != branch:
+                seen.add(console.resolve())
+                skipped += 1
+                continue
+            add(console)
+
+    parallelus_root = repo / ".parallelus"
+    found = walk_named_files(parallelus_root, {name for _, name in PARALLELUS_SOURCES})
+    for subdir, name in PARALLELUS_SOURCES:
+        base = parallelus_root / subdir if subdir else parallelus_root
+        for path in found[name]:
+            if subdir and base not in path.parents:
+                continue
+            add(path)
+    return candidates, skipped
 
 
-REDACTION_PATTERNS = [
-    (
-        re.compile(
-            r"-----BEGIN [A-Z ]+PRIVATE KEY-----[\s\S]+?-----END [A-Z ]+PRIVATE KEY-----"
-        ),
-        "[REDACTED_PRIVATE_KEY]",
-    ),
-    (re.compile(r"\bAKIA[0-9A-Z]{16}\b"), "[REDACTED_AWS_ACCESS_KEY]"),
-    (
-        re.compile(
-            r"(?i)(aws[^\n]{0,20}?(secret|access)?_?key)\s*[:=]\s*[A-Za-z0-9/+=]{20,}"
-        ),
-        r"\1=[REDACTED_AWS_SECRET]",
-    ),
-    (re.compile(r"\bgh[pousr]_[A-Za-z0-9]{36,}\b"), "[REDACTED_GH_TOKEN]"),
-    (re.compile(r"\bxox[baprs]-[A-Za-z0-9-]+\b"), "[REDACTED_SLACK_TOKEN]"),
-    (re.compile(r"\bsk-[A-Za-z0-9]{20,}\b"), "[REDACTED_API_KEY]"),
-    (re.compile(r"(?i)(bearer\s+)[A-Za-z0-9\-._~+/]+=*"), r"\1[REDACTED_TOKEN]"),
-    (
-        re.compile(r"(?i)\b(token|api[-_]?key|secret|password|passwd|pwd)\b\s*[:=]\s*[^\s'\"]+"),
-        r"\1=[REDACTED]",
-    ),
+# Volatile fragments replaced before fingerprinting, so repeats of one
+# problem (different temp dirs, ids, line numbers, durations) group together.
+_NORMALIZE_RULES = [
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.IGNORECASE), "<uuid>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?"), "<time>"),
+    (re.compile(r"\b(?:0x)?[0-9a-f]{7,64}\b", re.IGNORECASE), "<hex>"),
+    (re.compile(r"(/(?:private/)?(?:tmp|var/folders)/)[^\s'\":]+"), r"\1<tmp>"),
+    (re.compile(r"\d+"), "<n>"),
+    (re.compile(r"\s+"), " "),
 ]
 
 
-def redact_text(value) -> str:
-    if value is None:
-        return ""
-    text = str(value)
-    for pattern, replacement in REDACTION_PATTERNS:
+def normalize_failure_text(value) -> str:
+    text = str(value or "").strip()
+    for pattern, replacement in _NORMALIZE_RULES:
         text = pattern.sub(replacement, text)
-    return text
-
-
-def scan_exec_events(path: Path, failures: list, warnings: list) -> None:
-    for event in iter_jsonl(path):
-        msg = event.get("msg") or event.get("payload") or event
-        msg_type = msg.get("type") if isinstance(msg, dict) else None
-        if msg_type == "exec_command_end":
-            exit_code = msg.get("exit_code")
-            if exit_code is not None and int(exit_code) != 0:
-                command = msg.get("command") or msg.get("argv")
-                if isinstance(command, list):
-                    command = " ".join(str(part) for part in command)
-                failures.append(
-                    {
-                        "source": str(path),
-                        "kind": "exec_command_end",
-                        "exit_code": exit_code,
-                        "command": redact_text(command),
-                        "stderr": redact_text(msg.get("stderr")),
-                    }
-                )
-        elif msg_type and "error" in msg_type:
-            failures.append(
-                {
-                    "source": str(path),
-                    "kind": msg_type,
-                    "error": redact_text(msg.get("error") or msg.get("message") or msg),
-                }
+    return text.strip()
+
+
+def failure_signature(failure: dict) -> str:
+    """Normalized last non-empty line of the failure's stderr/error/excerpt."""
+    detail = str(failure.get("stderr") or failure.get("error") or failure.get("excerpt") or "")
+    lines = [line for line in detail.splitlines() if line.strip()]
+    return normalize_failure_text(lines[-1] if lines else "")[:200]
+
+
+def failure_fingerprint(failure: dict) -> tuple[str, str, str]:
+    """Return (fingerprint, normalized command, signature) for ``failure``."""
+    kind = str(failure.get("kind") or "failure")
+    command = normalize_failure_text(failure.get("command"))
+    signature = failure_signature(failure)
+    digest = hashlib.sha1("\0".join((kind, command, signature)).encode("utf-8")).hexdigest()[:16]
+    return digest, command, signature
+
+
+def _occurrence(failure: dict, position: int) -> dict:
+    occurrence = {"source": failure.get("source"), "position": position}
+    if failure.get("timestamp"):
+        occurrence["timestamp"] = failure["timestamp"]
+    return occurrence
+
+
+def add_failure(clusters: dict, failure: dict, position: int, max_examples: int) -> None:
+    """Fold one failure into ``clusters`` (fingerprint -> cluster, first-seen order)."""
+    fingerprint, command, signature = failure_fingerprint(failure)
+    cluster = clusters.get(fingerprint)
+    if cluster is None:
+        # The first failure stays the cluster's top-level representative, so
+        # readers of the flat failure format keep working.
+        cluster = clusters[fingerprint] = dict(failure)
+        cluster.update(
+            fingerprint=fingerprint,
+            normalized_command=command or None,
+            signature=signature,
+            count=0,
+            exit_codes=[],
+            first_seen=_occurrence(failure, position),
+            last_seen=None,
+            sources=[],
+            examples=[],
+        )
+    cluster["count"] += 1
+    cluster["last_seen"] = _occurrence(failure, position)
+    exit_code = failure.get("exit_code")
+    if exit_code is not None and exit_code not in cluster["exit_codes"]:
+        cluster["exit_codes"].append(exit_code)
+    source = failure.get("source")
+    if source not in cluster["sources"] and len(cluster["sources"]) < MAX_CLUSTER_SOURCES:
+        cluster["sources"].append(source)
+    if len(cluster["examples"]) < max_examples:
+        cluster["examples"].append(failure)
+
+
+def merge_clusters(clusters: dict, later: dict, offset: int, max_examples: int) -> None:
+    """Merge clusters built from later failures, whose positions start at ``offset``.
+
+    Merging per-source clusters in source order gives the same result as
+    clustering the concatenated failures, so sources can be clustered
+    independently (and cached) without holding raw failures.
+    """
+    for fingerprint, other in later.items():
+        last_seen = dict(other["last_seen"], position=other["last_seen"]["position"] + offset)
+        cluster = clusters.get(fingerprint)
+        if cluster is None:
+            clusters[fingerprint] = dict(
+                other,
+                first_seen=dict(other["first_seen"], position=other["first_seen"]["position"] + offset),
+                last_seen=last_seen,
+                exit_codes=list(other["exit_codes"]),
+                sources=list(other["sources"]),
+                examples=list(other["examples"][:max_examples]),
             )
-        elif isinstance(msg, dict) and msg.get("error"):
+            continue
+        cluster["count"] += other["count"]
+        cluster["last_seen"] = last_seen
+        for exit_code in other["exit_codes"]:
+            if exit_code not in cluster["exit_codes"]:
+                cluster["exit_codes"].append(exit_code)
+        for source in other["sources"]:
+            if source not in cluster["sources"] and len(cluster["sources"]) < MAX_CLUSTER_SOURCES:
+                cluster["sources"].append(source)
+        room = max_examples - len(cluster["examples"])
+        if room > 0:
+            cluster["examples"].extend(other["examples"][:room])
+
+
+def cluster_failures(failures, *, max_examples: int = DEFAULT_MAX_EXAMPLES) -> list[dict]:
+    """Group failures by fingerprint, in order of first occurrence.
+
+    ``position`` in first/last occurrence is the failure's index in collection
+    order. Each cluster keeps its first ``max_examples`` raw failures and up to
+    ``MAX_CLUSTER_SOURCES`` distinct sources.
+    """
+    clusters: dict[str, dict] = {}
+    for position, failure in enumerate(failures):
+        add_failure(clusters, failure, position, max_examples)
+    return list(clusters.values())
+
+
+def default_ledger_path(repo: Path) -> Path:
+    return repo / ".parallelus" / "cache" / "failures-ledger.json"
+
+
+def load_ledger(path: Path | None) -> dict:
+    if path is None:
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != LEDGER_VERSION:
+        return {}
+    sources = data.get("sources")
+    return sources if isinstance(sources, dict) else {}
+
+
+def save_ledger(path: Path, sources: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Per-process temp name: concurrent runs must not write into each other's file.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps({"version": LEDGER_VERSION, "sources": sources}) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _guard_digest(fh, offset: int) -> str:
+    """Hash the bytes just before ``offset`` to detect in-place rewrites."""
+    start = max(0, offset - LEDGER_GUARD_BYTES)
+    fh.seek(start)
+    return hashlib.sha1(fh.read(offset - start)).hexdigest()
+
+
+def _fresh_entry(kind: str, st: os.stat_result, max_examples: int) -> dict:
+    return {
+        "kind": kind,
+        "dev": st.st_dev,
+        "inode": st.st_ino,
+        "offset": 0,
+        "guard": "",
+        "count": 0,
+        "clusters": {},
+        "max_examples": max_examples,
+        "truncated": False,
+    }
+
+
+def _resume_entry(entry: dict | None, kind: str, st: os.stat_result, fh, max_examples: int) -> dict:
+    """Return ``entry`` when the file only grew since it was recorded, else a fresh one."""
+    if (
+        isinstance(entry, dict)
+        and entry.get("kind") == kind
+        and entry.get("dev") == st.st_dev
+        and entry.get("inode") == st.st_ino
+        and isinstance(entry.get("offset"), int)
+        and 0 <= entry["offset"] <= st.st_size
+        and entry.get("max_examples", 0) >= max_examples
+        and _guard_digest(fh, entry["offset"]) == entry.get("guard")
+    ):
+        return entry
+    return _fresh_entry(kind, st, max_examples)
+
+
+def exec_event_failures(event, source: str) -> list:
+    if not isinstance(event, dict):
+        return []
+    msg = event.get("msg") or event.get("payload") or event
+    msg_type = msg.get("type") if isinstance(msg, dict) else None
+    failure = None
+    if msg_type == "exec_command_end":
+        exit_code = msg.get("exit_code")
+        if exit_code is not None and int(exit_code) != 0:
+            command = msg.get("command") or msg.get("argv")
+            if isinstance(command, list):
+                command = " ".join(str(part) for part in command)
+            failure = {
+                "source": source,
+                "kind": "exec_command_end",
+                "exit_code": exit_code,
+                "command": redact_text(command),
+                "stderr": redact_text(msg.get("stderr")),
+            }
+    elif msg_type and "error" in msg_type:
+        failure = {
+            "source": source,
+            "kind": msg_type,
+            "error": redact_text(msg.get("error") or msg.get("message") or msg),
+        }
+    elif isinstance(msg, dict) and msg.get("error"):
+        failure = {
+            "source": source,
+            "kind": msg.get("type") or "error",
+            "error": redact_text(msg.get("error")),
+        }
+    if failure is None:
+        return []
+    timestamp = event.get("timestamp") or event.get("ts")
+    if isinstance(timestamp, str) and timestamp:
+        failure["timestamp"] = timestamp
+    return [failure]
+
+
+def scan_exec_events_block(block: bytes, source: str, state: dict) -> list:
+    failures: list = []
+    for raw in block.split(b"\n"):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            event = loads(raw)
+        except ValueError:
+            continue
+        failures.extend(exec_event_failures(event, source))
+    return failures
+
+
+TEXT_PATTERNS = [
+    re.compile(r"\bERROR\b", re.IGNORECASE),
+    re.compile(r"\bTraceback\b"),
+    re.compile(r"exit code\s+([1-9][0-9]*)", re.IGNORECASE),
+]
+# Lowercase byte literals at least one of which occurs in every line that can
+# match TEXT_PATTERNS; only lines containing one are decoded and checked.
+# "İ"/"ı" fold to "i" under re.IGNORECASE, hence the extra "exit" spellings.
+TEXT_TRIGGERS = (b"error", b"traceback", b"exit code", "exİt code".encode(), "exıt code".encode())
+
+
+def _line_bounds(data: bytes, hit: int, floor: int) -> tuple[int, int]:
+    """Return [start, end) of the line holding ``hit``; lines end at \\n, \\r or \\r\\n."""
+    start = max(data.rfind(b"\n", floor, hit), data.rfind(b"\r", floor, hit), floor - 1) + 1
+    ends = [idx for idx in (data.find(b"\n", hit), data.find(b"\r", hit)) if idx != -1]
+    return start, min(ends) if ends else len(data)
+
+
+def _candidate_lines(block: bytes):
+    """Yield the lines of ``block`` that contain a trigger, decoded."""
+    try:
+        block.decode("utf-8")
+    except UnicodeDecodeError:
+        # Dropping invalid bytes can rejoin a split keyword, so check every
+        # line of the decoded text exactly as a text-mode reader would.
+        yield from io.StringIO(block.decode("utf-8", "ignore"), newline=None)
+        return
+    lowered = block.lower()
+    # Next offset of each trigger, refreshed only once the scan passes it.
+    upcoming = [lowered.find(trigger) for trigger in TEXT_TRIGGERS]
+    pos = 0
+    while True:
+        live = [idx for idx in upcoming if idx != -1]
+        if not live:
+            return
+        start, end = _line_bounds(block, min(live), pos)
+        yield block[start:end].decode("utf-8")
+        pos = end
+        upcoming = [
+            lowered.find(trigger, pos) if idx != -1 and idx < pos else idx
+            for trigger, idx in zip(TEXT_TRIGGERS, upcoming)
+        ]
+
+
+def scan_text_log_block(block: bytes, source: str, state: dict) -> list:
+    failures: list = []
+    if state["truncated"]:
+        return failures
+    for line in _candidate_lines(block):
+        if any(p.search(line) for p in TEXT_PATTERNS):
             failures.append(
                 {
-                    "source": str(path),
-                    "kind": msg.get("type") or "error",
-                    "error": redact_text(msg.get("error")),
+                    "source": source,
+                    "kind": "unstructured_log",
+                    "excerpt": redact_text(line.strip())[:300],
                 }
             )
-    if path.exists() and path.stat().st_size == 0:
+            state["hits"] += 1
+            if state["hits"] >= TEXT_HIT_LIMIT:
+                state["truncated"] = True
+                break
+    return failures
+
+
+SCANNERS = {"jsonl": scan_exec_events_block, "text": scan_text_log_block}
+
+
+def scan_source(
+    path: Path, entry: dict | None = None, max_examples: int = DEFAULT_MAX_EXAMPLES
+) -> tuple[dict, list, dict | None]:
+    """Scan ``path`` from the ledger ``entry`` offset; return (summary, warnings, entry).
+
+    ``summary`` is ``{"count": n, "clusters": {...}}`` for the whole file, with
+    positions counted from the file's first failure. Only complete lines are
+    recorded in the returned entry; a trailing line without a newline is
+    still reported, but rescanned on the next run.
+    """
+    kind = "jsonl" if path.suffix == ".jsonl" else "text"
+    scan = SCANNERS[kind]
+    source = str(path)
+    try:
+        fh = path.open("rb")
+    except FileNotFoundError:
+        return {"count": 0, "clusters": {}}, [], None
+    with fh:
+        st = os.fstat(fh.fileno())
+        entry = _resume_entry(entry, kind, st, fh, max_examples)
+        state = {"hits": entry["count"], "truncated": entry["truncated"]}
+        offset = entry["offset"]
+        fh.seek(offset)
+        # Bytes after the last newline seen; joined once a newline arrives, so
+        # a long newline-free run costs linear rather than quadratic time.
+        carry: list[bytes] = []
+        while not state["truncated"]:
+            chunk = fh.read(LEDGER_CHUNK)
+            if not chunk:
+                break
+            cut = chunk.rfind(b"\n") + 1
+            if not cut:
+                carry.append(chunk)
+                continue
+            carry.append(chunk[:cut])
+            block = b"".join(carry)
+            carry = [chunk[cut:]] if cut < len(chunk) else []
+            for failure in scan(block, source, state):
+                add_failure(entry["clusters"], failure, entry["count"], entry["max_examples"])
+                entry["count"] += 1
+            offset += len(block)
+        pending = b"".join(carry)
+        tail_state = dict(state)
+        tail = scan(pending, source, tail_state) if pending and not state["truncated"] else []
+        entry.update(offset=offset, truncated=state["truncated"], guard=_guard_digest(fh, offset))
+
+    summary = {"count": entry["count"], "clusters": entry["clusters"]}
+    if tail:
+        summary = {"count": entry["count"], "clusters": copy.deepcopy(entry["clusters"])}
+        for failure in tail:
+            add_failure(summary["clusters"], failure, summary["count"], entry["max_examples"])
+            summary["count"] += 1
+
+    warnings: list = []
+    if kind == "jsonl" and st.st_size == 0:
         warnings.append(f"{path} is empty")
+    if tail_state["truncated"]:
+        warnings.append(f"{path} produced many matches; truncated to {TEXT_HIT_LIMIT}")
+    return summary, warnings, entry
 
 
-def scan_text_log(path: Path, failures: list, warnings: list) -> None:
-    if not path.exists():
+def _scan_source_job(job: tuple[Path, dict | None, int]) -> tuple[dict, list, dict | None]:
+    return scan_source(*job)
+
+
+def scan_sources(paths: list[Path], jobs: int, ledger: dict | None = None, max_examples: int = DEFAULT_MAX_EXAMPLES):
+    """Yield ``scan_source`` results for ``paths`` in input order, in parallel when worthwhile."""
+    ledger = ledger or {}
+    work = [(path, ledger.get(str(path)), max_examples) for path in paths]
+    jobs = jobs or min(len(paths), os.cpu_count() or 1)
+    if len(paths) > 1 and jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            yield from pool.map(_scan_source_job, work)
         return
-    patterns = [
-        re.compile(r"\bERROR\b", re.IGNORECASE),
-        re.compile(r"\bTraceback\b"),
-        re.compile(r"exit code\s+([1-9][0-9]*)", re.IGNORECASE),
-    ]
-    hits = 0
-    with path.open("r", encoding="utf-8", errors="ignore") as fh:
-        for line in fh:
-            if any(p.search(line) for p in patterns):
-                failures.append(
-                    {
-                        "source": str(path),
-                        "kind": "unstructured_log",
-                        "excerpt": redact_text(line.strip())[:300],
-                    }
-                )
-                hits += 1
-                if hits >= 50:
-                    warnings.append(f"{path} produced many matches; truncated to 50")
-                    break
+    for job in work:
+        yield _scan_source_job(job)
 
 
-def main() -> None:
-    repo = git_root()
-    branch = current_branch()
-    slugged = branch.replace("/", "-")
-    marker = load_marker(repo, slugged)
+def write_failures_stream(path: Path, clusters) -> int:
+    """Write one cluster per line to ``path`` atomically; return the line count."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    count = 0
+    try:
+        with tmp.open("w", encoding="utf-8") as fh:
+            for cluster in clusters:
+                fh.write(json.dumps(cluster, ensure_ascii=False) + "\n")
+                count += 1
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return count
+
+
+def collect(
+    repo: Path,
+    branch: str,
+    marker: dict,
+    *,
+    lookback_hours: float = DEFAULT_LOOKBACK_HOURS,
+    jobs: int = 0,
+    ledger_path: Path | None = None,
+    max_examples: int = DEFAULT_MAX_EXAMPLES,
+) -> tuple[Path, dict, list[dict]]:
+    """Write the failures summary for ``marker``; return (summary path, header, clusters)."""
     marker_ts = marker.get("timestamp")
     if not marker_ts:
         raise SystemExit("collect_failures: marker missing timestamp")
+    slugged = branch.replace("/", "-")
 
     failures_dir = failures_write_dir(repo)
     failures_dir.mkdir(parents=True, exist_ok=True)
     out_path = failures_dir / f"{slugged}--{marker_ts}.json"
 
-    failures = []
-    warnings = []
-    sources = []
-
-    candidates: list[Path] = []
-    seen_candidates: set[Path] = set()
+    cutoff = scan_cutoff(repo, marker, parse_timestamp(marker_ts), lookback_hours)
+    candidates, skipped = discover_sources(repo, branch, marker, cutoff)
 
-    def add_candidates(paths) -> None:
-        for path in paths:
-            resolved = path.resolve()
-            if resolved in seen_candidates:
-                continue
-            seen_candidates.add(resolved)
-            candidates.append(path)
+    ledger = load_ledger(ledger_path)
+    max_examples = max(1, max_examples)
 
-    for session_root in sessions_read_roots(repo):
-        add_candidates(session_root.glob("*/console.log"))
-    add_candidates(repo.glob(".parallelus/**/subagent.exec_events.jsonl"))
-    add_candidates(repo.glob(".parallelus/**/subagent.session.jsonl"))
-    add_candidates(repo.glob(".parallelus/guardrails/runs/**/session.jsonl"))
-    add_candidates(repo.glob(".parallelus/guardrails/runs/**/subagent.exec_events.jsonl"))
-
-    for path in candidates:
-        sources.append(str(path))
-        if path.suffix == ".jsonl":
-            scan_exec_events(path, failures, warnings)
+    clusters: dict[str, dict] = {}
+    failure_count = 0
+    warnings = []
+    sources = [str(path) for path in candidates]
+    results = scan_sources(candidates, jobs, ledger, max_examples)
+    for path, (summary, path_warnings, entry) in zip(candidates, results):
+        merge_clusters(clusters, summary["clusters"], failure_count, max_examples)
+        failure_count += summary["count"]
+        warnings.extend(path_warnings)
+        if entry is None:
+            ledger.pop(str(path), None)
         else:
-            scan_text_log(path, failures, warnings)
+            ledger[str(path)] = entry
+
+    if ledger_path is not None:
+        ledger = {key: value for key, value in ledger.items() if Path(key).exists()}
+        save_ledger(ledger_path, ledger)
 
+    stream_path = failures_stream_path(out_path)
+    cluster_count = write_failures_stream(stream_path, clusters.values())
     data = {
         "branch": branch,
         "marker_timestamp": marker_ts,
         "generated_at": datetime.now(timezone.utc).isoformat(),
+        "format": "failures-jsonl/1",
+        "failures_file": stream_path.name,
+        "failure_count": failure_count,
+        "cluster_count": cluster_count,
         "sources": sources,
-        "failures": failures,
+        "skipped_sources": skipped,
         "warnings": warnings,
     }
     out_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
     print(f"collect_failures: wrote {out_path.relative_to(repo)}", flush=True)
+    return out_path, data, list(clusters.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize failed tool calls since the latest turn marker.")
+    parser.add_argument(
+        "--lookback-hours",
+        type=float,
+        default=float(os.environ.get("PARALLELUS_FAILURES_LOOKBACK_HOURS") or DEFAULT_LOOKBACK_HOURS),
+        help="Skip sources not modified within this many hours before the marker "
+        f"(default: {DEFAULT_LOOKBACK_HOURS:g}; 0 scans everything)",
+    )
+    parser.add_argument(
+        "--all-sources",
+        action="store_true",
+        help="Scan every session log and run artifact regardless of age or branch",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        "--ledger",
+        type=Path,
+        default=None,
+        help="Incremental scan ledger (default: .parallelus/cache/failures-ledger.json)",
+    )
+    parser.add_argument("--no-ledger", action="store_true", help="Rescan every source from the start")
+    parser.add_argument(
+        "--max-examples",
+        type=int,
+        default=DEFAULT_MAX_EXAMPLES,
+        help=f"Raw failures kept per cluster (default: {DEFAULT_MAX_EXAMPLES})",
+    )
+    args = parser.parse_args()
+
+    repo = git_root()
+    branch = current_branch()
+    marker = load_marker(repo, branch.replace("/", "-"))
+    collect(
+        repo,
+        branch,
+        marker,
+        lookback_hours=0.0 if args.all_sources else args.lookback_hours,
+        jobs=args.jobs,
+        ledger_path=None if args.no_ledger else (args.ledger or default_ledger_path(repo)),
+        max_examples=args.max_examples,
+    )
 
 
 if __name__ == "__main__":
@@ -1,57 +1,235 @@
 #!/usr/bin/env python3
 import argparse
+import hashlib
 import json
+import mmap
 import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from parallelus_jsonl import loads
 from parallelus_paths import load_agentrc, resolve_session_dir
+from parallelus_redaction import may_contain_secret, redact_obj, redact_text
 
-REDACTION_PATTERNS = [
-    (re.compile(r"-----BEGIN [A-Z ]+PRIVATE KEY-----[\s\S]+?-----END [A-Z ]+PRIVATE KEY-----"), "[REDACTED_PRIVATE_KEY]"),
-    (re.compile(r"\bAKIA[0-9A-Z]{16}\b"), "[REDACTED_AWS_ACCESS_KEY]"),
-    (re.compile(r"\bASIA[0-9A-Z]{16}\b"), "[REDACTED_AWS_SESSION_KEY]"),
-    (re.compile(r"(?i)(aws[^\n]{0,20}?(secret|access)?_?key)\s*[:=]\s*[A-Za-z0-9/+=]{20,}"), r"\1=[REDACTED_AWS_SECRET]"),
-    (re.compile(r"\bgh[pousr]_[A-Za-z0-9]{36,}\b"), "[REDACTED_GH_TOKEN]"),
-    (re.compile(r"\bxox[baprs]-[A-Za-z0-9-]+\b"), "[REDACTED_SLACK_TOKEN]"),
-    (re.compile(r"\bsk-[A-Za-z0-9]{20,}\b"), "[REDACTED_API_KEY]"),
-    (re.compile(r"(?i)(bearer\s+)[A-Za-z0-9\-._~+/]+=*"), r"\1[REDACTED_TOKEN]"),
-    (re.compile(r"(?i)\b(token|api[-_]?key|secret|password|passwd|pwd)\b\s*[:=]\s*[^\s'\"]+"), r"\1=[REDACTED]"),
-]
+# Nonces and Codex session ids are UUIDs; the rollout index records every one
+# seen per file so lookups only need to read new or changed rollouts.
+ROLLOUT_ID_RE = re.compile(rb"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+ROLLOUT_INDEX_VERSION = 1
+CHECKPOINT_VERSION = 1
 
 
-def redact_text(value: str) -> str:
-    text = value
-    for pattern, replacement in REDACTION_PATTERNS:
-        text = pattern.sub(replacement, text)
-    return text
+def find_rollouts_batch(root: Path, nonces: list) -> dict:
+    """Map each nonce to every rollout containing it, reading each file at most once."""
+    matched = {nonce: [] for nonce in nonces}
+    for path in sorted(root.glob("**/rollout-*.jsonl")):
+        pending = set(matched)
+        try:
+            with path.open("r", encoding="utf-8", errors="ignore") as fh:
+                for line in fh:
+                    hits = [nonce for nonce in pending if nonce in line]
+                    for nonce in hits:
+                        matched[nonce].append(path)
+                        pending.discard(nonce)
+                    if not pending:
+                        break
+        except FileNotFoundError:
+            continue
+    return matched
 
 
-def redact_obj(obj):
-    if isinstance(obj, str):
-        return redact_text(obj)
-    if isinstance(obj, list):
-        return [redact_obj(item) for item in obj]
-    if isinstance(obj, dict):
-        return {k: redact_obj(v) for k, v in obj.items()}
-    return obj
+def find_rollouts(root: Path, nonce: str) -> list:
+    return find_rollouts_batch(root, [nonce])[nonce]
 
 
-def find_rollouts(root: Path, nonce: str) -> list:
-    rollouts = sorted(root.glob("**/rollout-*.jsonl"))
-    matched = []
-    for path in rollouts:
+def find_newest_rollouts(root: Path, nonces: list) -> dict:
+    """Map each nonce to the most recently modified rollout containing it.
+
+    Rollouts are visited newest-first and searched as raw bytes through mmap,
+    so the walk stops as soon as every nonce has been found instead of reading
+    the whole history. Nonces that never match are absent from the result.
+    """
+    pending = {nonce: nonce.encode("utf-8") for nonce in nonces}
+    found = {}
+    candidates = []
+    for path in root.glob("**/rollout-*.jsonl"):
         try:
-            with path.open("r", encoding="utf-8", errors="ignore") as fh:
-                for line in fh:
-                    if nonce in line:
-                        matched.append(path)
-                        break
+            candidates.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    candidates.sort(key=lambda item: item[0], reverse=True)
+    for _, path in candidates:
+        if not pending:
+            break
+        try:
+            with path.open("rb") as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    continue
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    for nonce, needle in list(pending.items()):
+                        if mapped.find(needle) != -1:
+                            found[nonce] = path
+                            del pending[nonce]
+        except (FileNotFoundError, ValueError):
+            continue
+    return found
+
+
+def find_newest_rollout(root: Path, nonce: str):
+    return find_newest_rollouts(root, [nonce]).get(nonce)
+
+
+def default_index_path(repo_root: Path) -> Path:
+    return repo_root / ".parallelus" / "cache" / "codex-rollout-index.json"
+
+
+def load_rollout_index(index_path: Path, root: Path) -> dict:
+    try:
+        data = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    if data.get("version") != ROLLOUT_INDEX_VERSION or data.get("sessions_root") != str(root):
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_rollout_index(index_path: Path, root: Path, files: dict) -> None:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": ROLLOUT_INDEX_VERSION, "sessions_root": str(root), "files": files}
+    tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, separators=(",", ":")) + "\n", encoding="utf-8")
+    os.replace(tmp_path, index_path)
+
+
+def scan_rollout_ids(path: Path, start: int = 0) -> tuple:
+    """Return (ids, session_id, offset) for complete lines at or after ``start``.
+
+    ``offset`` stops at the end of the last complete line so a later scan of an
+    appended file re-reads any partial trailing line instead of splitting an
+    identifier in half.
+    """
+    ids = set()
+    session_id = None
+    offset = start
+    with path.open("rb") as fh:
+        fh.seek(start)
+        for raw in fh:
+            if raw.endswith(b"\n"):
+                offset += len(raw)
+            ids.update(match.group(0).decode("ascii").lower() for match in ROLLOUT_ID_RE.finditer(raw))
+            if session_id is None and b'"session_meta"' in raw:
+                try:
+                    payload = loads(raw).get("payload")
+                except (ValueError, AttributeError):
+                    payload = None
+                if isinstance(payload, dict) and isinstance(payload.get("id"), str):
+                    session_id = payload["id"].lower()
+    return ids, session_id, offset
+
+
+def update_rollout_index(root: Path, index_path: Path) -> dict:
+    """Refresh the on-disk rollout index, reading only new or changed files."""
+    previous = load_rollout_index(index_path, root)
+    files = {}
+    changed = False
+    for path in sorted(root.glob("**/rollout-*.jsonl")):
+        key = str(path)
+        try:
+            st = path.stat()
         except FileNotFoundError:
             continue
+        entry = previous.get(key)
+        if (
+            isinstance(entry, dict)
+            and entry.get("ino") == st.st_ino
+            and entry.get("size") == st.st_size
+            and entry.get("mtime_ns") == st.st_mtime_ns
+        ):
+            files[key] = entry
+            continue
+
+        start = 0
+        ids = set()
+        session_id = None
+        if (
+            isinstance(entry, dict)
+            and entry.get("ino") == st.st_ino
+            and st.st_size >= int(entry.get("size") or 0)
+        ):
+            # Rollouts are append-only; resume after the last indexed line.
+            start = int(entry.get("offset") or 0)
+            ids = set(entry.get("ids") or [])
+            session_id = entry.get("session_id")
+        try:
+            new_ids, new_session_id, offset = scan_rollout_ids(path, start)
+        except FileNotFoundError:
+            continue
+        ids.update(new_ids)
+        files[key] = {
+            "ino": st.st_ino,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "offset": offset,
+            "session_id": session_id or new_session_id,
+            "ids": sorted(ids),
+        }
+        changed = True
+
+    if changed or files.keys() != previous.keys():
+        save_rollout_index(index_path, root, files)
+    return files
+
+
+def find_rollouts_indexed_batch(root: Path, nonces: list, index_path: Path) -> dict:
+    # The index only records UUID-shaped identifiers; anything else needs a full scan.
+    indexed = [nonce for nonce in nonces if ROLLOUT_ID_RE.fullmatch(nonce.encode("utf-8", "ignore"))]
+    unindexed = [nonce for nonce in nonces if nonce not in indexed]
+    matched = find_rollouts_batch(root, unindexed) if unindexed else {}
+    if indexed:
+        files = update_rollout_index(root, index_path)
+        for nonce in indexed:
+            needle = nonce.lower()
+            matched[nonce] = [Path(key) for key, entry in files.items() if needle in entry.get("ids", ())]
     return matched
 
 
+def find_rollouts_indexed(root: Path, nonce: str, index_path: Path) -> list:
+    return find_rollouts_indexed_batch(root, [nonce], index_path)[nonce]
+
+
+def resolve_rollouts(root: Path, nonces: list, search: str, index_path: Path) -> dict:
+    """Resolve every nonce to its newest matching rollout (or None) in one pass."""
+    if search == "newest":
+        found = find_newest_rollouts(root, nonces)
+        return {nonce: found.get(nonce) for nonce in nonces}
+    if search == "full":
+        matched = find_rollouts_batch(root, nonces)
+    else:
+        matched = find_rollouts_indexed_batch(root, nonces, index_path)
+    resolved = {}
+    for nonce in nonces:
+        paths = sorted(matched.get(nonce) or [], key=lambda p: p.stat().st_mtime)
+        resolved[nonce] = paths[-1] if paths else None
+    return resolved
+
+
+def read_nonce_file(path: str) -> list:
+    if path == "-":
+        raw = sys.stdin.read()
+    else:
+        raw = Path(path).expanduser().read_text(encoding="utf-8")
+    nonces = []
+    for line in raw.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            nonces.append(line)
+    return nonces
+
+
 def default_output_dir(repo_root: Path) -> Path:
     session_dir_raw = os.environ.get("SESSION_DIR", "").strip()
     if session_dir_raw:
@@ -69,238 +247,421 @@ def default_output_dir(repo_root: Path) -> Path:
     return repo_root / ".parallelus" / "guardrails" / "runs" / "extracted"
 
 
-def render_markdown(events: list, source_path: Path) -> str:
-    def fmt_time(ev_obj) -> str:
-        for key in ("timestamp", "time", "ts", "created_at"):
-            value = ev_obj.get(key)
-            if value:
-                return f"{value} "
+def fmt_time(ev_obj) -> str:
+    for key in ("timestamp", "time", "ts", "created_at"):
+        value = ev_obj.get(key)
+        if value:
+            return f"{value} "
+    return ""
+
+
+def extract_text(value):
+    if isinstance(value, dict):
+        if "text" in value:
+            return str(value["text"])
+        if "summary" in value:
+            return extract_text(value["summary"])
+        if "content" in value:
+            return extract_text(value["content"])
+        if "content" in value:
+            return extract_text(value["content"])
+    if isinstance(value, list):
+        parts = []
+        for item in value:
+            parts.append(extract_text(item))
+        return " ".join(part for part in parts if part)
+    if value is None:
         return ""
+    return str(value)
 
-    def extract_text(value):
-        if isinstance(value, dict):
-            if "text" in value:
-                return str(value["text"])
-            if "summary" in value:
-                return extract_text(value["summary"])
-            if "content" in value:
-                return extract_text(value["content"])
-            if "content" in value:
-                return extract_text(value["content"])
-        if isinstance(value, list):
-            parts = []
-            for item in value:
-                parts.append(extract_text(item))
-            return " ".join(part for part in parts if part)
-        if value is None:
-            return ""
-        return str(value)
-
-    def extract_response_text(ev_obj) -> str:
-        def pull_content(container):
-            if not isinstance(container, dict):
-                return ""
-            content = container.get("content")
-            if isinstance(content, list):
-                parts = []
-                for item in content:
-                    if isinstance(item, dict) and item.get("type") in {"input_text", "output_text", "summary_text"}:
-                        parts.append(str(item.get("text") or ""))
-                return "\n".join(part for part in parts if part)
-            if isinstance(content, dict) and content.get("type") in {"input_text", "output_text", "summary_text"}:
-                return str(content.get("text") or "")
-            summary = container.get("summary")
-            if isinstance(summary, list):
-                parts = []
-                for item in summary:
-                    if isinstance(item, dict) and item.get("type") in {"summary_text", "output_text"}:
-                        parts.append(str(item.get("text") or ""))
-                return "\n".join(part for part in parts if part)
+
+def extract_response_text(ev_obj) -> str:
+    def pull_content(container):
+        if not isinstance(container, dict):
             return ""
+        content = container.get("content")
+        if isinstance(content, list):
+            parts = []
+            for item in content:
+                if isinstance(item, dict) and item.get("type") in {"input_text", "output_text", "summary_text"}:
+                    parts.append(str(item.get("text") or ""))
+            return "\n".join(part for part in parts if part)
+        if isinstance(content, dict) and content.get("type") in {"input_text", "output_text", "summary_text"}:
+            return str(content.get("text") or "")
+        summary = container.get("summary")
+        if isinstance(summary, list):
+            parts = []
+            for item in summary:
+                if isinstance(item, dict) and item.get("type") in {"summary_text", "output_text"}:
+                    parts.append(str(item.get("text") or ""))
+            return "\n".join(part for part in parts if part)
+        return ""
 
-        payload = ev_obj.get("payload")
-        if isinstance(payload, dict):
-            text = pull_content(payload)
-            if text:
-                return text
-        return pull_content(ev_obj)
-
-    def render_text_block(text: str) -> list:
-        if not text:
-            return []
-        text = text.replace("\\n", "\n").replace("\\t", "\t")
-        lines = []
-        for line in text.splitlines():
-            if line:
-                lines.append(f"  {line}")
-            else:
-                lines.append("  ")
-        return lines
+    payload = ev_obj.get("payload")
+    if isinstance(payload, dict):
+        text = pull_content(payload)
+        if text:
+            return text
+    return pull_content(ev_obj)
 
+
+def render_text_block(text: str) -> list:
+    if not text:
+        return []
+    text = text.replace("\\n", "\n").replace("\\t", "\t")
     lines = []
-    lines.append("# Codex Rollout Transcript")
-    lines.append("")
-    lines.append(f"- Source: {source_path}")
-    lines.append(f"- Events: {len(events)}")
-    lines.append("")
+    for line in text.splitlines():
+        if line:
+            lines.append(f"  {line}")
+        else:
+            lines.append("  ")
+    return lines
 
-    def dump_json(obj) -> str:
-        return json.dumps(obj, ensure_ascii=True, indent=2, sort_keys=True)
 
-    for ev in events:
-        etype = ev.get("type") or ev.get("event") or ev.get("kind")
-        msg = ev.get("msg") or ev.get("message") or ev.get("payload")
-        if not etype and isinstance(msg, dict):
-            etype = msg.get("type") or msg.get("event")
+def dump_json(obj) -> str:
+    return json.dumps(obj, ensure_ascii=True, indent=2, sort_keys=True)
 
-        if etype == "token_count":
-            continue
 
-        prefix = fmt_time(ev)
+def render_event(ev: dict) -> list:
+    """Return the Markdown lines for one (already redacted) rollout event."""
+    lines = []
+    etype = ev.get("type") or ev.get("event") or ev.get("kind")
+    msg = ev.get("msg") or ev.get("message") or ev.get("payload")
+    if not etype and isinstance(msg, dict):
+        etype = msg.get("type") or msg.get("event")
 
-        if etype == "turn_context":
-            cwd = ev.get("cwd") or (msg.get("cwd") if isinstance(msg, dict) else None)
-            if cwd:
-                lines.append(f"- {prefix}[context] cwd: `{cwd}`")
-            continue
+    if etype == "token_count":
+        return lines
 
-        if etype == "session_meta":
-            meta = ev.get("payload") if isinstance(ev.get("payload"), dict) else ev
-            lines.append(f"- {prefix}[session_meta]")
-            for key in ("id", "timestamp", "cwd", "originator", "cli_version", "source", "model_provider"):
-                value = meta.get(key) if isinstance(meta, dict) else None
-                if value:
-                    lines.append(f"  - {key}: {redact_text(str(value))}")
-            base_text = ""
-            if isinstance(meta, dict):
-                base = meta.get("base_instructions")
-                if isinstance(base, dict):
-                    base_text = base.get("text") or ""
-            if base_text:
-                lines.append("  - base_instructions:")
-                lines.extend(render_text_block(redact_text(base_text)))
-            else:
-                lines.append("```json")
-                lines.append(dump_json(ev))
-                lines.append("```")
-            continue
+    prefix = fmt_time(ev)
 
-        if etype == "event_msg":
-            continue
+    if etype == "turn_context":
+        cwd = ev.get("cwd") or (msg.get("cwd") if isinstance(msg, dict) else None)
+        if cwd:
+            lines.append(f"- {prefix}[context] cwd: `{cwd}`")
+        return lines
 
-        if etype == "response_item":
-            payload = ev.get("payload") if isinstance(ev.get("payload"), dict) else {}
-            name = payload.get("name") or ev.get("name")
-            args = payload.get("arguments") or ev.get("arguments")
-            output = payload.get("output") if "output" in payload else ev.get("output")
-            encrypted = payload.get("encrypted_content") if isinstance(payload, dict) else None
-            if name or args:
-                lines.append(f"- {prefix}[call] `{name}`")
-                if args:
-                    lines.append("  - arguments:")
-                    lines.append("    ```")
-                    for line in redact_text(extract_text(args)).splitlines() or [""]:
-                        lines.append(f"    {line}")
-                    lines.append("    ```")
-            elif output is not None:
-                lines.append(f"- {prefix}[output]")
-                lines.append("  ```")
-                for line in redact_text(extract_text(output)).splitlines() or [""]:
-                    lines.append(f"  {line}")
-                lines.append("  ```")
-            else:
-                text = extract_response_text(ev)
-                if text:
-                    lines.append(f"- {prefix}[response_item]")
-                    lines.extend(render_text_block(redact_text(text)))
-                elif encrypted:
-                    lines.append(f"- {prefix}[response_item] (encrypted content omitted)")
-                else:
-                    lines.append(f"- {prefix}[response_item]")
-                    lines.append("```json")
-                    lines.append(dump_json(ev))
-                    lines.append("```")
-            continue
+    if etype == "session_meta":
+        meta = ev.get("payload") if isinstance(ev.get("payload"), dict) else ev
+        lines.append(f"- {prefix}[session_meta]")
+        for key in ("id", "timestamp", "cwd", "originator", "cli_version", "source", "model_provider"):
+            value = meta.get(key) if isinstance(meta, dict) else None
+            if value:
+                lines.append(f"  - {key}: {redact_text(str(value))}")
+        base_text = ""
+        if isinstance(meta, dict):
+            base = meta.get("base_instructions")
+            if isinstance(base, dict):
+                base_text = base.get("text") or ""
+        if base_text:
+            lines.append("  - base_instructions:")
+            lines.extend(render_text_block(redact_text(base_text)))
+        else:
+            lines.append("```json")
+            lines.append(dump_json(ev))
+            lines.append("```")
+        return lines
 
-        if etype == "function_call":
-            name = ev.get("name") or (msg.get("name") if isinstance(msg, dict) else None)
-            args = ev.get("arguments") or (msg.get("arguments") if isinstance(msg, dict) else None)
-            parsed_args = None
-            if isinstance(args, str):
-                try:
-                    parsed_args = json.loads(args)
-                except json.JSONDecodeError:
-                    parsed_args = None
-            command = ""
-            workdir = ""
-            if isinstance(parsed_args, dict):
-                command = parsed_args.get("command", "")
-                workdir = parsed_args.get("workdir", "")
+    if etype == "event_msg":
+        return lines
+
+    if etype == "response_item":
+        payload = ev.get("payload") if isinstance(ev.get("payload"), dict) else {}
+        name = payload.get("name") or ev.get("name")
+        args = payload.get("arguments") or ev.get("arguments")
+        output = payload.get("output") if "output" in payload else ev.get("output")
+        encrypted = payload.get("encrypted_content") if isinstance(payload, dict) else None
+        if name or args:
             lines.append(f"- {prefix}[call] `{name}`")
-            if workdir:
-                lines.append(f"  - workdir: `{redact_text(workdir)}`")
-            if command:
-                lines.append("  - command:")
-                lines.append("    ```")
-                for line in redact_text(command).splitlines() or [""]:
-                    lines.append(f"    {line}")
-                lines.append("    ```")
-            elif args:
+            if args:
                 lines.append("  - arguments:")
                 lines.append("    ```")
                 for line in redact_text(extract_text(args)).splitlines() or [""]:
                     lines.append(f"    {line}")
                 lines.append("    ```")
-            continue
-
-        if etype == "function_call_output":
-            output = ev.get("output") or (msg.get("output") if isinstance(msg, dict) else None)
-            if output:
-                lines.append(f"- {prefix}[output]")
-                lines.append("  ```")
-                for line in redact_text(extract_text(output)).splitlines() or [""]:
-                    lines.append(f"  {line}")
-                lines.append("  ```")
-            continue
-
-        if etype in {"message", "agent_message"}:
-            content = ev.get("message") or ev.get("content") or msg
-            text = redact_text(extract_text(content))
-            if text:
-                lines.append(f"- {prefix}[message]")
-                lines.extend(render_text_block(text))
-            continue
-
-        if etype == "agent_reasoning":
-            text = ""
-            if isinstance(msg, dict):
-                text = msg.get("text") or ""
-            else:
-                text = extract_text(msg)
-            text = redact_text(text)
-            if text:
-                lines.append(f"- {prefix}[reasoning]")
-                lines.extend(render_text_block(text))
-            continue
-
-        if etype:
-            text = redact_text(extract_text(msg))
-            lines.append(f"- {prefix}[{etype}]")
+        elif output is not None:
+            lines.append(f"- {prefix}[output]")
+            lines.append("  ```")
+            for line in redact_text(extract_text(output)).splitlines() or [""]:
+                lines.append(f"  {line}")
+            lines.append("  ```")
+        else:
+            text = extract_response_text(ev)
             if text:
-                lines.append("```")
-                lines.append(text)
-                lines.append("```")
+                lines.append(f"- {prefix}[response_item]")
+                lines.extend(render_text_block(redact_text(text)))
+            elif encrypted:
+                lines.append(f"- {prefix}[response_item] (encrypted content omitted)")
             else:
+                lines.append(f"- {prefix}[response_item]")
                 lines.append("```json")
                 lines.append(dump_json(ev))
                 lines.append("```")
+        return lines
+
+    if etype == "function_call":
+        name = ev.get("name") or (msg.get("name") if isinstance(msg, dict) else None)
+        args = ev.get("arguments") or (msg.get("arguments") if isinstance(msg, dict) else None)
+        parsed_args = None
+        if isinstance(args, str):
+            try:
+                parsed_args = json.loads(args)
+            except json.JSONDecodeError:
+                parsed_args = None
+        command = ""
+        workdir = ""
+        if isinstance(parsed_args, dict):
+            command = parsed_args.get("command", "")
+            workdir = parsed_args.get("workdir", "")
+        lines.append(f"- {prefix}[call] `{name}`")
+        if workdir:
+            lines.append(f"  - workdir: `{redact_text(workdir)}`")
+        if command:
+            lines.append("  - command:")
+            lines.append("    ```")
+            for line in redact_text(command).splitlines() or [""]:
+                lines.append(f"    {line}")
+            lines.append("    ```")
+        elif args:
+            lines.append("  - arguments:")
+            lines.append("    ```")
+            for line in redact_text(extract_text(args)).splitlines() or [""]:
+                lines.append(f"    {line}")
+            lines.append("    ```")
+        return lines
+
+    if etype == "function_call_output":
+        output = ev.get("output") or (msg.get("output") if isinstance(msg, dict) else None)
+        if output:
+            lines.append(f"- {prefix}[output]")
+            lines.append("  ```")
+            for line in redact_text(extract_text(output)).splitlines() or [""]:
+                lines.append(f"  {line}")
+            lines.append("  ```")
+        return lines
+
+    if etype in {"message", "agent_message"}:
+        content = ev.get("message") or ev.get("content") or msg
+        text = redact_text(extract_text(content))
+        if text:
+            lines.append(f"- {prefix}[message]")
+            lines.extend(render_text_block(text))
+        return lines
+
+    if etype == "agent_reasoning":
+        text = ""
+        if isinstance(msg, dict):
+            text = msg.get("text") or ""
+        else:
+            text = extract_text(msg)
+        text = redact_text(text)
+        if text:
+            lines.append(f"- {prefix}[reasoning]")
+            lines.extend(render_text_block(text))
+        return lines
+
+    if etype:
+        text = redact_text(extract_text(msg))
+        lines.append(f"- {prefix}[{etype}]")
+        if text:
+            lines.append("```")
+            lines.append(text)
+            lines.append("```")
+        else:
+            lines.append("```json")
+            lines.append(dump_json(ev))
+            lines.append("```")
+    return lines
+
+
+def markdown_header(source_path: Path) -> list:
+    return ["# Codex Rollout Transcript", "", f"- Source: {source_path}", ""]
+
+
+def markdown_trailer(count: int) -> list:
+    return ["", f"- Events: {count}"]
+
+
+def iter_markdown_lines(events, source_path: Path):
+    """Yield the transcript line by line while consuming ``events`` lazily.
+
+    The event count is only known once the stream ends, so it is emitted in a
+    trailer rather than the header.
+    """
+    yield from markdown_header(source_path)
+    count = 0
+    for ev in events:
+        count += 1
+        yield from render_event(ev)
+    yield from markdown_trailer(count)
+
+
+def render_markdown(events: list, source_path: Path) -> str:
+    return "\n".join(iter_markdown_lines(events, source_path)) + "\n"
+
+
+def iter_redacted_events(src, dst):
+    """Copy redacted rollout lines from ``src`` to ``dst``, yielding parsed events.
+
+    The raw line is screened against the redaction triggers before it is
+    decoded. Lines without a trigger are copied through verbatim and skip
+    redaction and re-encoding; they are still decoded afterwards because the
+    Markdown renderer needs the event.
+    """
+    for line in src:
+        line = line.strip()
+        if not line:
+            continue
+        if not may_contain_secret(line):
+            dst.write(line + "\n")
+            try:
+                obj = loads(line)
+            except ValueError:
+                continue
+            yield obj
+            continue
+        try:
+            obj = loads(line)
+        except ValueError:
+            dst.write(redact_text(line) + "\n")
+            continue
+        redacted = redact_obj(obj)
+        dst.write(json.dumps(redacted, ensure_ascii=True) + "\n")
+        yield redacted
 
-    return "\n".join(lines) + "\n"
+
+def iter_rollout_lines(src, progress: dict, hasher=None, hold_partial: bool = False):
+    """Yield decoded lines from binary ``src``, recording consumed bytes in ``progress``.
+
+    With ``hold_partial`` a trailing line without a newline is only consumed
+    when it parses as JSON on its own; otherwise it may still be mid-write and
+    is left for the next incremental run.
+    """
+    for raw in src:
+        if hold_partial and not raw.endswith(b"\n"):
+            try:
+                loads(raw)
+            except ValueError:
+                break
+        progress["offset"] += len(raw)
+        if hasher is not None:
+            hasher.update(raw)
+        yield raw.decode("utf-8", "ignore")
+
+
+def checkpoint_path(out_jsonl: Path) -> Path:
+    return out_jsonl.with_name(f"{out_jsonl.name}.checkpoint.json")
+
+
+def load_checkpoint(path: Path, rollout: Path, out_jsonl: Path, out_md: Path):
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+        return None
+    if data.get("source") != str(rollout.resolve()):
+        return None
+    try:
+        if out_jsonl.stat().st_size != data.get("jsonl_size") or out_md.stat().st_size != data.get("md_size"):
+            return None
+        if rollout.stat().st_size < int(data.get("offset") or 0):
+            return None
+    except (OSError, TypeError, ValueError):
+        return None
+    return data
+
+
+def prefix_matches(src, offset: int, expected: str, hasher) -> bool:
+    remaining = offset
+    while remaining > 0:
+        chunk = src.read(min(remaining, 1 << 20))
+        if not chunk:
+            return False
+        hasher.update(chunk)
+        remaining -= len(chunk)
+    return hasher.hexdigest() == expected
+
+
+def save_checkpoint(path: Path, data: dict) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def extract_rollout(rollout: Path, out_jsonl: Path, out_md: Path, incremental: bool = False) -> None:
+    if not incremental:
+        with (
+            rollout.open("rb") as src,
+            out_jsonl.open("w", encoding="utf-8") as dst,
+            out_md.open("w", encoding="utf-8") as md,
+        ):
+            lines = iter_rollout_lines(src, {"offset": 0})
+            for md_line in iter_markdown_lines(iter_redacted_events(lines, dst), rollout):
+                md.write(md_line + "\n")
+        return
+
+    ckpt_path = checkpoint_path(out_jsonl)
+    checkpoint = load_checkpoint(ckpt_path, rollout, out_jsonl, out_md)
+    with rollout.open("rb") as src:
+        hasher = hashlib.sha256()
+        # On a match, src sits at the checkpoint offset and hasher covers the
+        # verified prefix, so new lines extend the same digest.
+        resume = checkpoint is not None and prefix_matches(
+            src, int(checkpoint["offset"]), str(checkpoint.get("sha256")), hasher
+        )
+        if resume:
+            progress = {"offset": int(checkpoint["offset"])}
+            count = int(checkpoint.get("events") or 0)
+            os.truncate(out_md, int(checkpoint["md_body_size"]))
+        else:
+            src.seek(0)
+            hasher = hashlib.sha256()
+            progress = {"offset": 0}
+            count = 0
+
+        mode = "a" if resume else "w"
+        with out_jsonl.open(mode, encoding="utf-8") as dst, out_md.open(mode, encoding="utf-8") as md:
+            if not resume:
+                for md_line in markdown_header(rollout):
+                    md.write(md_line + "\n")
+            lines = iter_rollout_lines(src, progress, hasher=hasher, hold_partial=True)
+            for ev in iter_redacted_events(lines, dst):
+                count += 1
+                for md_line in render_event(ev):
+                    md.write(md_line + "\n")
+            md.flush()
+            md_body_size = os.fstat(md.fileno()).st_size
+            for md_line in markdown_trailer(count):
+                md.write(md_line + "\n")
+
+    save_checkpoint(
+        ckpt_path,
+        {
+            "version": CHECKPOINT_VERSION,
+            "source": str(rollout.resolve()),
+            "offset": progress["offset"],
+            "sha256": hasher.hexdigest(),
+            "events": count,
+            "jsonl_size": out_jsonl.stat().st_size,
+            "md_size": out_md.stat().st_size,
+            "md_body_size": md_body_size,
+        },
+    )
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Extract and redact Codex rollout logs containing a nonce.")
-    parser.add_argument("--nonce", required=True, help="Nonce string to locate in rollout JSONL files.")
+    parser = argparse.ArgumentParser(description="Extract and redact Codex rollout logs containing one or more nonces.")
+    parser.add_argument(
+        "--nonce",
+        action="append",
+        help="Nonce string to locate in rollout JSONL files (repeatable for batch extraction).",
+    )
+    parser.add_argument(
+        "--nonce-file",
+        action="append",
+        help="File with one nonce per line ('-' reads stdin); combined with any --nonce values.",
+    )
     parser.add_argument(
         "--sessions-root",
         default=str(Path.home() / ".codex" / "sessions"),
@@ -321,52 +682,95 @@ def main() -> int:
         default=None,
         help="Explicit output path for Markdown transcript (overrides --output-dir)",
     )
+    parser.add_argument(
+        "--index-path",
+        default=None,
+        help="Rollout index location (default: .parallelus/cache/codex-rollout-index.json)",
+    )
+    parser.add_argument(
+        "--search",
+        choices=["index", "newest", "full"],
+        default="index",
+        help=(
+            "How to locate the rollout: consult the incremental index (default), walk rollouts "
+            "newest-first and stop at the first hit, or scan every rollout"
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Resume from the checkpoint stored next to the redacted JSONL and append only events "
+            "added since the previous run (falls back to a full extraction if the prefix changed)"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes for batch extraction (default: one per matched rollout, up to the CPU count)",
+    )
     args = parser.parse_args()
 
+    nonces = list(args.nonce or [])
+    for nonce_file in args.nonce_file or []:
+        nonces.extend(read_nonce_file(nonce_file))
+    nonces = list(dict.fromkeys(nonces))
+    if not nonces:
+        parser.error("at least one --nonce or --nonce-file entry is required")
+    if len(nonces) > 1 and (args.output_jsonl or args.output_md):
+        parser.error("--output-jsonl/--output-md require a single nonce")
+
+    repo_root = Path(__file__).resolve().parents[3]
     root = Path(args.sessions_root).expanduser()
-    matched = find_rollouts(root, args.nonce)
-    if not matched:
+    index_path = Path(args.index_path).expanduser() if args.index_path else default_index_path(repo_root)
+    resolved = resolve_rollouts(root, nonces, args.search, index_path)
+    missing = [nonce for nonce in nonces if resolved[nonce] is None]
+    if len(nonces) == 1 and missing:
         raise SystemExit("extract_codex_rollout: no rollout files contained the nonce")
+    if len(missing) == len(nonces):
+        raise SystemExit("extract_codex_rollout: no rollout files contained any of the nonces")
 
-    matched.sort(key=lambda p: p.stat().st_mtime)
-    rollout = matched[-1]
-
-    repo_root = Path(__file__).resolve().parents[3]
     if args.output_dir:
         out_dir = Path(args.output_dir).expanduser()
     else:
         out_dir = default_output_dir(repo_root)
     out_dir = out_dir.resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
-    if args.output_jsonl:
-        out_jsonl = Path(args.output_jsonl)
-    else:
-        out_jsonl = out_dir / f"codex-rollout-{rollout.stem}.jsonl"
-    if args.output_md:
-        out_md = Path(args.output_md)
-    else:
-        out_md = out_dir / f"codex-rollout-{rollout.stem}.md"
 
-    events = []
-    with rollout.open("r", encoding="utf-8", errors="ignore") as src, out_jsonl.open("w", encoding="utf-8") as dst:
-        for line in src:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                dst.write(redact_text(line) + "\n")
-                continue
-            redacted = redact_obj(obj)
-            events.append(redacted)
-            dst.write(json.dumps(redacted, ensure_ascii=True) + "\n")
-
-    out_md.write_text(render_markdown(events, rollout), encoding="utf-8")
-
-    print(str(out_jsonl.resolve()))
-    print(str(out_md.resolve()))
-    return 0
+    outputs = {}
+    for rollout in dict.fromkeys(path for path in resolved.values() if path is not None):
+        out_jsonl = Path(args.output_jsonl) if args.output_jsonl else out_dir / f"codex-rollout-{rollout.stem}.jsonl"
+        out_md = Path(args.output_md) if args.output_md else out_dir / f"codex-rollout-{rollout.stem}.md"
+        outputs[rollout] = (out_jsonl, out_md)
+
+    jobs = args.jobs or min(len(outputs), os.cpu_count() or 1)
+    if len(outputs) > 1 and jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                pool.submit(extract_rollout, rollout, *paths, incremental=args.incremental)
+                for rollout, paths in outputs.items()
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for rollout, paths in outputs.items():
+            extract_rollout(rollout, *paths, incremental=args.incremental)
+
+    if len(nonces) == 1:
+        out_jsonl, out_md = outputs[resolved[nonces[0]]]
+        print(str(out_jsonl.resolve()))
+        print(str(out_md.resolve()))
+        return 0
+
+    for nonce in nonces:
+        rollout = resolved[nonce]
+        if rollout is None:
+            print(f"extract_codex_rollout: no rollout files contained nonce {nonce}", file=sys.stderr)
+            continue
+        out_jsonl, out_md = outputs[rollout]
+        print(f"{nonce}\t{out_jsonl.resolve()}\t{out_md.resolve()}")
+    return 1 if missing else 0
 
 
 if __name__ == "__main__":
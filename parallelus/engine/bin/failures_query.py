@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Query failures summaries across branches through a local SQLite index.
+
+Every ``failures/<branch>--<marker>.json`` summary (and the clustered
+``.failures.jsonl`` stream next to it) is folded into
+``.parallelus/cache/failures-index.sqlite``. Each run only re-reads summaries
+whose size or mtime changed since they were indexed, so aggregate queries stay
+in the millisecond range with thousands of reports.
+
+Usage:
+    failures_query.py top-commands [--branch B] [--limit N]
+    failures_query.py branches
+    failures_query.py trend [--by day|week|month] [--branch B] [--command TEXT]
+    failures_query.py reindex
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+from collect_failures import failure_fingerprint
+from parallelus_docs_paths import failures_stream_path, self_improvement_read_roots
+from parallelus_jsonl import iter_jsonl
+from parallelus_repo_context import repo_context
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE reports (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    stamp TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    marker_timestamp TEXT NOT NULL,
+    failure_count INTEGER NOT NULL,
+    cluster_count INTEGER NOT NULL,
+    warning_count INTEGER NOT NULL
+);
+CREATE TABLE failures (
+    report_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX reports_branch ON reports (branch, marker_timestamp);
+CREATE INDEX reports_marker ON reports (marker_timestamp);
+CREATE INDEX failures_report ON failures (report_id);
+CREATE INDEX failures_label ON failures (label, kind, count);
+"""
+
+PERIODS = {
+    "day": "substr(r.marker_timestamp, 1, 10)",
+    "week": "strftime('%Y-W%W', substr(r.marker_timestamp, 1, 19))",
+    "month": "substr(r.marker_timestamp, 1, 7)",
+}
+
+
+def git_root() -> Path:
+    return repo_context().root
+
+
+def default_index_path(repo: Path) -> Path:
+    return repo / ".parallelus" / "cache" / "failures-index.sqlite"
+
+
+def iter_summary_paths(repo: Path):
+    for root in self_improvement_read_roots(repo):
+        failures_dir = root / "failures"
+        if failures_dir.is_dir():
+            yield from sorted(failures_dir.glob("*.json"))
+
+
+def _stamp(path: Path) -> str:
+    """Cheap change token for a summary and its JSONL stream."""
+    parts = []
+    for candidate in (path, failures_stream_path(path)):
+        try:
+            st = candidate.stat()
+        except FileNotFoundError:
+            parts.append("-")
+            continue
+        parts.append(f"{st.st_size}:{st.st_mtime_ns}")
+    return "/".join(parts)
+
+
+def _branch_from_name(path: Path) -> str:
+    return path.stem.split("--", 1)[0]
+
+
+def _summary_failures(path: Path, summary: dict):
+    stream_name = summary.get("failures_file")
+    if stream_name:
+        yield from iter_jsonl(path.with_name(str(stream_name)))
+    else:
+        yield from summary.get("failures") or []
+
+
+def _failure_row(report_id: int, item: dict) -> tuple:
+    """Return the index row for a cluster, or for a raw failure in a legacy summary."""
+    fingerprint = item.get("fingerprint")
+    if fingerprint:
+        command = item.get("normalized_command") or ""
+        signature = item.get("signature") or ""
+    else:
+        fingerprint, command, signature = failure_fingerprint(item)
+    kind = str(item.get("kind") or "failure")
+    count = item.get("count")
+    return (
+        report_id,
+        kind,
+        command or signature or kind,
+        fingerprint,
+        count if isinstance(count, int) and count > 0 else 1,
+    )
+
+
+def connect(index_path: Path, *, rebuild: bool = False) -> sqlite3.Connection:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    if rebuild:
+        index_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(index_path)
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.close()
+        index_path.unlink(missing_ok=True)
+        conn = sqlite3.connect(index_path)
+        conn.row_factory = sqlite3.Row
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def refresh_index(conn: sqlite3.Connection, repo: Path) -> dict:
+    """Bring the index in line with the summaries on disk; return change counts."""
+    indexed = {row["path"]: (row["id"], row["stamp"]) for row in conn.execute("SELECT id, path, stamp FROM reports")}
+    stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "unreadable": 0}
+    seen: set[str] = set()
+    with conn:
+        for path in iter_summary_paths(repo):
+            key = str(path.relative_to(repo)) if path.is_relative_to(repo) else str(path)
+            seen.add(key)
+            stamp = _stamp(path)
+            previous = indexed.get(key)
+            if previous and previous[1] == stamp:
+                stats["unchanged"] += 1
+                continue
+            if previous:
+                # Drop the old rows first, so a summary that is now unreadable stops counting.
+                conn.execute("DELETE FROM failures WHERE report_id = ?", (previous[0],))
+                conn.execute("DELETE FROM reports WHERE id = ?", (previous[0],))
+            try:
+                summary = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                stats["unreadable"] += 1
+                continue
+            if not isinstance(summary, dict):
+                stats["unreadable"] += 1
+                continue
+            cursor = conn.execute(
+                "INSERT INTO reports (path, stamp, branch, marker_timestamp, failure_count, cluster_count, warning_count)"
+                " VALUES (?, ?, ?, ?, 0, 0, ?)",
+                (
+                    key,
+                    stamp,
+                    str(summary.get("branch") or _branch_from_name(path)),
+                    str(summary.get("marker_timestamp") or path.stem.split("--", 1)[-1]),
+                    len(summary.get("warnings") or []),
+                ),
+            )
+            report_id = cursor.lastrowid
+            rows = [_failure_row(report_id, item) for item in _summary_failures(path, summary) if isinstance(item, dict)]
+            conn.executemany(
+                "INSERT INTO failures (report_id, kind, label, fingerprint, count) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            failure_count = summary.get("failure_count")
+            if not isinstance(failure_count, int):
+                failure_count = sum(row[-1] for row in rows)
+            conn.execute(
+                "UPDATE reports SET failure_count = ?, cluster_count = ? WHERE id = ?",
+                (failure_count, len(rows), report_id),
+            )
+            stats["updated" if previous else "added"] += 1
+        for key, (report_id, _) in indexed.items():
+            if key not in seen:
+                conn.execute("DELETE FROM failures WHERE report_id = ?", (report_id,))
+                conn.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+                stats["removed"] += 1
+    return stats
+
+
+def query_top_commands(conn: sqlite3.Connection, *, branch: str | None = None, limit: int = 20) -> list[dict]:
+    where = "WHERE r.branch = ?" if branch else ""
+    params: list = [branch] if branch else []
+    rows = conn.execute(
+        f"""
+        SELECT f.label AS command, f.kind AS kind, SUM(f.count) AS failures,
+               COUNT(DISTINCT r.branch) AS branches, COUNT(DISTINCT r.id) AS reports,
+               MAX(r.marker_timestamp) AS last_marker
+        FROM failures f JOIN reports r ON r.id = f.report_id
+        {where}
+        GROUP BY f.label, f.kind
+        ORDER BY failures DESC, reports DESC, command
+        LIMIT ?
+        """,
+        [*params, limit],
+    )
+    return [dict(row) for row in rows]
+
+
+def query_branches(conn: sqlite3.Connection) -> list[dict]:
+    rows = conn.execute(
+        """
+        SELECT branch, COUNT(*) AS reports, SUM(failure_count > 0) AS failing_reports,
+               ROUND(1.0 * SUM(failure_count > 0) / COUNT(*), 3) AS failure_rate,
+               SUM(failure_count) AS failures,
+               ROUND(1.0 * SUM(failure_count) / COUNT(*), 2) AS failures_per_report,
+               MAX(marker_timestamp) AS last_marker
+        FROM reports
+        GROUP BY branch
+        ORDER BY failure_rate DESC, failures DESC, branch
+        """
+    )
+    return [dict(row) for row in rows]
+
+
+def query_trend(
+    conn: sqlite3.Connection, *, by: str = "day", branch: str | None = None, command: str | None = None
+) -> list[dict]:
+    period = PERIODS[by]
+    clauses = []
+    params: list = []
+    if branch:
+        clauses.append("r.branch = ?")
+        params.append(branch)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    if command:
+        # Failures of the matching commands only, per marker period.
+        sql = f"""
+            SELECT {period} AS period, COUNT(DISTINCT r.id) AS reports, SUM(f.count) AS failures
+            FROM failures f JOIN reports r ON r.id = f.report_id
+            {where} {"AND" if where else "WHERE"} f.label LIKE ? ESCAPE '\\'
+            GROUP BY period ORDER BY period
+        """
+        escaped = command.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{escaped}%")
+    else:
+        sql = f"""
+            SELECT {period} AS period, COUNT(*) AS reports, SUM(r.failure_count > 0) AS failing_reports,
+                   SUM(r.failure_count) AS failures
+            FROM reports r
+            {where}
+            GROUP BY period ORDER BY period
+        """
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def _print_table(rows: list[dict]) -> None:
+    if not rows:
+        print("(no failures indexed)")
+        return
+    columns = list(rows[0])
+    cells = [[("" if row[col] is None else str(row[col])) for col in columns] for row in rows]
+    widths = [max(len(col), *(len(line[idx]) for line in cells)) for idx, col in enumerate(columns)]
+    print("  ".join(col.ljust(width) for col, width in zip(columns, widths)).rstrip())
+    for line in cells:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index", type=Path, default=None, help="SQLite index path (default: .parallelus/cache/failures-index.sqlite)")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON instead of a table")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    top = sub.add_parser("top-commands", help="Most frequent failing commands across reports")
+    top.add_argument("--branch", default=None, help="Only count reports for this branch")
+    top.add_argument("--limit", type=int, default=20, help="Rows to show (default: 20)")
+
+    sub.add_parser("branches", help="Failure rate per branch")
+
+    trend = sub.add_parser("trend", help="Failures per marker period")
+    trend.add_argument("--by", choices=sorted(PERIODS), default="day", help="Bucket size (default: day)")
+    trend.add_argument("--branch", default=None, help="Only count reports for this branch")
+    trend.add_argument("--command", dest="match", default=None, help="Only count failures whose command contains TEXT")
+
+    sub.add_parser("reindex", help="Rebuild the index from scratch")
+    args = parser.parse_args()
+
+    repo = git_root()
+    index_path = args.index or default_index_path(repo)
+    try:
+        conn = connect(index_path, rebuild=args.command == "reindex")
+    except sqlite3.Error as exc:
+        raise SystemExit(f"failures_query: cannot open index {index_path} ({exc}); run failures_query.py reindex")
+    with conn:
+        stats = refresh_index(conn, repo)
+        if args.command == "reindex":
+            rows = [stats]
+        elif args.command == "top-commands":
+            rows = query_top_commands(conn, branch=args.branch, limit=max(1, args.limit))
+        elif args.command == "branches":
+            rows = query_branches(conn)
+        else:
+            rows = query_trend(conn, by=args.by, branch=args.branch, command=args.match)
+    conn.close()
+
+    if stats["unreadable"]:
+        print(f"failures_query: skipped {stats['unreadable']} unreadable summaries", file=sys.stderr)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_table(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -104,10 +104,13 @@ create_runner() {
 
   # Ensure exec-mode helpers are available inside the sandbox even when the
   # sandbox is created from a different git commit than the current working tree.
-  if [[ -f "$repo_root/parallelus/engine/bin/codex_exec_stream_filter.py" ]]; then
-    mkdir -p "$path/parallelus/engine/bin"
-    cp "$repo_root/parallelus/engine/bin/codex_exec_stream_filter.py" "$path/parallelus/engine/bin/" 2>/dev/null || true
-  fi
+  local helper
+  for helper in codex_exec_stream_filter.py parallelus_jsonl.py parallelus_redaction.py; do
+    if [[ -f "$repo_root/parallelus/engine/bin/$helper" ]]; then
+      mkdir -p "$path/parallelus/engine/bin"
+      cp "$repo_root/parallelus/engine/bin/$helper" "$path/parallelus/engine/bin/" 2>/dev/null || true
+    fi
+  done
 
   local path_q prompt_q log_q inner_q
   printf -v path_q "%q" "$path"
@@ -275,10 +278,11 @@ if is_enabled "${SUBAGENT_CODEX_USE_EXEC:-}"; then
   last_message_path="$WORKDIR/subagent.last_message.txt"
   exec_session_id_path="$WORKDIR/subagent.exec_session_id"
   exec_events_path="$WORKDIR/subagent.exec_events.jsonl"
+  exec_metrics_path="$WORKDIR/subagent.exec_metrics.json"
   exec_filter="$WORKDIR/parallelus/engine/bin/codex_exec_stream_filter.py"
   if is_enabled "${SUBAGENT_CODEX_EXEC_JSON:-}"; then
     # JSONL mode: persist raw events + render agent messages + lightweight event summaries.
-    printf '%s' "$prompt_content" | codex exec "${args[@]}" --color never --json --output-last-message "$last_message_path" - | python3 "$exec_filter" --mode json --events-path "$exec_events_path" --session-id-path "$exec_session_id_path" --last-message-path "$last_message_path"
+    printf '%s' "$prompt_content" | codex exec "${args[@]}" --color never --json --output-last-message "$last_message_path" - | python3 "$exec_filter" --mode json --events-path "$exec_events_path" --session-id-path "$exec_session_id_path" --last-message-path "$last_message_path" --metrics-path "$exec_metrics_path"
     exit $?
   fi
 
@@ -77,3 +77,9 @@ def reports_write_dir(repo_root: Path) -> Path:
 
 def failures_write_dir(repo_root: Path) -> Path:
     return self_improvement_write_root(repo_root) / "failures"
+
+
+def failures_stream_path(summary_path: Path) -> Path:
+    """Return the JSONL failures file that accompanies a failures summary."""
+    stem = summary_path.name[: -len(".json")] if summary_path.name.endswith(".json") else summary_path.name
+    return summary_path.with_name(f"{stem}.failures.jsonl")
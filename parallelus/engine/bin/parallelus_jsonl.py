@@ -0,0 +1,85 @@
+"""Shared JSONL decoding helpers for Python scripts.
+
+Decoding uses the fastest installed backend (orjson, then msgspec) and falls
+back to the stdlib ``json`` module when neither is available. Set
+``PARALLELUS_JSON_BACKEND`` to ``stdlib``, ``orjson`` or ``msgspec`` to pin a
+backend; an unknown or uninstalled one is reported on stderr and the best
+available backend is used instead. Lines a fast backend rejects are retried with the stdlib decoder, so
+extensions it accepts (NaN, Infinity) parse identically everywhere. Integers
+beyond 64 bits may come back as floats from orjson; Codex logs never carry them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+BACKENDS = ("orjson", "msgspec", "stdlib")
+
+
+def _load_backend(name: str) -> Callable[[Any], Any] | None:
+    if name == "stdlib":
+        return json.loads
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            return None
+        return orjson.loads
+    if name == "msgspec":
+        try:
+            import msgspec
+        except ImportError:
+            return None
+        return msgspec.json.decode
+    return None
+
+
+def available_backends() -> list[str]:
+    return [name for name in BACKENDS if _load_backend(name) is not None]
+
+
+def get_decoder(name: str | None = None) -> tuple[str, Callable[[Any], Any]]:
+    """Return ``(backend_name, loads)`` for ``name`` or the best available backend."""
+    requested = (name or os.environ.get("PARALLELUS_JSON_BACKEND") or "").strip().lower()
+    if requested and _load_backend(requested) is None:
+        reason = "not installed" if requested in BACKENDS else f"unknown (choose from {', '.join(BACKENDS)})"
+        print(f"parallelus_jsonl: JSON backend {requested!r} is {reason}; using the best available", file=sys.stderr)
+        requested = ""
+    for candidate in ([requested] if requested else []) + list(BACKENDS):
+        fast = _load_backend(candidate)
+        if fast is None:
+            continue
+        if candidate == "stdlib":
+            return candidate, json.loads
+
+        def loads(data, _fast=fast):
+            try:
+                return _fast(data)
+            except Exception:
+                return json.loads(data)
+
+        return candidate, loads
+    return "stdlib", json.loads
+
+
+BACKEND, loads = get_decoder()
+
+
+def iter_jsonl(path: Path) -> Iterator[Any]:
+    """Yield decoded objects from ``path``, skipping blank and malformed lines."""
+    try:
+        with path.open("rb") as fh:
+            for raw in fh:
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    yield loads(raw)
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        return
@@ -0,0 +1,167 @@
+"""Shared secret-redaction helpers for Python scripts.
+
+Each rule carries a few lowercase literal triggers. A string is first checked
+for those triggers with plain substring searches; only the rules whose
+triggers appear are then applied, one after another in table order, so a
+clean string costs a handful of ``in`` checks and a dirty one a pass per
+triggered rule. Applying them in sequence (rather than as one alternation)
+keeps overlapping secrets redacted: ``token: Bearer abc`` loses both the
+bearer value and the assignment.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterator
+
+# (label, pattern, replacement, ignore_case, triggers). A rule can only match
+# when one of its triggers occurs in the lowercased text. A trigger ending in
+# "=" names a keyword that only counts when it is followed, after optional
+# whitespace, by ":", "=" or a backslash (a JSON escape that may hide either):
+# bare "token" or "api" would fire on nearly every rollout line ("token_count"
+# events, API paths). Rules run in this order, each on the output of the
+# previous one.
+REDACTION_RULES: list[tuple[str, str, str, bool, tuple[str, ...]]] = [
+    (
+        "private key block",
+        r"-----BEGIN [A-Z ]+PRIVATE KEY-----[\s\S]+?-----END [A-Z ]+PRIVATE KEY-----",
+        "[REDACTED_PRIVATE_KEY]",
+        False,
+        ("-----begin ",),
+    ),
+    ("aws access key id", r"\bAKIA[0-9A-Z]{16}\b", "[REDACTED_AWS_ACCESS_KEY]", False, ("akia",)),
+    ("aws session key id", r"\bASIA[0-9A-Z]{16}\b", "[REDACTED_AWS_SESSION_KEY]", False, ("asia",)),
+    (
+        "aws secret",
+        r"(aws[^\n]{0,20}?(secret|access)?_?key)\s*[:=]\s*[A-Za-z0-9/+=]{20,}",
+        r"\1=[REDACTED_AWS_SECRET]",
+        True,
+        ("aws",),
+    ),
+    (
+        "github token",
+        r"\bgh[pousr]_[A-Za-z0-9]{36,}\b",
+        "[REDACTED_GH_TOKEN]",
+        False,
+        ("ghp_", "gho_", "ghu_", "ghs_", "ghr_"),
+    ),
+    ("slack token", r"\bxox[baprs]-[A-Za-z0-9-]+\b", "[REDACTED_SLACK_TOKEN]", False, ("xox",)),
+    ("api key", r"\bsk-[A-Za-z0-9]{20,}\b", "[REDACTED_API_KEY]", False, ("sk-",)),
+    ("bearer token", r"(bearer\s+)[A-Za-z0-9\-._~+/]+=*", r"\1[REDACTED_TOKEN]", True, ("bearer",)),
+    (
+        "credential flag",
+        r"(--(?:api[-_]?key|token|password|secret))\s+[^\s'\"]+",
+        r"\1 [REDACTED]",
+        True,
+        ("--apikey", "--api_key", "--api-key", "--token", "--password", "--secret"),
+    ),
+    (
+        "credential assignment",
+        r"\b(token|api[-_]?key|access[-_]?key|secret|password|passwd|pwd)\b\s*[:=]\s*[^\s'\"]+",
+        r"\1=[REDACTED]",
+        True,
+        (
+            "token=",
+            "apikey=",
+            "api_key=",
+            "api-key=",
+            "accesskey=",
+            "access_key=",
+            "access-key=",
+            "secret=",
+            "password=",
+            "passwd=",
+            "pwd=",
+        ),
+    ),
+]
+
+_COMPILED_RULES = [
+    (label, re.compile(pattern, re.IGNORECASE if ignore_case else 0), replacement)
+    for label, pattern, replacement, ignore_case, _ in REDACTION_RULES
+]
+
+_RULE_TRIGGERS = [
+    (
+        idx,
+        tuple(trigger for trigger in rule[4] if not trigger.endswith("=")),
+        tuple(trigger[:-1] for trigger in rule[4] if trigger.endswith("=")),
+    )
+    for idx, rule in enumerate(REDACTION_RULES)
+]
+
+
+def _assigned(lowered: str, keyword: str) -> bool:
+    """True if ``keyword`` is followed, after optional whitespace, by ``:``, ``=`` or ``\\``."""
+    end = len(lowered)
+    start = lowered.find(keyword)
+    while start >= 0:
+        pos = start + len(keyword)
+        while pos < end and lowered[pos].isspace():
+            pos += 1
+        if pos < end and lowered[pos] in ":=\\":
+            return True
+        start = lowered.find(keyword, pos)
+    return False
+
+
+_ALL_LITERALS = tuple(trigger for _, literals, _ in _RULE_TRIGGERS for trigger in literals)
+_ALL_KEYWORDS = tuple(keyword for _, _, keywords in _RULE_TRIGGERS for keyword in keywords)
+
+
+def _triggered(lowered: str, literals: tuple[str, ...], keywords: tuple[str, ...]) -> bool:
+    for trigger in literals:
+        if trigger in lowered:
+            return True
+    for keyword in keywords:
+        if keyword in lowered and _assigned(lowered, keyword):
+            return True
+    return False
+
+
+def candidate_rules(text: str) -> tuple[int, ...]:
+    """Return the indices of rules whose triggers occur in ``text``.
+
+    Triggers are plain ASCII substrings, so this also works on raw JSON lines:
+    an empty result means no rule can match any decoded string value either.
+    """
+    lowered = text.lower()
+    if not _triggered(lowered, _ALL_LITERALS, _ALL_KEYWORDS):
+        return ()
+    return tuple(idx for idx, literals, keywords in _RULE_TRIGGERS if _triggered(lowered, literals, keywords))
+
+
+def may_contain_secret(text: str) -> bool:
+    return _triggered(text.lower(), _ALL_LITERALS, _ALL_KEYWORDS)
+
+
+def redact_text(value) -> str:
+    if value is None:
+        return ""
+    text = str(value)
+    for idx in candidate_rules(text):
+        _, pattern, replacement = _COMPILED_RULES[idx]
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def redact_obj(obj):
+    if isinstance(obj, str):
+        return redact_text(obj)
+    if isinstance(obj, list):
+        return [redact_obj(item) for item in obj]
+    if isinstance(obj, dict):
+        return {k: redact_obj(v) for k, v in obj.items()}
+    return obj
+
+
+def iter_secret_matches(text: str) -> Iterator[tuple[str, re.Match]]:
+    """Yield (label, match) for every secret candidate in ``text``, rule by rule.
+
+    Rules are searched independently, so a match may overlap one reported by
+    an earlier rule (a private key after ``password:`` yields both).
+    """
+    for idx in candidate_rules(text):
+        label, pattern, _ = _COMPILED_RULES[idx]
+        for match in pattern.finditer(text):
+            yield label, match
@@ -0,0 +1,67 @@
+"""Shared repository context (top level, HEAD, branch) for Python scripts.
+
+Scripts chained by the turn-end and review-preflight pipelines all need the
+same three facts. ``repo_context()`` resolves them with a single
+``git rev-parse --show-toplevel HEAD --abbrev-ref HEAD`` call per process, or
+reuses a snapshot handed down in ``PARALLELUS_REPO_CONTEXT``: that call's
+output followed by the directory it ran in (see
+``parallelus_repo_context_snapshot`` in ``agents-paths.sh``). A snapshot taken
+in another directory is ignored, and pipelines pass it per command rather than
+exporting it, so nothing outside the pipeline run sees it.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+ENV_VAR = "PARALLELUS_REPO_CONTEXT"
+REV_PARSE = ["git", "rev-parse", "--show-toplevel", "HEAD", "--abbrev-ref", "HEAD"]
+
+
+class RepoContext(NamedTuple):
+    root: Path
+    head: Optional[str]
+    branch: Optional[str]
+
+    def snapshot(self, cwd: Optional[Path] = None) -> str:
+        """Return the ``PARALLELUS_REPO_CONTEXT`` value for children run in ``cwd``."""
+        return "\n".join([str(self.root), self.head or "", self.branch or "", str(cwd or Path.cwd())])
+
+
+def _from_snapshot(value: str) -> Optional[RepoContext]:
+    lines = value.split("\n")
+    if len(lines) != 4 or not lines[0]:
+        return None
+    root, head, branch, cwd = lines
+    try:
+        if not os.path.samefile(cwd, os.getcwd()):
+            return None
+    except OSError:
+        return None
+    return RepoContext(Path(root), head or None, branch or None)
+
+
+def _probe() -> RepoContext:
+    result = subprocess.run(REV_PARSE, capture_output=True, text=True, check=False)
+    lines = result.stdout.splitlines()
+    if result.returncode == 0 and len(lines) == 3:
+        root, head, branch = lines
+        return RepoContext(Path(root), head, branch)
+    # Outside a repository (raises as before) or on an unborn branch.
+    root = subprocess.check_output(["git", "rev-parse", "--show-toplevel"], text=True).strip()
+    symbolic = subprocess.run(["git", "symbolic-ref", "--short", "-q", "HEAD"], capture_output=True, text=True, check=False)
+    return RepoContext(Path(root), None, symbolic.stdout.strip() or None)
+
+
+@lru_cache(maxsize=None)
+def repo_context() -> RepoContext:
+    snapshot = os.environ.get(ENV_VAR, "")
+    if snapshot:
+        context = _from_snapshot(snapshot)
+        if context is not None:
+            return context
+    return _probe()
@@ -1,16 +1,51 @@
 #!/usr/bin/env python3
 """
 Generate a consolidated branch/PR report for make read_bootstrap output.
+
+PR metadata from ``gh pr list`` is cached per remote in
+``.parallelus/cache/pr-metadata.json``. Cached data is used straight away;
+once it is older than the TTL (``REPORT_BRANCHES_PR_TTL`` or ``--pr-ttl``,
+default 300s) the report marks it stale and refreshes it in a background
+process. ``--refresh-prs`` fetches synchronously instead.
+
+Ahead/behind counts and last commit dates come from a single ``for-each-ref``
+pass over local and remote branches, using ``%(ahead-behind:<base>)`` on git
+2.41+. Older git falls back to one ``rev-list`` walk for all branches (see
+``count_ahead_behind``) rather than a ``rev-list --count`` per branch.
 """
 
 from __future__ import annotations
 
+import argparse
 import json
+import os
+import signal
 import subprocess
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-import os
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from parallelus_repo_context import repo_context
+
+# Per-call timeouts (seconds); every query runs concurrently, so the report
+# takes roughly as long as the slowest one.
+GIT_TIMEOUT = float(os.environ.get("REPORT_BRANCHES_GIT_TIMEOUT") or 10)
+GH_TIMEOUT = float(os.environ.get("REPORT_BRANCHES_GH_TIMEOUT") or 15)
+PR_CACHE_TTL = float(os.environ.get("REPORT_BRANCHES_PR_TTL") or 300)
+PR_CACHE_VERSION = 1
+
+
+@dataclass
+class RefTip:
+    name: str
+    oid: str
+    date: str
+    ahead: Optional[int] = None
+    behind: Optional[int] = None
 
 
 @dataclass
@@ -18,6 +53,9 @@ class BranchInfo:
     name: str
     remote: bool = False
     local: bool = False
+    ahead: Optional[int] = None
+    behind: Optional[int] = None
+    last_commit: Optional[str] = None
     pr_number: Optional[int] = None
     pr_title: Optional[str] = None
     pr_state: Optional[str] = None
@@ -45,9 +83,21 @@ class BranchInfo:
             return "decide: merge/archive/delete"
         return ""
 
+    @property
+    def divergence(self) -> str:
+        if self.ahead is None or self.behind is None:
+            return "-"
+        return f"+{self.ahead}/-{self.behind}"
 
-def run(cmd: List[str]) -> subprocess.CompletedProcess:
-    return subprocess.run(cmd, text=True, capture_output=True, check=False)
+
+def run(cmd: List[str], timeout: float = GIT_TIMEOUT, input: Optional[str] = None) -> subprocess.CompletedProcess:
+    """Run ``cmd``; a timeout or missing binary becomes a failed result (124/127)."""
+    try:
+        return subprocess.run(cmd, input=input, text=True, capture_output=True, check=False, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return subprocess.CompletedProcess(cmd, 124, "", f"timed out after {timeout:g}s")
+    except FileNotFoundError:
+        return subprocess.CompletedProcess(cmd, 127, "", f"{cmd[0]}: command not found")
 
 
 def detect_default_branch(remote: str) -> str:
@@ -64,7 +114,13 @@ def verify_ref(ref: str) -> bool:
     return run(["git", "rev-parse", "--verify", ref]).returncode == 0
 
 
-def resolve_base_ref(remote: str) -> Tuple[str, str]:
+def resolve_base_ref(remote: str, pool: Optional[ThreadPoolExecutor] = None) -> Tuple[str, str]:
+    """Pick the base branch; probes run on ``pool``, so never call this from one of its workers."""
+    if pool is None:
+        with ThreadPoolExecutor(max_workers=4) as own_pool:
+            return resolve_base_ref(remote, own_pool)
+    # Probe the fixed fallbacks while the default branch is still being detected.
+    probes = {candidate: pool.submit(verify_ref, candidate) for candidate in ("origin/main", "main")}
     default_branch = detect_default_branch(remote)
     candidates = [
         f"{remote}/{default_branch}",
@@ -73,7 +129,10 @@ def resolve_base_ref(remote: str) -> Tuple[str, str]:
         "main",
     ]
     for candidate in candidates:
-        if verify_ref(candidate):
+        if candidate not in probes:
+            probes[candidate] = pool.submit(verify_ref, candidate)
+    for candidate in candidates:
+        if probes[candidate].result():
             if "/" in candidate:
                 branch = candidate.split("/", 1)[1]
             else:
@@ -98,44 +157,327 @@ def normalize_ref(ref: str, remote: str) -> Optional[str]:
     return None
 
 
-def list_unmerged(prefix: str, base_ref: str, remote: str) -> List[str]:
-    result = run(
-        [
-            "git",
-            "for-each-ref",
-            "--format=%(refname)",
-            "--no-merged",
-            base_ref,
-            prefix,
-        ]
-    )
+def _parse_ahead_behind(value: str) -> Tuple[Optional[int], Optional[int]]:
+    parts = value.split()
+    if len(parts) != 2 or not all(part.isdigit() for part in parts):
+        return None, None
+    return int(parts[0]), int(parts[1])
+
+
+def git_supports_ahead_behind() -> bool:
+    """True when ``for-each-ref`` knows ``%(ahead-behind:...)`` (git 2.41+)."""
+    words = run(["git", "version"]).stdout.split()
+    parts = words[2].split(".") if len(words) >= 3 else []
+    try:
+        return (int(parts[0]), int(parts[1])) >= (2, 41)
+    except (IndexError, ValueError):
+        return False
+
+
+def list_unmerged(
+    prefixes: Iterable[str], base_ref: str, remote: str, *, ahead_behind: bool = False
+) -> Dict[str, Dict[str, RefTip]]:
+    """Return unmerged branch tips under each prefix, keyed by branch name.
+
+    One ``for-each-ref`` call covers every prefix. With ``ahead_behind`` the
+    counts come from the same call; otherwise they are left as None.
+    """
+    prefixes = list(prefixes)
+    fmt = "%(refname)%09%(objectname)%09%(committerdate:short)"
+    if ahead_behind:
+        fmt += f"%09%(ahead-behind:{base_ref})"
+    result = run(["git", "for-each-ref", f"--format={fmt}", "--no-merged", base_ref, *prefixes])
+    tips: Dict[str, Dict[str, RefTip]] = {prefix: {} for prefix in prefixes}
     if result.returncode != 0:
-        return []
-    names = []
+        return tips
     for line in result.stdout.splitlines():
-        name = normalize_ref(line, remote)
-        if not name:
+        refname, _, rest = line.partition("\t")
+        name = normalize_ref(refname, remote)
+        prefix = next((p for p in prefixes if refname.startswith(p.rstrip("/") + "/")), None)
+        if not name or prefix is None:
             continue
-        names.append(name)
-    return names
-
-
-def list_prs() -> List[Dict]:
-    result = run(["gh", "pr", "list", "--json", "number,title,headRefName,state,createdAt"])
+        oid, _, rest = rest.partition("\t")
+        date, _, counts = rest.partition("\t")
+        ahead, behind = _parse_ahead_behind(counts)
+        tips[prefix][name] = RefTip(name=name, oid=oid, date=date, ahead=ahead, behind=behind)
+    return tips
+
+
+def _bits(mask: int) -> Iterable[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _add_counts(levels: List[int], mask: int, weight: int) -> None:
+    """Add ``weight`` to the counter of every bit in ``mask``.
+
+    ``levels`` holds the counters bit-sliced (``levels[k]`` has bit ``i`` set
+    when counter ``i`` has bit ``k`` set), so one addition costs a few
+    big-integer operations no matter how many counters ``mask`` touches.
+    """
+    for level in _bits(weight):
+        carry = mask
+        while carry:
+            if level >= len(levels):
+                levels.extend([0] * (level + 1 - len(levels)))
+            carry, levels[level] = levels[level] & carry, levels[level] ^ carry
+            level += 1
+
+
+def _unslice_counts(levels: List[int], size: int) -> List[int]:
+    counts = [0] * size
+    for level, mask in enumerate(levels):
+        for index in _bits(mask):
+            counts[index] += 1 << level
+    return counts
+
+
+def count_ahead_behind(base: str, oids: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    """Ahead/behind counts of each commit relative to commit ``base`` from one history walk.
+
+    ``rev-list --topo-order --parents`` lists every commit reachable from the
+    base or a tip but not from their common merge bases, children before
+    parents. Each tip owns one bit (the base owns the last) and masks are
+    pushed down to parents, so a commit's mask says which tips reach it.
+    Commits are then tallied by mask: a tip is ahead by the commits it reaches
+    that the base does not, and behind by the base commits it does not reach.
+    """
+    oids = sorted(set(oids))
+    if not oids or not base:
+        return {}
+    bases = run(["git", "merge-base", "--octopus", "--all", base, *oids]).stdout.split()
+    # Everything reachable from the merge bases is shared by all tips and the
+    # base, so it cancels out of every count; excluding it only bounds the walk.
+    walk = run(
+        ["git", "rev-list", "--topo-order", "--parents", "--stdin"],
+        input="\n".join([base, *oids, *(f"^{oid}" for oid in bases)]) + "\n",
+    )
+    if walk.returncode != 0:
+        return {}
+
+    base_bit = 1 << len(oids)
+    masks: Dict[str, int] = {oid: 1 << index for index, oid in enumerate(oids)}
+    masks[base] = masks.get(base, 0) | base_bit
+    tally: Counter = Counter()
+    for line in walk.stdout.splitlines():
+        commit, *parents = line.split()
+        mask = masks.pop(commit, 0)
+        tally[mask] += 1
+        for parent in parents:
+            masks[parent] = masks.get(parent, 0) | mask
+
+    ahead_levels: List[int] = []
+    shared_levels: List[int] = []
+    base_total = 0
+    for mask, count in tally.items():
+        if mask & base_bit:
+            base_total += count
+            _add_counts(shared_levels, mask ^ base_bit, count)
+        else:
+            _add_counts(ahead_levels, mask, count)
+    ahead = _unslice_counts(ahead_levels, len(oids))
+    shared = _unslice_counts(shared_levels, len(oids))
+    return {oid: (ahead[index], base_total - shared[index]) for index, oid in enumerate(oids)}
+
+
+def fill_ahead_behind(tips: Iterable[RefTip], base: str) -> None:
+    """Fill in counts git did not report, from a single ``count_ahead_behind`` walk."""
+    missing = [tip for tip in tips if tip.ahead is None or tip.behind is None]
+    if not missing:
+        return
+    counts = count_ahead_behind(base, (tip.oid for tip in missing))
+    for tip in missing:
+        if tip.oid in counts:
+            tip.ahead, tip.behind = counts[tip.oid]
+
+
+def resolve_commit(ref: str) -> str:
+    return run(["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"]).stdout.strip()
+
+
+def scan_branches(
+    base_ref: str,
+    remote: str,
+    pool: Optional[ThreadPoolExecutor] = None,
+    *,
+    ahead_behind: Optional[bool] = None,
+) -> Tuple[Dict[str, RefTip], Dict[str, RefTip]]:
+    """Return ``(remote_tips, local_tips)`` for branches not merged into ``base_ref``."""
+    if pool is None:
+        with ThreadPoolExecutor(max_workers=2) as own_pool:
+            return scan_branches(base_ref, remote, own_pool, ahead_behind=ahead_behind)
+    if ahead_behind is None:
+        ahead_behind = git_supports_ahead_behind()
+    base_future = None if ahead_behind else pool.submit(resolve_commit, base_ref)
+    remote_prefix = f"refs/remotes/{remote}"
+    tips = list_unmerged([remote_prefix, "refs/heads"], base_ref, remote, ahead_behind=ahead_behind)
+    if base_future is not None:
+        fill_ahead_behind([*tips[remote_prefix].values(), *tips["refs/heads"].values()], base_future.result())
+    return tips[remote_prefix], tips["refs/heads"]
+
+
+def fetch_prs() -> Optional[List[Dict]]:
+    """Return open PRs from ``gh``, or None when the call fails."""
+    result = run(["gh", "pr", "list", "--json", "number,title,headRefName,state,createdAt"], timeout=GH_TIMEOUT)
     if result.returncode != 0:
-        return []
+        if result.returncode == 124:
+            print(f"report_branches: gh pr list {result.stderr}", file=sys.stderr)
+        return None
     try:
         data = json.loads(result.stdout)
     except json.JSONDecodeError:
-        return []
-    return data
+        return None
+    return data if isinstance(data, list) else None
+
+
+def list_prs() -> List[Dict]:
+    return fetch_prs() or []
 
 
-def build_report() -> Tuple[List[BranchInfo], str]:
+def remote_key(remote: str) -> str:
+    """Cache key for ``remote``: its URL, falling back to the name."""
+    result = run(["git", "remote", "get-url", remote])
+    url = result.stdout.strip() if result.returncode == 0 else ""
+    return url or remote
+
+
+def pr_cache_path(repo: Path) -> Path:
+    return repo / ".parallelus" / "cache" / "pr-metadata.json"
+
+
+def load_pr_cache(path: Path) -> Dict[str, Dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != PR_CACHE_VERSION:
+        return {}
+    remotes = data.get("remotes")
+    return remotes if isinstance(remotes, dict) else {}
+
+
+def save_pr_cache_entry(path: Path, key: str, prs: List[Dict]) -> None:
+    """Store ``prs`` for ``key``; readers see the old file or the new one, never a partial write."""
+    remotes = load_pr_cache(path)
+    remotes[key] = {"fetched_at": time.time(), "prs": prs}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as fh:
+            fh.write(json.dumps({"version": PR_CACHE_VERSION, "remotes": remotes}) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _refresh_lock(cache_path: Path) -> Path:
+    return cache_path.with_name(cache_path.name + ".refresh")
+
+
+def spawn_pr_refresh(repo: Path, cache_path: Path) -> None:
+    """Start a detached ``--update-pr-cache`` run unless one is already in flight."""
+    lock = _refresh_lock(cache_path)
+    try:
+        if time.time() - lock.stat().st_mtime < GH_TIMEOUT + 30:
+            return
+        lock.unlink()
+    except FileNotFoundError:
+        pass
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "--update-pr-cache"],
+        cwd=repo,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def _exit_on_signal(signum, _frame) -> None:
+    raise SystemExit(128 + signum)
+
+
+def update_pr_cache(repo: Path, remote: str) -> int:
+    """Background refresh entry point: fetch PRs and store them for ``remote``.
+
+    The refresh outlives the report that started it. If it is terminated
+    first, it is cancelled cleanly: the temp file and the refresh lock are
+    removed and the existing cache is left untouched.
+    """
+    for name in ("SIGTERM", "SIGHUP", "SIGINT"):
+        signum = getattr(signal, name, None)
+        if signum is not None:
+            signal.signal(signum, _exit_on_signal)
+    cache_path = pr_cache_path(repo)
+    try:
+        prs = fetch_prs()
+        if prs is None:
+            return 1
+        save_pr_cache_entry(cache_path, remote_key(remote), prs)
+        return 0
+    finally:
+        _refresh_lock(cache_path).unlink(missing_ok=True)
+
+
+def _format_age(seconds: float) -> str:
+    seconds = max(0, int(seconds))
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+
+def build_report(*, refresh_prs: bool = False, pr_ttl: float = PR_CACHE_TTL) -> Tuple[List[BranchInfo], str, List[str]]:
     remote_name = os.environ.get("BASE_REMOTE", "origin")
-    base_ref, base_branch = resolve_base_ref(remote_name)
-    remote_branches = list_unmerged(f"refs/remotes/{remote_name}", base_ref, remote_name)
-    local_branches = list_unmerged("refs/heads", base_ref, remote_name)
+    try:
+        repo = repo_context().root
+    except (subprocess.CalledProcessError, OSError):
+        # Not a git checkout: nothing to report, as before.
+        return [], "main", []
+    cache_path = pr_cache_path(repo)
+    notes: List[str] = []
+
+    def load_prs() -> Tuple[str, Optional[Dict], bool, Optional[List[Dict]]]:
+        key = remote_key(remote_name)
+        cached = load_pr_cache(cache_path).get(key)
+        if not isinstance(cached, dict) or not isinstance(cached.get("prs"), list):
+            cached = None
+        fetch = refresh_prs or cached is None
+        return key, cached, fetch, fetch_prs() if fetch else None
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        prs_future = pool.submit(load_prs)
+        version_future = pool.submit(git_supports_ahead_behind)
+        # Resolved here rather than as a pool task: it waits on probes it submits to the pool.
+        base_ref, base_branch = resolve_base_ref(remote_name, pool)
+        remote_branches, local_branches = scan_branches(
+            base_ref, remote_name, pool, ahead_behind=version_future.result()
+        )
+        key, cached, fetch_attempted, fetched = prs_future.result()
+
+    if fetched is not None:
+        prs = fetched
+        save_pr_cache_entry(cache_path, key, prs)
+    elif cached is not None:
+        prs = cached["prs"]
+        age = time.time() - float(cached.get("fetched_at") or 0)
+        if fetch_attempted:
+            notes.append(f"PR data is stale: cached {_format_age(age)} ago; gh pr list failed.")
+        elif age > pr_ttl:
+            spawn_pr_refresh(repo, cache_path)
+            notes.append(f"PR data is stale: cached {_format_age(age)} ago; refreshing in the background.")
+    else:
+        prs = []
+        notes.append("PR data unavailable: gh pr list failed and nothing is cached.")
 
     branches_to_include = set(remote_branches) | set(local_branches)
     filtered = {
@@ -144,15 +486,18 @@ def build_report() -> Tuple[List[BranchInfo], str]:
         if name and name != base_branch and not name.startswith("archive/")
     }
 
-    prs = list_prs()
     branch_map: Dict[str, BranchInfo] = {}
 
     for name in sorted(filtered):
         info = branch_map.setdefault(name, BranchInfo(name=name))
-        if name in remote_branches:
-            info.remote = True
-        if name in local_branches:
-            info.local = True
+        remote_tip = remote_branches.get(name)
+        local_tip = local_branches.get(name)
+        info.remote = remote_tip is not None
+        info.local = local_tip is not None
+        # Counts follow the local branch when there is one; activity is the newer tip.
+        tip = local_tip or remote_tip
+        info.ahead, info.behind = tip.ahead, tip.behind
+        info.last_commit = max(t.date for t in (remote_tip, local_tip) if t is not None)
 
     for pr in prs:
         head = pr.get("headRefName") or ""
@@ -164,16 +509,17 @@ def build_report() -> Tuple[List[BranchInfo], str]:
         info.pr_state = pr.get("state")
         info.pr_created_at = pr.get("createdAt")
 
-    return sorted(branch_map.values(), key=lambda x: x.name), base_branch
+    return sorted(branch_map.values(), key=lambda x: x.name), base_branch, notes
 
 
-def format_report(branches: List[BranchInfo], base_branch: str) -> str:
+def format_report(branches: List[BranchInfo], base_branch: str, notes: List[str] = ()) -> str:
     lines = []
     if not branches:
         lines.append(f"No branches with unmerged commits relative to {base_branch}.")
+        lines.extend(notes)
         return "\n".join(lines)
 
-    header = f"{'Branch':40} {'Status':18} {'PR':45} {'Action'}"
+    header = f"{'Branch':40} {'Status':18} {'Ahead/Behind':13} {'Last commit':11} {'PR':45} {'Action'}"
     lines.append(header)
     lines.append("-" * len(header))
     for info in branches:
@@ -181,8 +527,10 @@ def format_report(branches: List[BranchInfo], base_branch: str) -> str:
         if info.pr_number:
             pr_part = f"#{info.pr_number} – {info.pr_title} ({info.pr_state}, {info.pr_created_at})"
         lines.append(
-            f"{info.name:40} {info.status:18} {pr_part:45} {info.action}"
+            f"{info.name:40} {info.status:18} {info.divergence:13} {info.last_commit or '-':11} {pr_part:45} {info.action}"
         )
+    for note in notes:
+        lines.append(note)
     lines.append("")
     lines.append("Tips:")
     lines.append(" - Request a quality review with `Senior review request: <branch-name>`")
@@ -191,8 +539,21 @@ def format_report(branches: List[BranchInfo], base_branch: str) -> str:
 
 
 def main() -> None:
-    report, base_branch = build_report()
-    print(format_report(report, base_branch))
+    parser = argparse.ArgumentParser(description="Print the branch/PR snapshot shown by make read_bootstrap.")
+    parser.add_argument("--refresh-prs", action="store_true", help="Fetch PR metadata now instead of using the cache")
+    parser.add_argument(
+        "--pr-ttl",
+        type=float,
+        default=PR_CACHE_TTL,
+        help=f"Seconds before cached PR metadata is refreshed in the background (default: {PR_CACHE_TTL:g})",
+    )
+    parser.add_argument("--update-pr-cache", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.update_pr_cache:
+        raise SystemExit(update_pr_cache(repo_context().root, os.environ.get("BASE_REMOTE", "origin")))
+    report, base_branch, notes = build_report(refresh_prs=args.refresh_prs, pr_ttl=args.pr_ttl)
+    print(format_report(report, base_branch, notes))
 
 
 if __name__ == "__main__":
@@ -5,29 +5,31 @@ from __future__ import annotations
 
 import json
 import re
-import subprocess
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timezone
 from pathlib import Path
 
 from parallelus_docs_paths import failures_write_dir, marker_read_path, reports_write_dir
+from parallelus_jsonl import iter_jsonl
+from parallelus_repo_context import repo_context
 
 
 def git_root() -> Path:
-    out = subprocess.check_output(["git", "rev-parse", "--show-toplevel"], text=True)
-    return Path(out.strip())
+    return repo_context().root
 
 
 def current_branch() -> str:
-    out = subprocess.check_output(["git", "rev-parse", "--abbrev-ref", "HEAD"], text=True)
-    branch = out.strip()
+    branch = repo_context().branch or ""
     if branch in {"", "HEAD"}:
         raise SystemExit("retro_audit_local: detached HEAD not supported")
     return branch
 
 
 def current_head() -> str:
-    out = subprocess.check_output(["git", "rev-parse", "HEAD"], text=True)
-    return out.strip()
+    head = repo_context().head
+    if not head:
+        raise SystemExit("retro_audit_local: HEAD does not point at a commit yet")
+    return head
 
 
 def _sanitize_issue_id(text: str, idx: int) -> str:
@@ -37,7 +39,31 @@ def _sanitize_issue_id(text: str, idx: int) -> str:
     return f"{cleaned}-{idx}"
 
 
-def _build_issues(failures: list[dict], warnings: list[str]) -> list[dict]:
+def iter_failures(failures_path: Path, failures_data: dict) -> Iterator[dict]:
+    """Yield failures from a summary header's JSONL file (or a legacy inline list)."""
+    stream_name = failures_data.get("failures_file")
+    if not stream_name:
+        yield from failures_data.get("failures") or []
+        return
+    stream_path = failures_path.with_name(str(stream_name))
+    expected = failures_data.get("cluster_count")
+    if not stream_path.exists():
+        if expected:
+            raise SystemExit(f"retro_audit_local: failures file {stream_path} not found; rerun collect_failures.py")
+        return
+    seen = 0
+    for item in iter_jsonl(stream_path):
+        if isinstance(item, dict):
+            seen += 1
+            yield item
+    if isinstance(expected, int) and seen != expected:
+        raise SystemExit(
+            f"retro_audit_local: {stream_path} has {seen} failure entries, summary expects {expected}; "
+            "rerun collect_failures.py"
+        )
+
+
+def _build_issues(failures: Iterable[dict], warnings: list[str]) -> list[dict]:
     issues: list[dict] = []
     for idx, item in enumerate(failures, start=1):
         kind = str(item.get("kind") or "failure")
@@ -48,13 +74,19 @@ def _build_issues(failures: list[dict], warnings: list[str]) -> list[dict]:
         details = command or excerpt or "no extra details"
         if len(details) > 240:
             details = details[:237] + "..."
+        evidence = f"source={source}; exit_code={exit_code}; details={details}"
+        # Clustered summaries carry how often the failure repeated.
+        count = item.get("count")
+        if isinstance(count, int) and count > 1:
+            sources = item.get("sources") or [source]
+            evidence += f"; occurrences={count} across {len(sources)} source(s)"
         issues.append(
             {
                 "id": _sanitize_issue_id(kind, idx),
                 "root_cause": f"Tool execution recorded a '{kind}' event while collecting retrospective evidence.",
                 "mitigation": "Inspect the failing command/log source and re-run the failing step on the current commit.",
                 "prevention": "Keep the retrospective preflight serialized and add/maintain regression coverage for recurring failures.",
-                "evidence": f"source={source}; exit_code={exit_code}; details={details}",
+                "evidence": evidence,
             }
         )
 
@@ -71,42 +103,11 @@ def _build_issues(failures: list[dict], warnings: list[str]) -> list[dict]:
     return issues
 
 
-def main() -> None:
-    repo = git_root()
-    branch = current_branch()
-    head = current_head()
+def write_report(
+    repo: Path, branch: str, marker_ts: str, failures: Iterable[dict], warnings: list[str]
+) -> tuple[Path, dict]:
+    """Write the marker-matched local audit report and return its path and contents."""
     slugged = branch.replace("/", "-")
-
-    marker_path = marker_read_path(repo, slugged)
-    if not marker_path.exists():
-        raise SystemExit(
-            "retro_audit_local: marker not found; run parallelus/engine/bin/retro-marker first"
-        )
-    marker = json.loads(marker_path.read_text(encoding="utf-8"))
-    marker_ts = marker.get("timestamp")
-    marker_head = marker.get("head")
-    if not marker_ts:
-        raise SystemExit(f"retro_audit_local: marker {marker_path} missing timestamp")
-    if marker_head and marker_head != head:
-        raise SystemExit(
-            "retro_audit_local: marker head mismatch "
-            f"(marker={marker_head}, current={head}); rerun parallelus/engine/bin/retro-marker"
-        )
-
-    marker_root = marker_path.parent.parent
-    failures_path = marker_root / "failures" / f"{slugged}--{marker_ts}.json"
-    if not failures_path.exists():
-        fallback = failures_write_dir(repo) / f"{slugged}--{marker_ts}.json"
-        failures_path = fallback if fallback.exists() else failures_path
-    if not failures_path.exists():
-        raise SystemExit(
-            "retro_audit_local: marker-matched failures summary not found; "
-            "run parallelus/engine/bin/collect_failures.py after parallelus/engine/bin/retro-marker"
-        )
-
-    failures_data = json.loads(failures_path.read_text(encoding="utf-8"))
-    failures = failures_data.get("failures") or []
-    warnings = failures_data.get("warnings") or []
     issues = _build_issues(failures, warnings)
 
     if issues:
@@ -145,6 +146,45 @@ def main() -> None:
         f"retro_audit_local: wrote {report_path.relative_to(repo)}",
         flush=True,
     )
+    return report_path, report
+
+
+def main() -> None:
+    repo = git_root()
+    branch = current_branch()
+    head = current_head()
+    slugged = branch.replace("/", "-")
+
+    marker_path = marker_read_path(repo, slugged)
+    if not marker_path.exists():
+        raise SystemExit(
+            "retro_audit_local: marker not found; run parallelus/engine/bin/retro-marker first"
+        )
+    marker = json.loads(marker_path.read_text(encoding="utf-8"))
+    marker_ts = marker.get("timestamp")
+    marker_head = marker.get("head")
+    if not marker_ts:
+        raise SystemExit(f"retro_audit_local: marker {marker_path} missing timestamp")
+    if marker_head and marker_head != head:
+        raise SystemExit(
+            "retro_audit_local: marker head mismatch "
+            f"(marker={marker_head}, current={head}); rerun parallelus/engine/bin/retro-marker"
+        )
+
+    marker_root = marker_path.parent.parent
+    failures_path = marker_root / "failures" / f"{slugged}--{marker_ts}.json"
+    if not failures_path.exists():
+        fallback = failures_write_dir(repo) / f"{slugged}--{marker_ts}.json"
+        failures_path = fallback if fallback.exists() else failures_path
+    if not failures_path.exists():
+        raise SystemExit(
+            "retro_audit_local: marker-matched failures summary not found; "
+            "run parallelus/engine/bin/collect_failures.py after parallelus/engine/bin/retro-marker"
+        )
+
+    failures_data = json.loads(failures_path.read_text(encoding="utf-8"))
+    warnings = failures_data.get("warnings") or []
+    write_report(repo, branch, marker_ts, iter_failures(failures_path, failures_data), warnings)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Run the retrospective preflight pipeline in one process.
+
+Equivalent to running ``retro-marker`` -> ``collect_failures.py`` ->
+``retro_audit_local.py`` -> ``verify-retrospective`` in order, and writes the
+same marker, failures summary and report. Each stage hands its result to the
+next in memory instead of re-reading the file it just wrote, the repository
+context is resolved once, and only one interpreter starts. Per-stage timings
+are printed at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.machinery
+import importlib.util
+import os
+import time
+from pathlib import Path
+from types import ModuleType
+
+import collect_failures
+import retro_audit_local
+from parallelus_repo_context import repo_context
+
+BIN_DIR = Path(__file__).resolve().parent
+
+
+def _load_script(name: str) -> ModuleType:
+    """Import an extension-less script from ``bin`` (e.g. ``retro-marker``) as a module."""
+    loader = importlib.machinery.SourceFileLoader(name.replace("-", "_"), str(BIN_DIR / name))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def run_pipeline(
+    *,
+    lookback_hours: float = collect_failures.DEFAULT_LOOKBACK_HOURS,
+    jobs: int = 0,
+    use_ledger: bool = True,
+) -> list[tuple[str, float]]:
+    """Run every stage and return ``(stage, seconds)`` timings in order."""
+    timings: list[tuple[str, float]] = []
+    start = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal start
+        now = time.perf_counter()
+        timings.append((stage, now - start))
+        start = now
+
+    retro_marker = _load_script("retro-marker")
+    verify_retrospective = _load_script("verify-retrospective")
+    repo = repo_context().root
+    branch = retro_marker.current_branch()
+    lap("setup")
+
+    _, marker = retro_marker.record_marker(repo, branch)
+    marker_ts = marker["timestamp"]
+    lap("marker")
+
+    ledger_path = collect_failures.default_ledger_path(repo) if use_ledger else None
+    _, summary, clusters = collect_failures.collect(
+        repo, branch, marker, lookback_hours=lookback_hours, jobs=jobs, ledger_path=ledger_path
+    )
+    lap("failures")
+
+    report_path, report = retro_audit_local.write_report(repo, branch, marker_ts, clusters, summary["warnings"])
+    lap("audit")
+
+    role_prompt = verify_retrospective.verification_role(repo)
+    if role_prompt is not None:
+        verify_retrospective.check_report(report, branch, marker_ts, role_prompt)
+        print(f"verify-retrospective: found report {report_path.relative_to(repo)}", flush=True)
+    lap("verify")
+    return timings
+
+
+def format_timings(timings: list[tuple[str, float]]) -> str:
+    parts = [f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in timings]
+    total = sum(seconds for _, seconds in timings)
+    return f"retro_preflight: timings {' '.join(parts)} total={total * 1000:.1f}ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--lookback-hours",
+        type=float,
+        default=float(os.environ.get("PARALLELUS_FAILURES_LOOKBACK_HOURS") or collect_failures.DEFAULT_LOOKBACK_HOURS),
+        help="Passed to collect_failures (0 scans everything)",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="collect_failures worker processes (default: CPU count)")
+    parser.add_argument("--no-ledger", action="store_true", help="Rescan every failure source from the start")
+    args = parser.parse_args()
+
+    timings = run_pipeline(lookback_hours=args.lookback_hours, jobs=args.jobs, use_ledger=not args.no_ledger)
+    print(format_timings(timings), flush=True)
+
+
+if __name__ == "__main__":
+    main()
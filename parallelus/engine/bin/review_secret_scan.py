@@ -1,23 +1,8 @@
 #!/usr/bin/env python3
-import re
 import sys
 from pathlib import Path
 
-
-PATTERNS = [
-    (re.compile(r"-----BEGIN [A-Z ]+PRIVATE KEY-----[\s\S]+?-----END [A-Z ]+PRIVATE KEY-----"), "private key block"),
-    (re.compile(r"\bAKIA[0-9A-Z]{16}\b"), "aws access key id"),
-    (re.compile(r"\bASIA[0-9A-Z]{16}\b"), "aws session key id"),
-    (re.compile(r"\bgh[pousr]_[A-Za-z0-9]{36,}\b"), "github token"),
-    (re.compile(r"\bxox[baprs]-[A-Za-z0-9-]+\b"), "slack token"),
-    (re.compile(r"\bsk-[A-Za-z0-9]{20,}\b"), "api key"),
-    (re.compile(r"(?i)(bearer\s+)[A-Za-z0-9\-._~+/]+=*"), "bearer token"),
-    (re.compile(r"(?i)\b(token|api[-_]?key|secret|password|passwd|pwd)\b\s*[:=]\s*[^\\s'\\\"]+"), "credential assignment"),
-]
-
-
-def redact_snippet(text: str, pattern: re.Pattern) -> str:
-    return pattern.sub("[REDACTED]", text)
+from parallelus_redaction import iter_secret_matches, redact_text
 
 
 def scan_file(path: Path) -> list:
@@ -26,13 +11,11 @@ def scan_file(path: Path) -> list:
         content = path.read_text(encoding="utf-8", errors="ignore")
     except FileNotFoundError:
         return findings
-    for pattern, label in PATTERNS:
-        for match in pattern.finditer(content):
-            start = max(match.start() - 40, 0)
-            end = min(match.end() + 40, len(content))
-            snippet = content[start:end].replace("\n", "\\n")
-            snippet = redact_snippet(snippet, pattern)
-            findings.append((label, snippet))
+    for label, match in iter_secret_matches(content):
+        start = max(match.start() - 40, 0)
+        end = min(match.end() + 40, len(content))
+        snippet = content[start:end].replace("\n", "\\n")
+        findings.append((label, redact_text(snippet)))
     return findings
 
 
@@ -5,7 +5,7 @@ ROOT=$(
   cd "$(dirname "${BASH_SOURCE[0]}")/../../.." >/dev/null 2>&1
   pwd -P
 )
-REGISTRY=${SUBAGENT_REGISTRY_FILE:-"$ROOT/parallelus/manuals/subagent-registry.json"}
+REGISTRY_TOOL="$ROOT/parallelus/engine/bin/subagent_registry.py"
 TMUX_BIN="$ROOT/parallelus/engine/bin/tmux-safe"
 
 usage() {
@@ -58,12 +58,11 @@ if [[ -z "$PROMPT" && -z "$PROMPT_FILE" ]]; then
   exit 1
 fi
 
-info=$(python3 - "$REGISTRY" "$ID" <<'PY'
+rows=$(python3 "$REGISTRY_TOOL" list --id "$ID")
+info=$(python3 - "$rows" "$ID" <<'PY'
 import json, sys
-registry_path, entry_id = sys.argv[1:3]
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
-for row in data:
+rows, entry_id = sys.argv[1:3]
+for row in json.loads(rows):
     if row.get("id") == entry_id:
         path = row.get("path") or ""
         handle = row.get("launcher_handle") or {}
@@ -2,6 +2,8 @@
 set -euo pipefail
 
 ROOT="$(git rev-parse --show-toplevel 2>/dev/null || pwd)"
+# shellcheck source=./agents-paths.sh
+. "$ROOT/parallelus/engine/bin/agents-paths.sh"
 # shellcheck source=./agents-doc-paths.sh
 . "$ROOT/parallelus/engine/bin/agents-doc-paths.sh"
 
@@ -21,6 +23,13 @@ if [[ -z "${TMUX:-}" && -n "${PARALLELUS_TMUX_SOCKET:-}" && -n "$TMUX_BIN" ]]; t
 fi
 
 REGISTRY_FILE=${SUBAGENT_REGISTRY_FILE:-parallelus/manuals/subagent-registry.json}
+if [[ -n "${SUBAGENT_REGISTRY_FILE:-}" ]]; then
+  # A custom registry gets its own store next to it.
+  REGISTRY_DB=${SUBAGENT_REGISTRY_DB:-${REGISTRY_FILE%.json}.sqlite}
+else
+  REGISTRY_DB=${SUBAGENT_REGISTRY_DB:-$ROOT/.parallelus/cache/subagent-registry.sqlite}
+fi
+REGISTRY_TOOL="$ROOT/parallelus/engine/bin/subagent_registry.py"
 SCOPE_TEMPLATE="parallelus/manuals/templates/subagent_scope_template.md"
 SANDBOX_ROOT="$ROOT/.parallelus/subagents/sandboxes"
 WORKTREE_ROOT="$ROOT/.parallelus/subagents/worktrees"
@@ -28,6 +37,7 @@ LAUNCH_HELPER="${SUBAGENT_LAUNCH_HELPER:-$ROOT/parallelus/engine/bin/launch_suba
 DEPLOY_HELPER="$ROOT/parallelus/engine/bin/deploy_agents_process.sh"
 VERIFY_HELPER="$ROOT/parallelus/engine/bin/verify_process_run.py"
 RETRO_LOCAL_AUDITOR="$ROOT/parallelus/engine/bin/retro_audit_local.py"
+RETRO_PREFLIGHT="$ROOT/parallelus/engine/bin/retro_preflight.py"
 SESSION_HELPER="$ROOT/parallelus/engine/bin/get_current_session_id.sh"
 RESUME_HELPER="$ROOT/parallelus/engine/bin/resume_in_tmux.sh"
 EXEC_RESUME_HELPER="$ROOT/parallelus/engine/bin/subagent_exec_resume.sh"
@@ -47,7 +57,7 @@ Commands:
            Run review-preflight and, when launch falls back to
            awaiting_manual_launch, execute the generated sandbox runner,
            then harvest+cleanup automatically
-  status   List registry entries (optionally filter by --id)
+  status   List registry entries (optionally filter by --id, --slug, --status)
   resume   Resume an exec-mode subagent session (follow-up prompt)
   verify   Validate a completed subagent sandbox/worktree
   abort    Abort a running subagent without deleting its sandbox/worktree
@@ -56,11 +66,17 @@ Commands:
 USAGE
 }
 
-ensure_registry() {
-  if [[ ! -f "$REGISTRY_FILE" ]]; then
-    mkdir -p "$(dirname "$REGISTRY_FILE")"
-    printf '[]\n' >"$REGISTRY_FILE"
-  fi
+# The registry lives in SQLite (see subagent_registry.py); REGISTRY_FILE is its
+# JSON export, written only by `registry_cli export`.
+registry_cli() {
+  python3 "$REGISTRY_TOOL" --registry "$REGISTRY_FILE" --db "$REGISTRY_DB" "$@"
+}
+
+# Run python3 with subagent_registry importable; open_registry() picks up the
+# same files as registry_cli.
+registry_python() {
+  SUBAGENT_REGISTRY_FILE="$REGISTRY_FILE" SUBAGENT_REGISTRY_DB="$REGISTRY_DB" \
+    PYTHONPATH="$ROOT/parallelus/engine/bin${PYTHONPATH:+:$PYTHONPATH}" python3 "$@"
 }
 
 build_lang_flags() {
@@ -274,31 +290,21 @@ PY
 ensure_slug_clean() {
   local slug=$1
   local auto_clean_stale=${2:-0}
-  ensure_registry
-  if [[ ! -f "$REGISTRY_FILE" ]]; then
-    return
-  fi
 
   if [[ "$auto_clean_stale" == "1" ]]; then
     local stale_entries entry_id entry_status entry_path cleaned_count
     cleaned_count=0
-    stale_entries=$(python3 - "$REGISTRY_FILE" "$slug" <<'PY'
-import json
+    stale_entries=$(registry_python - "$slug" <<'PY'
 import sys
 
-registry_path, slug = sys.argv[1:3]
-try:
-    with open(registry_path, "r", encoding="utf-8") as fh:
-        entries = json.load(fh)
-except FileNotFoundError:
-    sys.exit(0)
+from subagent_registry import open_registry
+
+slug = sys.argv[1]
+with open_registry() as registry:
+    entries = registry.find(slug=slug, status="awaiting_manual_launch")
 
 for row in entries:
-    if row.get("slug") != slug:
-        continue
     status = (row.get("status") or "").lower()
-    if status != "awaiting_manual_launch":
-        continue
     entry_id = row.get("id", "")
     path = row.get("path", "")
     print(f"{entry_id}\t{status}\t{path}")
@@ -319,21 +325,20 @@ PY
     fi
   fi
 
-  python3 - "$REGISTRY_FILE" "$slug" <<'PY'
-import json, sys
-registry_path, slug = sys.argv[1:3]
-try:
-    with open(registry_path, "r", encoding="utf-8") as fh:
-        entries = json.load(fh)
-except FileNotFoundError:
-    sys.exit(0)
+  registry_python - "$slug" <<'PY'
+import sys
+
+from subagent_registry import open_registry
+
+slug = sys.argv[1]
+with open_registry() as registry:
+    entries = registry.find(slug=slug)
 
 blocked = []
 for row in entries:
-    if row.get("slug") == slug:
-        status = (row.get("status") or "").lower()
-        if status != "cleaned":
-            blocked.append((row.get("id"), status or "unknown"))
+    status = (row.get("status") or "").lower()
+    if status != "cleaned":
+        blocked.append((row.get("id"), status or "unknown"))
 
 if blocked:
     print(
@@ -474,56 +479,31 @@ PY
 
 append_registry() {
   local entry_json=$1
-  python3 - "$REGISTRY_FILE" "$entry_json" <<'PY'
-import json, sys
-registry_path, entry_json = sys.argv[1:3]
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
-data.append(json.loads(entry_json))
-with open(registry_path, "w", encoding="utf-8") as fh:
-    json.dump(data, fh, indent=2)
-PY
+  registry_cli append "$entry_json"
 }
 
+# update_registry ID KEY=VALUE [KEY=VALUE ...] sets string fields on one entry.
 update_registry() {
   local entry_id=$1
-  local update_snippet=$2
-  python3 - "$REGISTRY_FILE" "$entry_id" "$update_snippet" <<'PY'
-import json, sys
-registry_path, entry_id, update_snippet = sys.argv[1:4]
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
-for row in data:
-    if row.get("id") == entry_id:
-        exec(update_snippet, {}, {"row": row})
-        break
-else:
-    sys.exit(f"subagent_manager: unknown id {entry_id}")
-with open(registry_path, "w", encoding="utf-8") as fh:
-    json.dump(data, fh, indent=2)
-PY
+  shift
+  local assignment
+  local set_args=()
+  for assignment in "$@"; do
+    set_args+=(--set "$assignment")
+  done
+  registry_cli update "$entry_id" "${set_args[@]}"
 }
 
 get_registry_entry() {
   local entry_id=$1
-  python3 - "$REGISTRY_FILE" "$entry_id" <<'PY'
-import json, sys
-registry_path, entry_id = sys.argv[1:3]
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
-for row in data:
-    if row.get("id") == entry_id:
-        import json as _json
-        print(_json.dumps(row))
-        break
-else:
-    sys.exit(f"subagent_manager: unknown id {entry_id}")
-PY
+  registry_cli get "$entry_id"
 }
 
 print_status() {
   local filter_id=${1:-}
-python3 - "$REGISTRY_FILE" "$filter_id" <<'PY'
+  local filter_slug=${2:-}
+  local filter_status=${3:-}
+registry_python - "$filter_id" "$filter_slug" "$filter_status" <<'PY'
 import glob
 import hashlib
 import json
@@ -533,11 +513,11 @@ import time
 from collections import deque
 from datetime import datetime, timezone
 
-registry_path, filter_id = sys.argv[1:3]
-with open(registry_path, "r", encoding="utf-8") as fh:
-    entries = json.load(fh)
-if filter_id:
-    entries = [row for row in entries if row.get("id") == filter_id]
+from subagent_registry import open_registry
+
+filter_id, filter_slug, filter_status = sys.argv[1:4]
+registry = open_registry()
+entries = registry.find(entry_id=filter_id or None, slug=filter_slug or None, status=filter_status or None)
 if not entries:
     print("No matching subagents.")
     sys.exit(0)
@@ -581,7 +561,7 @@ slug_values = [row.get("slug", "-") or "-" for row in entries]
 type_values = [row.get("type", "-") or "-" for row in entries]
 status_values = [row.get("status", "-") or "-" for row in entries]
 deliverable_values = []
-registry_modified = False
+modified_ids = set()
 for row in entries:
     deliverables = row.get("deliverables") or []
     sandbox_path = row.get("path") or ""
@@ -608,7 +588,7 @@ for row in entries:
                     if status != "ready" or item.get("ready_files") != ready:
                         item["status"] = "ready"
                         item["ready_files"] = ready
-                        registry_modified = True
+                        modified_ids.add(row.get("id"))
     statuses = [(item.get("status") or "pending").lower() for item in deliverables]
     desired_meta = ""
     if deliverables:
@@ -626,14 +606,14 @@ for row in entries:
     if desired_meta:
         if desired_meta != meta_lower:
             row["deliverables_status"] = desired_meta
-            registry_modified = True
+            modified_ids.add(row.get("id"))
             current_meta = desired_meta
         else:
             current_meta = current_meta or desired_meta
     else:
         if current_meta:
             row["deliverables_status"] = ""
-            registry_modified = True
+            modified_ids.add(row.get("id"))
             current_meta = ""
     if current_meta:
         label = current_meta
@@ -821,9 +801,16 @@ for row in entries:
         log_summary,
     ))
 
-if registry_modified:
-    with open(registry_path, "w", encoding="utf-8") as fh:
-        json.dump(entries, fh, indent=2)
+# Write back only the deliverable fields recomputed above, so concurrent
+# changes to other fields of the same entries are kept.
+updates = []
+for row in entries:
+    if row.get("id") in modified_ids:
+        fields = {key: row[key] for key in ("deliverables", "deliverables_status") if key in row}
+        updates.append((row.get("id"), lambda current, fields=fields: current.update(fields)))
+if updates:
+    registry.update_many(updates)
+registry.close()
 PY
 }
 
@@ -1055,7 +1042,7 @@ PY
 2. Pin context before auditing: ensure branch is '${parent_branch}' and HEAD is '${expected_commit}'. If either differs, run 'git checkout --quiet ${parent_branch}' and 'git reset --quiet --hard ${expected_commit}'.
 3. Review docs/parallelus/self-improvement/markers/${branch_slug}.json (or migrated fallback marker path) to capture the marker timestamp and referenced plan/progress files for ${parent_branch}.
 4. Gather evidence without modifying tracked files: inspect git status, git diff, notebooks, and recent command output that reflect the current state of ${parent_branch}.
-5. Review the failures summary at docs/parallelus/self-improvement/failures/<branch>--<marker>.json when present and include mitigations for each failed tool call.
+5. Review the failures summary at docs/parallelus/self-improvement/failures/<branch>--<marker>.json when present (failure clusters are listed one per line in the .failures.jsonl file it names) and include mitigations for each failed tool call.
 6. Emit a JSON object matching the auditor schema (branch, marker_timestamp, summary, issues[], follow_ups[]). Reference concrete evidence for every issue; if no issues exist, return an empty issues array.
 7. Stay read-only—do not run make bootstrap or alter tracked files. If command output is noisy or stalls, prioritize marker + failures + notebook evidence and finish promptly.
 EOF
@@ -1238,22 +1225,24 @@ run_launch() {
   fi
   launch_json=$("$LAUNCH_HELPER" --launcher "$launcher" --path "$sandbox" --prompt "$prompt" --log "$log_path" --type "$type" --title "$entry_id" 2>/dev/null) || true
   if [[ -n "$launch_json" ]]; then
-    python3 - "$REGISTRY_FILE" "$entry_id" "$launch_json" <<'PY'
+    registry_python - "$entry_id" "$launch_json" <<'PY'
 import json, sys
-registry_path, entry_id, payload_json = sys.argv[1:4]
+
+from subagent_registry import open_registry
+
+entry_id, payload_json = sys.argv[1:3]
 payload = json.loads(payload_json)
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
-for row in data:
-    if row.get("id") == entry_id:
-        row["launcher_kind"] = payload.get("launcher", "")
-        row["window_title"] = payload.get("title", "")
-        row["launcher_handle"] = payload
-        break
-else:
-    sys.exit(f"subagent_manager: unknown id {entry_id}")
-with open(registry_path, "w", encoding="utf-8") as fh:
-    json.dump(data, fh, indent=2)
+
+
+def record_launch(row):
+    row["launcher_kind"] = payload.get("launcher", "")
+    row["window_title"] = payload.get("title", "")
+    row["launcher_handle"] = payload
+
+
+with open_registry() as registry:
+    if registry.update(entry_id, record_launch) is None:
+        sys.exit(f"subagent_manager: unknown id {entry_id}")
 PY
     return 0
   fi
@@ -1280,7 +1269,8 @@ cmd_review_preflight() {
         cat <<'USAGE'
 Usage: subagent_manager.sh review-preflight [--launcher MODE] [--auditor-mode local] [--no-launch] [--auto-clean-stale]
 
-Runs a serialized retrospective preflight:
+Runs a serialized retrospective preflight in one process
+(parallelus/engine/bin/retro_preflight.py), equivalent to:
   1) parallelus/engine/bin/retro-marker
   2) parallelus/engine/bin/collect_failures.py
   3) parallelus/engine/bin/retro_audit_local.py
@@ -1310,24 +1300,26 @@ USAGE
     echo "subagent_manager review-preflight: missing local auditor helper $RETRO_LOCAL_AUDITOR" >&2
     return 1
   fi
+  if [[ ! -x "$RETRO_PREFLIGHT" ]]; then
+    echo "subagent_manager review-preflight: missing preflight pipeline helper $RETRO_PREFLIGHT" >&2
+    return 1
+  fi
 
   ensure_not_main
-  local branch head
-  branch=$(git rev-parse --abbrev-ref HEAD)
-  head=$(git rev-parse HEAD)
+  local branch head repo_context
+  # One git call for the whole pipeline; each step reuses it via PARALLELUS_REPO_CONTEXT.
+  repo_context="$(parallelus_repo_context_snapshot || true)"
+  if [[ -n "$repo_context" ]]; then
+    { IFS= read -r _; IFS= read -r head; IFS= read -r branch; } <<<"$repo_context"
+  else
+    branch=$(git rev-parse --abbrev-ref HEAD)
+    head=$(git rev-parse HEAD)
+  fi
 
   if retro_required; then
-    echo "review-preflight: recording marker for $branch@$head" >&2
-    "$ROOT/parallelus/engine/bin/retro-marker"
-
-    echo "review-preflight: collecting failures (must run after marker; do not parallelize)" >&2
-    "$ROOT/parallelus/engine/bin/collect_failures.py"
-
-    echo "review-preflight: generating marker-matched retrospective report (local commit-aware mode)" >&2
-    "$RETRO_LOCAL_AUDITOR"
-
-    echo "review-preflight: verifying retrospective linkage" >&2
-    "$ROOT/parallelus/engine/bin/verify-retrospective"
+    echo "review-preflight: recording marker for $branch@$head, then collecting failures, writing the" \
+      "local commit-aware report and verifying linkage (serialized, one process)" >&2
+    PARALLELUS_REPO_CONTEXT="$repo_context" "$RETRO_PREFLIGHT"
   else
     echo "review-preflight: AGENTS_REQUIRE_RETRO=0; skipping retrospective preflight pipeline." >&2
     if (( skip_launch == 0 )); then
@@ -1366,21 +1358,18 @@ cmd_review_preflight_run() {
   fi
 
   local entry_meta
-  entry_meta=$(python3 - "$REGISTRY_FILE" "$entry_id" <<'PY'
-import json
+  entry_meta=$(registry_python - "$entry_id" <<'PY'
 import sys
 
-registry_path, entry_id = sys.argv[1:3]
-with open(registry_path, "r", encoding="utf-8") as fh:
-    rows = json.load(fh)
+from subagent_registry import open_registry
 
-for row in rows:
-    if row.get("id") == entry_id:
-        print(row.get("status", ""))
-        print(row.get("path", ""))
-        break
-else:
+entry_id = sys.argv[1]
+with open_registry() as registry:
+    row = registry.get(entry_id)
+if row is None:
     raise SystemExit(f"review-preflight-run: unknown registry id {entry_id}")
+print(row.get("status", ""))
+print(row.get("path", ""))
 PY
   ) || return 1
 
@@ -1453,7 +1442,6 @@ USAGE
   fi
 
   ensure_not_main
-  ensure_registry
   ensure_slug_clean "$slug" "${SUBAGENT_AUTOCLEAN_STALE:-0}"
   ensure_tmux_ready "$launcher"
   ensure_no_tmux_pane_for_slug "$slug"
@@ -1805,9 +1793,9 @@ PY
   fi
 
   if run_launch "$launcher" "$sandbox" "$prompt_path" "$type" "$log_path" "$entry_id"; then
-    update_registry "$entry_id" "row['status'] = 'running'"
+    update_registry "$entry_id" status=running
   else
-    update_registry "$entry_id" "row['status'] = 'awaiting_manual_launch'"
+    update_registry "$entry_id" status=awaiting_manual_launch
     echo "Subagent not auto-launched; status set to awaiting_manual_launch." >&2
   fi
 
@@ -1825,19 +1813,22 @@ PY
 }
 
 cmd_status() {
-  local filter_id=""
+  local filter_id="" filter_slug="" filter_status=""
   while [[ $# -gt 0 ]]; do
     case $1 in
       --id)
         filter_id=$2; shift 2 ;;
+      --slug)
+        filter_slug=$2; shift 2 ;;
+      --status)
+        filter_status=$2; shift 2 ;;
       --help)
-        echo "Usage: subagent_manager.sh status [--id ID]"; return 0 ;;
+        echo "Usage: subagent_manager.sh status [--id ID] [--slug SLUG] [--status STATUS]"; return 0 ;;
       *)
         echo "Unknown option $1" >&2; return 1 ;;
     esac
   done
-  ensure_registry
-  print_status "$filter_id"
+  print_status "$filter_id" "$filter_slug" "$filter_status"
 }
 
 cmd_verify() {
@@ -1856,7 +1847,6 @@ cmd_verify() {
     echo "subagent_manager verify: --id required" >&2
     return 1
   fi
-  ensure_registry
   local entry_json path type
   entry_json=$(get_registry_entry "$entry_id")
   path=$(python3 -c "import json,sys; print(json.loads(sys.argv[1])['path'])" "$entry_json")
@@ -1864,13 +1854,13 @@ cmd_verify() {
 
   if [[ "$type" == "throwaway" ]]; then
     "$VERIFY_HELPER" --repo "$path"
-    update_registry "$entry_id" "row['status'] = 'verified'"
+    update_registry "$entry_id" status=verified
   else
     if [[ -n $(git -C "$path" status --short) ]]; then
       echo "subagent_manager: worktree $path is not clean" >&2
       exit 1
     fi
-    update_registry "$entry_id" "row['status'] = 'ready_for_merge'"
+    update_registry "$entry_id" status=ready_for_merge
   fi
   echo "Verified $entry_id ($type)"
 }
@@ -1954,7 +1944,6 @@ USAGE
     return 1
   fi
 
-  ensure_registry
   local entry_json
   entry_json=$(get_registry_entry "$entry_id") || return 1
 
@@ -2159,25 +2148,26 @@ PY
   ) || return 1
 
   local copied_targets
-  copied_targets=$(python3 - <<'PY' "$REGISTRY_FILE" "$entry_id" "$harvest_payload"
+  copied_targets=$(registry_python - <<'PY' "$entry_id" "$harvest_payload"
 import json
 import sys
 
-registry_path, entry_id, payload_json = sys.argv[1:4]
+from subagent_registry import open_registry
+
+entry_id, payload_json = sys.argv[1:3]
 payload = json.loads(payload_json)
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
-for row in data:
-    if row.get("id") == entry_id:
-        row["deliverables"] = payload.get("deliverables", [])
-        status = payload.get("deliverables_status")
-        if status:
-            row["deliverables_status"] = status
-        break
-else:
-    raise SystemExit(f"subagent_manager harvest: unknown id {entry_id}")
-with open(registry_path, "w", encoding="utf-8") as fh:
-    json.dump(data, fh, indent=2)
+
+
+def record_harvest(row):
+    row["deliverables"] = payload.get("deliverables", [])
+    status = payload.get("deliverables_status")
+    if status:
+        row["deliverables_status"] = status
+
+
+with open_registry() as registry:
+    if registry.update(entry_id, record_harvest) is None:
+        raise SystemExit(f"subagent_manager harvest: unknown id {entry_id}")
 
 copied = payload.get("copied", [])
 print("\n".join(copied))
@@ -2244,7 +2234,6 @@ cmd_abort() {
     echo "subagent_manager abort: --id required" >&2
     return 1
   fi
-  ensure_registry
   local entry_json status launcher_kind launcher_window launcher_pane status_value
   entry_json=$(get_registry_entry "$entry_id")
   status=$(python3 -c "import json,sys; print(json.loads(sys.argv[1]).get('status',''))" "$entry_json")
@@ -2258,24 +2247,24 @@ cmd_abort() {
   fi
 
   close_launcher_handle "$launcher_kind" "$launcher_window" "$launcher_pane" "$entry_id"
-  python3 - "$REGISTRY_FILE" "$entry_id" "$status_value" "$reason" <<'PY'
-import json
+  registry_python - "$entry_id" "$status_value" "$reason" <<'PY'
 import sys
 import time
 
-registry_path, entry_id, status_value, reason = sys.argv[1:5]
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
-for row in data:
-    if row.get("id") == entry_id:
-        row["status"] = status_value
-        row["aborted_reason"] = reason
-        row["aborted_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-        break
-else:
-    raise SystemExit(f"subagent_manager abort: unknown id {entry_id}")
-with open(registry_path, "w", encoding="utf-8") as fh:
-    json.dump(data, fh, indent=2)
+from subagent_registry import open_registry
+
+entry_id, status_value, reason = sys.argv[1:4]
+
+
+def record_abort(row):
+    row["status"] = status_value
+    row["aborted_reason"] = reason
+    row["aborted_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+with open_registry() as registry:
+    if registry.update(entry_id, record_abort) is None:
+        raise SystemExit(f"subagent_manager abort: unknown id {entry_id}")
 PY
   echo "Aborted $entry_id (reason=$reason)"
 }
@@ -2299,7 +2288,6 @@ cmd_cleanup() {
     echo "subagent_manager cleanup: --id required" >&2
     return 1
   fi
-  ensure_registry
   local entry_json path type slug status launcher_kind launcher_window launcher_pane
   entry_json=$(get_registry_entry "$entry_id")
   path=$(python3 -c "import json,sys; print(json.loads(sys.argv[1])['path'])" "$entry_json")
@@ -2357,7 +2345,7 @@ PY
       git branch -D "$slug" >/dev/null 2>&1 || true
     fi
   fi
-  update_registry "$entry_id" "row['status'] = 'cleaned'"
+  update_registry "$entry_id" status=cleaned
   close_launcher_handle "$launcher_kind" "$launcher_window" "$launcher_pane" "$entry_id"
   echo "Cleaned $entry_id ($type)"
 }
@@ -70,7 +70,6 @@ def worktree_indicator() -> str:
 
 if __name__ == "__main__":
     import argparse
-    import json
     import time
 
     parser = argparse.ArgumentParser()
@@ -84,29 +83,29 @@ if __name__ == "__main__":
     if args.branch:
         print(branch)
     elif args.heartbeat:
-        registry = Path("parallelus/manuals/subagent-registry.json")
+        from subagent_registry import open_registry
+
         value = "-"
-        if registry.exists():
-            try:
-                data = json.loads(registry.read_text())
-                running = [row for row in data if row.get("status") == "running"]
-                if running:
-                    ages = []
-                    now = time.time()
-                    for row in running:
-                        log = row.get("log_path")
-                        if log and os.path.exists(log):
-                            mtime = os.path.getmtime(log)
-                            delta = max(int(now - mtime), 0)
-                            ages.append(delta)
-                    if ages:
-                        worst = max(ages)
-                        minutes, seconds = divmod(worst, 60)
-                        value = f"{minutes:02d}:{seconds:02d}"
-                else:
-                    value = "ready"
-            except Exception:
-                value = "err"
+        try:
+            with open_registry() as registry:
+                running = registry.find(status="running")
+            if running:
+                ages = []
+                now = time.time()
+                for row in running:
+                    log = row.get("log_path")
+                    if log and os.path.exists(log):
+                        mtime = os.path.getmtime(log)
+                        delta = max(int(now - mtime), 0)
+                        ages.append(delta)
+                if ages:
+                    worst = max(ages)
+                    minutes, seconds = divmod(worst, 60)
+                    value = f"{minutes:02d}:{seconds:02d}"
+            else:
+                value = "ready"
+        except (Exception, SystemExit):
+            value = "err"
         print(value)
     elif args.git_status:
         try:
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""SQLite-backed subagent registry with an on-demand JSON export.
+
+``subagent_manager.sh`` records every subagent in a registry. The rows live in
+``.parallelus/cache/subagent-registry.sqlite``, or next to a custom
+``SUBAGENT_REGISTRY_FILE`` (WAL mode, indexed by id, slug and status). Each
+write runs in one ``BEGIN IMMEDIATE`` transaction, so concurrent launches from
+several panes serialise instead of overwriting each other. The store is the
+only source of truth: the monitor loop, ``subagent_tail.sh`` and the other
+helpers read it through ``list``/``get`` or ``Registry.find``.
+
+The JSON file (``parallelus/manuals/subagent-registry.json`` by default) is
+only written by ``export``. A new, empty store imports an existing JSON file
+once, so registries recorded before the store existed carry over; later
+edits to the file are not read back. Both default paths are relative to the
+repository root, not the working directory.
+
+Usage:
+    subagent_registry.py [--registry FILE] [--db FILE] get ID
+    subagent_registry.py [--registry FILE] [--db FILE] list [--id ID] [--slug SLUG] [--status STATUS]
+    subagent_registry.py [--registry FILE] [--db FILE] append ENTRY_JSON
+    subagent_registry.py [--registry FILE] [--db FILE] update ID --set KEY=VALUE [--set KEY=VALUE ...]
+    subagent_registry.py [--registry FILE] [--db FILE] export [--output FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+DEFAULT_REGISTRY = Path("parallelus/manuals/subagent-registry.json")
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE entries (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX entries_id ON entries (id);
+CREATE INDEX entries_slug ON entries (slug, status);
+CREATE INDEX entries_status ON entries (status);
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+BUSY_TIMEOUT_SECONDS = 30
+
+
+def repo_root() -> Path:
+    """Top level of the enclosing git repository, else the working directory (as ``subagent_manager.sh``)."""
+    result = subprocess.run(["git", "rev-parse", "--show-toplevel"], capture_output=True, text=True, check=False)
+    top = result.stdout.strip()
+    return Path(top) if result.returncode == 0 and top else Path.cwd()
+
+
+def default_registry_path(root: Optional[Path] = None) -> Path:
+    return (root or repo_root()) / DEFAULT_REGISTRY
+
+
+def default_db_path(root: Optional[Path] = None) -> Path:
+    return (root or repo_root()) / ".parallelus" / "cache" / "subagent-registry.sqlite"
+
+
+def _columns(row: dict) -> tuple:
+    return (
+        str(row.get("id") or ""),
+        str(row.get("slug") or ""),
+        str(row.get("status") or "").lower(),
+        json.dumps(row),
+    )
+
+
+class Registry:
+    """Subagent registry rows stored in SQLite; ``json_path`` is the export target."""
+
+    def __init__(self, json_path: Optional[Path] = None, db_path: Optional[Path] = None) -> None:
+        root = repo_root() if json_path is None or db_path is None else None
+        self.json_path = Path(json_path) if json_path else default_registry_path(root)
+        self.db_path = Path(db_path) if db_path else default_db_path(root)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            with self._immediate():
+                if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    for (name,) in self.conn.execute(
+                        "SELECT name FROM sqlite_master WHERE type = 'table'"
+                    ).fetchall():
+                        self.conn.execute(f"DROP TABLE {name}")
+                    for statement in SCHEMA.split(";"):
+                        if statement.strip():
+                            self.conn.execute(statement)
+                    self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        if not self._seeded():
+            with self._immediate():
+                if not self._seeded():
+                    if self.conn.execute("SELECT 1 FROM entries LIMIT 1").fetchone() is None:
+                        self._import_json()
+                    self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('seeded', '1')")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "Registry":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @contextmanager
+    def _immediate(self) -> Iterator[None]:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _seeded(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM meta WHERE key = 'seeded'").fetchone() is not None
+
+    def _import_json(self) -> None:
+        """Load the rows of an existing JSON export into the empty store (caller holds the write lock)."""
+        try:
+            data = json.loads(self.json_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except ValueError as exc:
+            raise SystemExit(f"subagent_registry: cannot parse {self.json_path}: {exc}")
+        if not isinstance(data, list):
+            raise SystemExit(f"subagent_registry: {self.json_path} must contain a JSON array")
+        self.conn.executemany(
+            "INSERT INTO entries (id, slug, status, data) VALUES (?, ?, ?, ?)",
+            [_columns(row) for row in data if isinstance(row, dict)],
+        )
+
+    @contextmanager
+    def transaction(self) -> Iterator["Registry"]:
+        """Hold the write lock; changes commit together."""
+        with self._immediate():
+            yield self
+
+    def find(
+        self, *, entry_id: Optional[str] = None, slug: Optional[str] = None, status: Optional[str] = None
+    ) -> list[dict]:
+        """Return matching rows in registry order; ``status`` matches case-insensitively."""
+        clauses, params = [], []
+        for column, value in (("id", entry_id), ("slug", slug), ("status", status)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value.lower() if column == "status" else value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(f"SELECT data FROM entries {where} ORDER BY seq", params)
+        return [json.loads(data) for (data,) in rows]
+
+    def get(self, entry_id: str) -> Optional[dict]:
+        rows = self.find(entry_id=entry_id)
+        return rows[0] if rows else None
+
+    def append(self, row: dict) -> None:
+        with self.transaction():
+            self.conn.execute("INSERT INTO entries (id, slug, status, data) VALUES (?, ?, ?, ?)", _columns(row))
+
+    def _update_row(self, entry_id: str, change: Callable[[dict], None]) -> Optional[dict]:
+        found = self.conn.execute(
+            "SELECT seq, data FROM entries WHERE id = ? ORDER BY seq LIMIT 1", (entry_id,)
+        ).fetchone()
+        if found is None:
+            return None
+        seq, data = found
+        row = json.loads(data)
+        change(row)
+        self.conn.execute(
+            "UPDATE entries SET id = ?, slug = ?, status = ?, data = ? WHERE seq = ?", (*_columns(row), seq)
+        )
+        return row
+
+    def update(self, entry_id: str, change: Callable[[dict], None]) -> Optional[dict]:
+        """Apply ``change`` to the first row with ``entry_id`` atomically; None if it is unknown."""
+        with self.transaction():
+            return self._update_row(entry_id, change)
+
+    def update_many(self, changes: Iterable[Tuple[str, Callable[[dict], None]]]) -> None:
+        """Apply several ``(entry_id, change)`` pairs in one transaction; unknown ids are skipped."""
+        with self.transaction():
+            for entry_id, change in changes:
+                self._update_row(entry_id, change)
+
+    def export(self, output: Optional[Path] = None) -> Path:
+        """Write every row to ``output`` (default: ``json_path``) atomically; return the path."""
+        path = Path(output) if output else self.json_path
+        rows = self.find()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as fh:
+                json.dump(rows, fh, indent=2)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return path
+
+
+def open_registry(json_path: Optional[str] = None, db_path: Optional[str] = None) -> Registry:
+    """Open the registry named by the arguments or ``SUBAGENT_REGISTRY_FILE`` / ``SUBAGENT_REGISTRY_DB``.
+
+    A custom registry file without an explicit store gets one next to it.
+    """
+    custom = json_path or os.environ.get("SUBAGENT_REGISTRY_FILE")
+    db_path = db_path or os.environ.get("SUBAGENT_REGISTRY_DB")
+    if not db_path and custom:
+        db_path = str(Path(custom).with_suffix(".sqlite"))
+    return Registry(Path(custom) if custom else None, Path(db_path) if db_path else None)
+
+
+def _field_assignment(text: str) -> Tuple[str, str]:
+    key, sep, value = text.partition("=")
+    if not sep or not key.isidentifier():
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {text!r}")
+    return key, value
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registry", default=None, help=f"JSON export path (default: $SUBAGENT_REGISTRY_FILE or <repo>/{DEFAULT_REGISTRY})")
+    parser.add_argument("--db", default=None, help="SQLite store (default: $SUBAGENT_REGISTRY_DB or <repo>/.parallelus/cache/subagent-registry.sqlite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    get = sub.add_parser("get", help="Print one entry as JSON")
+    get.add_argument("entry_id")
+    lister = sub.add_parser("list", help="Print matching entries as a JSON array")
+    lister.add_argument("--id", dest="entry_id", default=None)
+    lister.add_argument("--slug", default=None)
+    lister.add_argument("--status", default=None)
+    append = sub.add_parser("append", help="Add an entry")
+    append.add_argument("entry_json")
+    update = sub.add_parser("update", help="Set string fields on one entry")
+    update.add_argument("entry_id")
+    update.add_argument(
+        "--set", dest="fields", action="append", required=True, metavar="KEY=VALUE", type=_field_assignment
+    )
+    export = sub.add_parser("export", help="Write the registry to the JSON export (or to --output)")
+    export.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    with open_registry(args.registry, args.db) as registry:
+        if args.command == "get":
+            row = registry.get(args.entry_id)
+            if row is None:
+                raise SystemExit(f"subagent_manager: unknown id {args.entry_id}")
+            print(json.dumps(row))
+        elif args.command == "list":
+            print(json.dumps(registry.find(entry_id=args.entry_id, slug=args.slug, status=args.status), indent=2))
+        elif args.command == "append":
+            entry = json.loads(args.entry_json)
+            if not isinstance(entry, dict):
+                raise SystemExit("subagent_registry: entry must be a JSON object")
+            registry.append(entry)
+        elif args.command == "update":
+            if registry.update(args.entry_id, lambda row: row.update(args.fields)) is None:
+                raise SystemExit(f"subagent_manager: unknown id {args.entry_id}")
+        else:
+            print(registry.export(args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,7 +2,7 @@
 set -euo pipefail
 
 ROOT=$(git rev-parse --show-toplevel 2>/dev/null || pwd)
-REGISTRY="$ROOT/parallelus/manuals/subagent-registry.json"
+REGISTRY_TOOL="$ROOT/parallelus/engine/bin/subagent_registry.py"
 TMUX_HELPER="$ROOT/parallelus/engine/bin/tmux-safe"
 if [[ -x "$TMUX_HELPER" ]]; then
   TMUX_BIN="$TMUX_HELPER"
@@ -52,12 +52,11 @@ fi
 
 current_commit=$(git rev-parse HEAD 2>/dev/null || true)
 
-pane_info=$(python3 - "$REGISTRY" "$ID" "$current_commit" <<'PY'
+rows=$(python3 "$REGISTRY_TOOL" list --id "$ID")
+pane_info=$(python3 - "$rows" "$ID" "$current_commit" <<'PY'
 import json, sys
-registry_path, entry_id, head_commit = sys.argv[1:4]
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
-for row in data:
+rows, entry_id, head_commit = sys.argv[1:4]
+for row in json.loads(rows):
     if row.get("id") == entry_id:
         handle = row.get("launcher_handle") or {}
         pane = handle.get("pane_id") or handle.get("window_id") or ""
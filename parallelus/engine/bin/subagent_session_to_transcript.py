@@ -4,18 +4,38 @@ Convert a Codex subagent session JSONL log into a Markdown transcript.
 
 Usage:
     parallelus/engine/bin/subagent_session_to_transcript.py path/to/session.jsonl [--output transcript.md]
+    parallelus/engine/bin/subagent_session_to_transcript.py path/to/session.jsonl --follow [--idle-exit SECONDS]
 
 If --output is omitted, the script writes alongside the source file using the
 same basename with `-transcript.md`.
+
+Conversion streams the log one line at a time. Lines that are not valid JSON
+objects (or whose fields have unexpected types) are skipped and counted. With
+--follow the script keeps the session open after converting it and appends
+entries to the Markdown as new lines arrive, until interrupted or until the
+log has not grown for --idle-exit seconds.
 """
 from __future__ import annotations
 
 import argparse
-import json
+import os
 import sys
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import BinaryIO, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from parallelus_jsonl import loads
+
+TRANSCRIPT_HEADER = "# Subagent Session Transcript\n\n"
+Entry = Tuple[str, str, str]
+
+
+@dataclass
+class ConversionStats:
+    entries: int = 0
+    skipped: int = 0
 
 
 def parse_args() -> argparse.Namespace:
@@ -27,6 +47,23 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional output path (defaults to <session>.md)",
     )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Keep appending entries as the session log grows (Ctrl-C to stop)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checks for new lines in --follow mode (default: 1)",
+    )
+    parser.add_argument(
+        "--idle-exit",
+        type=float,
+        default=None,
+        help="Stop following once the log has not grown for this many seconds",
+    )
     return parser.parse_args()
 
 
@@ -83,63 +120,173 @@ def extract_command(msg: dict) -> str:
     return str(command or "")
 
 
-def iter_entries(session_path: Path) -> Iterable[Tuple[str, str, str]]:
-    with session_path.open("r", encoding="utf-8") as fh:
-        for raw in fh:
-            raw = raw.strip()
-            if not raw:
-                continue
-            data = json.loads(raw)
-            payload = data.get("payload", {})
-            msg = payload.get("msg", {})
-            ts = data.get("ts") or payload.get("ts")
-            ts_fmt = format_timestamp(ts)
-            msg_type = msg.get("type")
-
-            if msg_type == "agent_message":
-                text = flatten_content(msg.get("message", "")).strip()
-                if text:
-                    yield ts_fmt, "Subagent", text
-            elif msg_type == "user_message":
-                text = flatten_content(msg.get("message", "")).strip()
-                if text:
-                    yield ts_fmt, "Main agent", text
-            elif msg_type == "message":
-                role = msg.get("role", "message").capitalize()
-                text = flatten_content(msg.get("content", "")).strip()
-                if text:
-                    yield ts_fmt, role, text
-            elif msg_type == "exec_command_begin":
-                cmd = extract_command(msg).strip()
-                if cmd:
-                    yield ts_fmt, "Command", cmd
-            elif msg_type == "exec_command_end":
-                exit_code = msg.get("exit_code")
-                stdout = (msg.get("stdout") or "").strip()
-                stderr = (msg.get("stderr") or "").strip()
-                parts = []
-                if exit_code is not None:
-                    parts.append(f"exit {exit_code}")
-                if stdout:
-                    parts.append("stdout:\n" + stdout)
-                if stderr:
-                    parts.append("stderr:\n" + stderr)
-                text = "\n".join(parts).strip()
-                if text:
-                    yield ts_fmt, "Command result", text
-            elif msg_type == "agent_summary":
-                text = flatten_content(msg.get("summary", "")).strip()
-                if text:
-                    yield ts_fmt, "Subagent summary", text
-
-
-def write_transcript(output_path: Path, entries: Iterable[Tuple[str, str, str]]) -> None:
+def read_records(fh: BinaryIO, stats: ConversionStats, *, final: bool = True) -> Iterator[dict]:
+    """Yield JSON objects from ``fh``'s current position, counting bad lines in ``stats``.
+
+    When ``final`` is false an unterminated last line is left unread (``fh`` is
+    rewound to its start) because the writer may still be appending to it.
+    """
+    while True:
+        start = fh.tell()
+        raw = fh.readline()
+        if not raw:
+            return
+        if not final and not raw.endswith(b"\n"):
+            fh.seek(start)
+            return
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            data = loads(raw)
+        except ValueError:
+            stats.skipped += 1
+            continue
+        if not isinstance(data, dict):
+            stats.skipped += 1
+            continue
+        yield data
+
+
+def _as_dict(value) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def record_entries(data: dict) -> List[Entry]:
+    payload = _as_dict(data.get("payload"))
+    msg = _as_dict(payload.get("msg"))
+    ts = data.get("ts") or payload.get("ts")
+    ts_fmt = format_timestamp(ts)
+    msg_type = msg.get("type")
+
+    if msg_type == "agent_message":
+        text = flatten_content(msg.get("message", "")).strip()
+        if text:
+            return [(ts_fmt, "Subagent", text)]
+    elif msg_type == "user_message":
+        text = flatten_content(msg.get("message", "")).strip()
+        if text:
+            return [(ts_fmt, "Main agent", text)]
+    elif msg_type == "message":
+        role = msg.get("role", "message").capitalize()
+        text = flatten_content(msg.get("content", "")).strip()
+        if text:
+            return [(ts_fmt, role, text)]
+    elif msg_type == "exec_command_begin":
+        cmd = extract_command(msg).strip()
+        if cmd:
+            return [(ts_fmt, "Command", cmd)]
+    elif msg_type == "exec_command_end":
+        exit_code = msg.get("exit_code")
+        stdout = (msg.get("stdout") or "").strip()
+        stderr = (msg.get("stderr") or "").strip()
+        parts = []
+        if exit_code is not None:
+            parts.append(f"exit {exit_code}")
+        if stdout:
+            parts.append("stdout:\n" + stdout)
+        if stderr:
+            parts.append("stderr:\n" + stderr)
+        text = "\n".join(parts).strip()
+        if text:
+            return [(ts_fmt, "Command result", text)]
+    elif msg_type == "agent_summary":
+        text = flatten_content(msg.get("summary", "")).strip()
+        if text:
+            return [(ts_fmt, "Subagent summary", text)]
+    return []
+
+
+def convert_records(records: Iterable[dict], stats: ConversionStats) -> Iterator[Entry]:
+    for data in records:
+        try:
+            entries = record_entries(data)
+        except (AttributeError, TypeError, ValueError):
+            stats.skipped += 1
+            continue
+        yield from entries
+
+
+def iter_entries(session_path: Path, stats: Optional[ConversionStats] = None) -> Iterator[Entry]:
+    stats = stats if stats is not None else ConversionStats()
+    with session_path.open("rb") as fh:
+        yield from convert_records(read_records(fh, stats), stats)
+
+
+def format_entry(ts: str, role: str, text: str) -> str:
+    text_block = text.replace("\n", "\n  ")
+    return f"- **{ts}** — {role}: {text_block}\n"
+
+
+def write_entries(out: TextIO, entries: Iterable[Entry], stats: ConversionStats) -> None:
+    for entry in entries:
+        out.write(format_entry(*entry))
+        stats.entries += 1
+
+
+def write_transcript(
+    output_path: Path, entries: Iterable[Entry], stats: Optional[ConversionStats] = None
+) -> None:
+    stats = stats if stats is not None else ConversionStats()
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("w", encoding="utf-8") as out:
-        out.write("# Subagent Session Transcript\n\n")
-        for ts, role, text in entries:
-            text_block = text.replace("\n", "\n  ")
-            out.write(f"- **{ts}** — {role}: {text_block}\n")
+        out.write(TRANSCRIPT_HEADER)
+        write_entries(out, entries, stats)
+
+
+def follow_transcript(
+    session_path: Path,
+    output_path: Path,
+    stats: ConversionStats,
+    *,
+    interval: float = 1.0,
+    idle_exit: Optional[float] = None,
+) -> None:
+    """Convert ``session_path`` and keep appending entries as it grows.
+
+    Only the bytes added since the last check are read. If the log is
+    truncated or replaced, the transcript is rebuilt from the new file.
+    Returns when ``idle_exit`` seconds pass without growth, or on Ctrl-C.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fh = session_path.open("rb")
+    out = output_path.open("w", encoding="utf-8")
+    try:
+        out.write(TRANSCRIPT_HEADER)
+        last_growth = time.monotonic()
+        last_size = -1
+        while True:
+            write_entries(out, convert_records(read_records(fh, stats, final=False), stats), stats)
+            out.flush()
+            now = time.monotonic()
+            try:
+                current = session_path.stat()
+            except FileNotFoundError:
+                current = None
+            opened = os.fstat(fh.fileno())
+            if current is not None and (
+                (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino) or current.st_size < fh.tell()
+            ):
+                fh.close()
+                fh = session_path.open("rb")
+                out.seek(0)
+                out.truncate()
+                out.write(TRANSCRIPT_HEADER)
+                stats.entries = stats.skipped = 0
+                last_growth, last_size = now, -1
+                continue
+            if current is not None and current.st_size != last_size:
+                last_growth, last_size = now, current.st_size
+            if idle_exit is not None and now - last_growth >= idle_exit:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Whatever is left is treated as complete, including an unterminated last line.
+        write_entries(out, convert_records(read_records(fh, stats), stats), stats)
+        out.close()
+        fh.close()
 
 
 def main() -> int:
@@ -150,9 +297,15 @@ def main() -> int:
         return 1
     default_output = session_path.with_name(f"{session_path.stem}-transcript.md")
     output_path: Path = args.output if args.output else default_output
-    entries = list(iter_entries(session_path))
-    write_transcript(output_path, entries)
-    print(f"Wrote {output_path}")
+    stats = ConversionStats()
+    if args.follow:
+        print(f"Following {session_path} into {output_path} (Ctrl-C to stop)", flush=True)
+        follow_transcript(session_path, output_path, stats, interval=max(0.01, args.interval), idle_exit=args.idle_exit)
+    else:
+        write_transcript(output_path, iter_entries(session_path, stats), stats)
+    if stats.skipped:
+        print(f"subagent_session_to_transcript: skipped {stats.skipped} malformed line(s)", file=sys.stderr)
+    print(f"Wrote {output_path} ({stats.entries} entries)")
     return 0
 
 
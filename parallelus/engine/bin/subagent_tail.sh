@@ -2,7 +2,7 @@
 set -euo pipefail
 
 ROOT=$(git rev-parse --show-toplevel 2>/dev/null || pwd)
-REGISTRY=${SUBAGENT_REGISTRY_FILE:-"$ROOT/parallelus/manuals/subagent-registry.json"}
+REGISTRY_TOOL="$ROOT/parallelus/engine/bin/subagent_registry.py"
 
 usage() {
   cat <<'USAGE'
@@ -43,12 +43,11 @@ if [[ -z "$ID" ]]; then
   exit 1
 fi
 
-info=$(python3 - "$REGISTRY" "$ID" <<'PY'
+rows=$(python3 "$REGISTRY_TOOL" list --id "$ID")
+info=$(python3 - "$rows" "$ID" <<'PY'
 import json, sys
-registry_path, entry_id = sys.argv[1:3]
-with open(registry_path, "r", encoding="utf-8") as fh:
-    data = json.load(fh)
-for row in data:
+rows, entry_id = sys.argv[1:3]
+for row in json.loads(rows):
     if row.get("id") == entry_id:
         path = row.get("path") or ""
         log_path = row.get("log_path") or ""
@@ -7,7 +7,7 @@ PLAN_DIR ?= docs/branches
 PROGRESS_DIR ?= docs/branches
 SESSION_DIR ?= .parallelus/sessions
 
-.PHONY: read_bootstrap bootstrap start_session turn_end archive agents-smoke agents-monitor-loop merge monitor_subagents queue_init queue_show queue_pull queue_clear queue_path collect_failures retro_audit_local senior_review_preflight senior_review_preflight_run
+.PHONY: read_bootstrap bootstrap start_session turn_end archive agents-smoke agents-monitor-loop merge monitor_subagents queue_init queue_show queue_pull queue_clear queue_path collect_failures failures_query retro_audit_local retro_preflight senior_review_preflight senior_review_preflight_run
 
 read_bootstrap:
 	@if [ "$${AGENTS_SESSION_LOG_REQUIRED:-1}" != "0" ] && ! $(AGENTS_BIN)/agents-session-logging-active --quiet; then \
@@ -54,9 +54,19 @@ turn_end:
 collect_failures:
 	@$(AGENTS_BIN)/collect_failures.py
 
+failures_query:
+ifdef ARGS
+	@$(AGENTS_BIN)/failures_query.py $(ARGS)
+else
+	@$(AGENTS_BIN)/failures_query.py top-commands
+endif
+
 retro_audit_local:
 	@$(AGENTS_BIN)/retro_audit_local.py
 
+retro_preflight:
+	@$(AGENTS_BIN)/retro_preflight.py $(ARGS)
+
 senior_review_preflight:
 ifdef ARGS
 	@$(AGENTS_BIN)/subagent_manager.sh review-preflight $(ARGS)
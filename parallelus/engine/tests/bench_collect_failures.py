@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark collect_failures text-log scanning on large console logs.
+
+Usage:
+    parallelus/engine/tests/bench_collect_failures.py [--log path/to/console.log] [--size-mb 256] [--hits 40]
+
+Without ``--log`` a synthetic ``console.log`` of roughly ``--size-mb``
+megabytes is generated: shell prompts, test output and ANSI noise with
+``--hits`` failure lines spread evenly through it (keep it under the 50-hit
+cap so the whole file is scanned). The legacy reader (text mode, three
+regexes per line) and ``collect_failures.scan_source`` (chunked binary reads,
+literal trigger search, regexes only on candidate lines) both scan it cold,
+and their clustered results are compared.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BIN_DIR = Path(__file__).resolve().parents[1] / "bin"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+from collect_failures import TEXT_HIT_LIMIT, cluster_failures, scan_source  # noqa: E402
+from parallelus_redaction import redact_text  # noqa: E402
+
+LEGACY_PATTERNS = [
+    re.compile(r"\bERROR\b", re.IGNORECASE),
+    re.compile(r"\bTraceback\b"),
+    re.compile(r"exit code\s+([1-9][0-9]*)", re.IGNORECASE),
+]
+
+NOISE = [
+    "$ make test",
+    "tests/test_session_paths.py::test_collect_failures_scans PASSED                     [ 42%]",
+    "\x1b[32m✓\x1b[0m lint ok (ruff 0.6.9, 214 files)",
+    "Collecting pyyaml>=6.0 (from -r requirements.txt (line 4))",
+    "  Downloading PyYAML-6.0.2-cp311-cp311-manylinux_2_17_x86_64.whl (762 kB)",
+    "[exec] turn.completed in=18211 cached_in=17024 out=912",
+    "warning: LF will be replaced by CRLF the next time Git touches it",
+]
+FAILURES = [
+    "ERROR tests/test_merge.py::test_conflict - AssertionError",
+    "Traceback (most recent call last):",
+    "make: *** [test] Error 2 (exit code 2)",
+]
+
+
+def legacy_scan(path: Path) -> tuple[list, list]:
+    failures: list = []
+    warnings: list = []
+    hits = 0
+    with path.open("r", encoding="utf-8", errors="ignore") as fh:
+        for line in fh:
+            if any(p.search(line) for p in LEGACY_PATTERNS):
+                failures.append({"source": str(path), "kind": "unstructured_log", "excerpt": redact_text(line.strip())[:300]})
+                hits += 1
+                if hits >= TEXT_HIT_LIMIT:
+                    warnings.append(f"{path} produced many matches; truncated to {TEXT_HIT_LIMIT}")
+                    break
+    return failures, warnings
+
+
+def write_synthetic_log(path: Path, size_mb: float, hits: int, seed: int = 13) -> None:
+    rng = random.Random(seed)
+    budget = int(size_mb * 1024 * 1024)
+    every = max(1, budget // max(1, hits))
+    written = 0
+    next_hit = every // 2
+    with path.open("w", encoding="utf-8") as fh:
+        while written < budget:
+            if hits and written >= next_hit:
+                line = rng.choice(FAILURES)
+                next_hit += every
+            else:
+                line = rng.choice(NOISE)
+            fh.write(line + "\n")
+            written += len(line.encode("utf-8")) + 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", type=Path, default=None, help="Existing console.log to scan")
+    parser.add_argument("--size-mb", type=float, default=256.0, help="Synthetic log size (default: 256)")
+    parser.add_argument("--hits", type=int, default=40, help="Failure lines in the synthetic log (default: 40)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.log
+        if path is None:
+            path = Path(tmp) / "console.log"
+            write_synthetic_log(path, args.size_mb, args.hits)
+        size_mib = path.stat().st_size / 1_048_576
+
+        start = time.perf_counter()
+        legacy = legacy_scan(path)
+        legacy_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        summary, warnings, _ = scan_source(path)
+        scan_s = time.perf_counter() - start
+
+    clusters = list(summary["clusters"].values())
+    print(f"log: {size_mib:.1f} MiB  failures: {summary['count']}  warnings: {len(warnings)}")
+    print(f"legacy per-line regexes : {legacy_s:8.3f}s  ({size_mib / legacy_s:7.1f} MiB/s)")
+    print(f"chunked trigger scan    : {scan_s:8.3f}s  ({size_mib / scan_s:7.1f} MiB/s)")
+    print(f"speedup                 : {legacy_s / scan_s:8.2f}x")
+    print(f"identical output        : {(cluster_failures(legacy[0]), legacy[1]) == (clusters, warnings)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
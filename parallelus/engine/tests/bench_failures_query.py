@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark the failures query index on a synthetic failures directory.
+
+Usage:
+    parallelus/engine/tests/bench_failures_query.py [--reports 5000] [--clusters 8]
+
+Generates ``--reports`` summaries (header plus ``.failures.jsonl`` stream)
+spread over branches and marker days, then times a cold index build, a warm
+refresh with nothing changed, a refresh after touching one report, and each
+aggregate query.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BIN_DIR = Path(__file__).resolve().parents[1] / "bin"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+import failures_query  # noqa: E402
+
+COMMANDS = ["pytest -q", "make lint", "ruff check .", "npm test", "git push", "make merge slug=<n>", "mypy ."]
+
+
+def write_reports(repo: Path, reports: int, clusters: int, seed: int = 3) -> list[Path]:
+    rng = random.Random(seed)
+    failures_dir = repo / "docs" / "parallelus" / "self-improvement" / "failures"
+    failures_dir.mkdir(parents=True)
+    paths = []
+    for idx in range(reports):
+        branch = f"feature/b{idx % 60}"
+        marker_ts = f"2026-{1 + idx % 12:02d}-{1 + idx % 28:02d}T{idx % 24:02d}:00:{idx % 60:02d}+00:00"
+        name = f"{branch.replace('/', '-')}--{marker_ts}"
+        items = []
+        for _ in range(rng.randint(0, clusters)):
+            command = rng.choice(COMMANDS)
+            items.append(
+                {"kind": "exec_command_end", "fingerprint": f"fp-{command}", "normalized_command": command, "count": rng.randint(1, 9)}
+            )
+        (failures_dir / f"{name}.failures.jsonl").write_text("".join(json.dumps(i) + "\n" for i in items), encoding="utf-8")
+        summary = {
+            "branch": branch,
+            "marker_timestamp": marker_ts,
+            "failures_file": f"{name}.failures.jsonl",
+            "failure_count": sum(i["count"] for i in items),
+            "cluster_count": len(items),
+            "warnings": [],
+        }
+        path = failures_dir / f"{name}.json"
+        path.write_text(json.dumps(summary), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def timed(label: str, func) -> None:
+    start = time.perf_counter()
+    func()
+    print(f"{label:24}: {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=5000, help="Synthetic summaries (default: 5000)")
+    parser.add_argument("--clusters", type=int, default=8, help="Max clusters per summary (default: 8)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp)
+        paths = write_reports(repo, args.reports, args.clusters)
+        conn = failures_query.connect(repo / "index.sqlite")
+        print(f"reports: {args.reports}")
+        timed("cold index build", lambda: failures_query.refresh_index(conn, repo))
+        timed("warm refresh", lambda: failures_query.refresh_index(conn, repo))
+        paths[0].write_text(paths[0].read_text(encoding="utf-8") + "\n", encoding="utf-8")
+        timed("refresh after 1 change", lambda: failures_query.refresh_index(conn, repo))
+        timed("top-commands", lambda: failures_query.query_top_commands(conn))
+        timed("branches", lambda: failures_query.query_branches(conn))
+        timed("trend --by week", lambda: failures_query.query_trend(conn, by="week"))
+        timed("trend --command pytest", lambda: failures_query.query_trend(conn, command="pytest"))
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
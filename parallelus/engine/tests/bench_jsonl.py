@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark the JSONL decoding backends exposed by ``parallelus_jsonl``.
+
+Usage:
+    parallelus/engine/tests/bench_jsonl.py [--session path/to/session.jsonl] [--size-mb 32]
+
+Without ``--session`` a synthetic Codex session log of roughly ``--size-mb``
+megabytes is generated (exec events with nested payloads and command output).
+Every installed backend decodes the same lines; backends that are not
+installed are reported and skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+BIN_DIR = Path(__file__).resolve().parents[1] / "bin"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+from parallelus_jsonl import BACKEND, BACKENDS, available_backends, get_decoder  # noqa: E402
+
+
+def synthetic_lines(size_mb: float, seed: int = 11) -> list[bytes]:
+    rng = random.Random(seed)
+    words = "collected tests passed failed warning module import fixture assert diff".split()
+    lines: list[bytes] = []
+    total = 0
+    budget = int(size_mb * 1024 * 1024)
+    while total < budget:
+        output = "\n".join(" ".join(rng.choice(words) for _ in range(12)) for _ in range(rng.randint(1, 40)))
+        event = {
+            "ts": "2026-02-07T15:00:00.000Z",
+            "dir": "to_tui",
+            "kind": "codex_event",
+            "payload": {
+                "id": str(len(lines)),
+                "msg": {
+                    "type": rng.choice(["exec_command_end", "agent_message", "token_count"]),
+                    "exit_code": rng.choice([0, 0, 0, 1]),
+                    "command": ["bash", "-lc", "make test"],
+                    "stdout": output,
+                    "usage": {"input_tokens": rng.randint(1, 90000), "cached_input_tokens": 1024},
+                },
+            },
+        }
+        line = json.dumps(event).encode("utf-8")
+        lines.append(line)
+        total += len(line) + 1
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--session", type=Path, default=None, help="Existing JSONL session log to decode")
+    parser.add_argument("--size-mb", type=float, default=32.0, help="Synthetic log size (default: 32)")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions per backend (default: 3)")
+    args = parser.parse_args()
+
+    if args.session:
+        lines = [raw.strip() for raw in args.session.read_bytes().splitlines() if raw.strip()]
+    else:
+        lines = synthetic_lines(args.size_mb)
+    size_mib = sum(len(line) for line in lines) / 1_048_576
+    print(f"lines: {len(lines)}  size: {size_mib:.1f} MiB  default backend: {BACKEND}")
+
+    installed = available_backends()
+    baseline = None
+    for name in reversed(BACKENDS):
+        if name not in installed:
+            print(f"{name:8}: not installed")
+            continue
+        _, loads = get_decoder(name)
+        best = float("inf")
+        for _ in range(max(1, args.repeat)):
+            start = time.perf_counter()
+            for line in lines:
+                loads(line)
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        print(f"{name:8}: {best:7.3f}s  ({size_mib / best:7.1f} MiB/s, {baseline / best:5.2f}x vs stdlib)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
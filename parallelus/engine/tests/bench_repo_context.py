@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Count git forks and wall time of the retrospective preflight pipeline.
+
+Usage:
+    parallelus/engine/tests/bench_repo_context.py [--repeat 5]
+
+Builds a throwaway repository with a copy of the engine and runs
+``retro-marker``, ``collect_failures.py``, ``retro_audit_local.py`` and
+``verify-retrospective`` in sequence, first letting each script resolve the
+repository itself and then with one shared ``PARALLELUS_REPO_CONTEXT``
+snapshot (as ``agents-turn-end`` passes it), and finally as the single-process
+``retro_preflight.py`` that ``review-preflight`` runs. A ``git`` shim on
+``PATH`` logs every invocation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+PIPELINE = ["retro-marker", "collect_failures.py", "retro_audit_local.py", "verify-retrospective"]
+
+
+def _git(*args: str, cwd: Path) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, text=True, capture_output=True, check=True).stdout
+
+
+def init_repo(repo: Path, branch: str = "feature/bench") -> None:
+    shutil.copytree(REPO_ROOT / "parallelus/engine", repo / "parallelus/engine")
+    slug = branch.replace("/", "-")
+    notebook_dir = repo / "docs" / "branches" / slug
+    notebook_dir.mkdir(parents=True)
+    (notebook_dir / "PLAN.md").write_text(f"# Branch Plan — {branch}\n", encoding="utf-8")
+    (notebook_dir / "PROGRESS.md").write_text(f"# Branch Progress — {branch}\n", encoding="utf-8")
+    _git("init", "-q", cwd=repo)
+    _git("config", "user.name", "Bench", cwd=repo)
+    _git("config", "user.email", "bench@example.com", cwd=repo)
+    _git("add", ".", cwd=repo)
+    _git("commit", "-q", "-m", "init", cwd=repo)
+    _git("checkout", "-q", "-b", branch, cwd=repo)
+
+
+def write_git_shim(shim_dir: Path, log: Path) -> None:
+    real_git = shutil.which("git")
+    shim = shim_dir / "git"
+    shim.write_text(f'#!/bin/sh\necho "$*" >> "{log}"\nexec "{real_git}" "$@"\n', encoding="utf-8")
+    shim.chmod(0o755)
+
+
+def run_pipeline(repo: Path, env: dict, scripts: list[str] = PIPELINE) -> float:
+    start = time.perf_counter()
+    for script in scripts:
+        subprocess.run([str(repo / "parallelus/engine/bin" / script)], cwd=repo, env=env, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Best-of repetitions (default: 5)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp) / "repo"
+        shim_dir = Path(tmp) / "shim"
+        repo.mkdir()
+        shim_dir.mkdir()
+        init_repo(repo)
+        log = Path(tmp) / "git.log"
+        write_git_shim(shim_dir, log)
+        base_env = dict(os.environ, PATH=f"{shim_dir}{os.pathsep}{os.environ['PATH']}", AGENTS_RETRO_SKIP_VALIDATE="1")
+        base_env.pop("PARALLELUS_REPO_CONTEXT", None)
+
+        facts = _git("rev-parse", "--show-toplevel", "HEAD", "--abbrev-ref", "HEAD", cwd=repo)
+        snapshot = facts + str(repo)
+        for label, env, scripts in (
+            ("per-script git queries", base_env, PIPELINE),
+            ("shared snapshot", dict(base_env, PARALLELUS_REPO_CONTEXT=snapshot), PIPELINE),
+            ("retro_preflight.py", base_env, ["retro_preflight.py"]),
+        ):
+            best = float("inf")
+            forks = 0
+            for _ in range(max(1, args.repeat)):
+                log.write_text("", encoding="utf-8")
+                best = min(best, run_pipeline(repo, env, scripts))
+                forks = len(log.read_text(encoding="utf-8").splitlines())
+            print(f"{label:24}: {forks:3d} git forks  {best * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
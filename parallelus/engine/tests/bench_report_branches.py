@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark report_branches ahead/behind counting on repos with many refs.
+
+Usage:
+    parallelus/engine/tests/bench_report_branches.py [--branches 3000] [--history 5000] [--legacy-sample 200]
+
+Builds a throwaway repository with ``git fast-import``: a linear ``main`` of
+``--history`` commits and ``--branches`` local branches forked at random points
+with one to three commits of their own. ``report_branches.scan_branches`` (one
+``for-each-ref`` pass plus, on git < 2.41, one ``rev-list`` walk) is timed
+against ``git rev-list --left-right --count`` per branch, which is timed on
+``--legacy-sample`` branches and extrapolated. Counts are checked against the
+per-branch results for the sampled branches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BIN_DIR = Path(__file__).resolve().parents[1] / "bin"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+import report_branches  # noqa: E402
+
+
+def _commit(lines: list[str], ref: str, mark: int, parent: int | None, stamp: int) -> None:
+    lines.append(f"commit {ref}")
+    lines.append(f"mark :{mark}")
+    lines.append(f"committer Bench <bench@example.com> {stamp} +0000")
+    lines.append("data 0")
+    if parent is not None:
+        lines.append(f"from :{parent}")
+    lines.append("")
+
+
+def build_repo(repo: Path, branches: int, history: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    subprocess.run(["git", "init", "-q", "-b", "main", str(repo)], check=True)
+    lines: list[str] = []
+    stamp = 1_700_000_000
+    for mark in range(1, history + 1):
+        _commit(lines, "refs/heads/main", mark, mark - 1 if mark > 1 else None, stamp + mark * 60)
+    mark = history
+    for index in range(branches):
+        parent = rng.randint(1, history - 1)
+        for _ in range(rng.randint(1, 3)):
+            mark += 1
+            _commit(lines, f"refs/heads/feature/b{index:05d}", mark, parent, stamp + parent * 60 + 30)
+            parent = mark
+    subprocess.run(
+        ["git", "fast-import", "--quiet"], cwd=repo, input="\n".join(lines) + "\n", text=True, check=True
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--branches", type=int, default=3000, help="Unmerged branches to create (default: 3000)")
+    parser.add_argument("--history", type=int, default=5000, help="Commits on main (default: 5000)")
+    parser.add_argument("--legacy-sample", type=int, default=200, help="Branches timed with rev-list --count (default: 200)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp) / "repo"
+        build_repo(repo, args.branches, args.history)
+        os.chdir(repo)
+
+        start = time.perf_counter()
+        _, local = report_branches.scan_branches("main", "origin")
+        bulk_s = time.perf_counter() - start
+
+        sample = sorted(local)[: args.legacy_sample]
+        start = time.perf_counter()
+        expected = {}
+        for name in sample:
+            out = subprocess.run(
+                ["git", "rev-list", "--left-right", "--count", f"{name}...main"],
+                text=True,
+                capture_output=True,
+                check=True,
+            ).stdout.split()
+            expected[name] = (int(out[0]), int(out[1]))
+        legacy_s = (time.perf_counter() - start) * len(local) / max(1, len(sample))
+
+    matches = all((local[name].ahead, local[name].behind) == expected[name] for name in sample)
+    print(f"branches: {len(local)}  history: {args.history}")
+    print(f"rev-list --count per branch : {legacy_s:8.3f}s  (extrapolated from {len(sample)})")
+    print(f"single for-each-ref pass    : {bulk_s:8.3f}s")
+    print(f"speedup                     : {legacy_s / bulk_s:8.2f}x")
+    print(f"identical counts            : {matches}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
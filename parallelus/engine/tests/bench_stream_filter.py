@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark ``codex_exec_stream_filter.py --mode json`` throughput.
+
+Usage:
+    parallelus/engine/tests/bench_stream_filter.py [--events path/to/subagent.exec_events.jsonl] [--count 50000]
+
+Replays a recorded ``codex exec --json`` event stream (or a synthetic one with
+``--count`` events) through the filter once per style (``tui`` and
+``compact``), capturing events to a temporary file and discarding stdout, and
+reports events per second. Interpreter start-up is included in the timing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+FILTER = Path(__file__).resolve().parents[1] / "bin" / "codex_exec_stream_filter.py"
+
+
+def synthetic_events(count: int, seed: int = 5) -> bytes:
+    rng = random.Random(seed)
+    words = "collected passed failed warning ruff pytest diff error module".split()
+    events = [{"type": "thread.started", "thread_id": "0199aaaa-bbbb-cccc-dddd-eeeeffff0000"}, {"type": "turn.started"}]
+    item = 0
+    while len(events) < count:
+        item += 1
+        command = f"/bin/bash -lc 'set -euo pipefail\nmake test TARGET=t{item}'"
+        output = "\n".join(" ".join(rng.choice(words) for _ in range(10)) for _ in range(rng.randint(1, 30)))
+        events.extend(
+            [
+                {"type": "item.started", "item": {"id": f"r{item}", "type": "reasoning"}},
+                {"type": "item.completed", "item": {"id": f"r{item}", "type": "reasoning", "text": "thinking"}},
+                {"type": "item.started", "item": {"id": f"c{item}", "type": "command_execution", "command": command}},
+                {
+                    "type": "item.completed",
+                    "item": {
+                        "id": f"c{item}",
+                        "type": "command_execution",
+                        "command": command,
+                        "aggregated_output": output,
+                        "exit_code": rng.choice([0, 0, 0, 2]),
+                    },
+                },
+            ]
+        )
+        if item % 10 == 0:
+            events.append({"type": "item.completed", "item": {"id": f"m{item}", "type": "agent_message", "text": "update"}})
+            events.append({"type": "turn.completed", "usage": {"input_tokens": 9000, "cached_input_tokens": 8000, "output_tokens": 300}})
+    return b"".join(json.dumps(evt).encode("utf-8") + b"\n" for evt in events[:count])
+
+
+def run_filter(payload: bytes, style: str, workdir: Path) -> float:
+    events_path = workdir / f"events-{style}.jsonl"
+    events_path.unlink(missing_ok=True)
+    cmd = [sys.executable, str(FILTER), "--mode", "json", "--style", style, "--events-path", str(events_path)]
+    start = time.perf_counter()
+    subprocess.run(cmd, input=payload, stdout=subprocess.DEVNULL, check=True)
+    elapsed = time.perf_counter() - start
+    if events_path.read_bytes() != payload:
+        raise SystemExit(f"bench_stream_filter: event capture for --style {style} is not byte-identical")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=Path, default=None, help="Recorded exec events JSONL to replay")
+    parser.add_argument("--count", type=int, default=50000, help="Synthetic event count (default: 50000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions per style (default: 3)")
+    args = parser.parse_args()
+
+    payload = args.events.read_bytes() if args.events else synthetic_events(args.count)
+    total = payload.count(b"\n")
+    verbose = os.environ.get("SUBAGENT_EXEC_SUMMARY_VERBOSE", "")
+    print(f"events: {total}  size: {len(payload) / 1_048_576:.1f} MiB  verbose: {verbose or 'off'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for style in ("tui", "compact"):
+            best = min(run_filter(payload, style, Path(tmp)) for _ in range(max(1, args.repeat)))
+            print(f"{style:8}: {best:7.3f}s  ({total / best:10.0f} events/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -143,6 +143,8 @@ def _setup_repo(scenario: str) -> Path:
     shutil.copy2(SCRIPT_UNDER_TEST, monitor_script)
     mode = os.stat(monitor_script).st_mode
     os.chmod(monitor_script, mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    # The loop reads registry rows through subagent_registry (seeded from the JSON below).
+    shutil.copy2(SCRIPT_UNDER_TEST.with_name("subagent_registry.py"), script_dest / "subagent_registry.py")
 
     _write_stub(tmp_dir, scenario)
 
@@ -61,7 +61,7 @@ def _setup_repo() -> Path:
     return tmpdir
 
 
-def _prepare_benign_repo(tmpdir: Path) -> str:
+def _prepare_benign_repo(tmpdir: Path, failures_file: str | None = None) -> str:
     _run(["git", "checkout", "-qb", "feature/test"], cwd=tmpdir)
     code_file = tmpdir / "src.txt"
     code_file.write_text("base change\n", encoding="utf-8")
@@ -84,9 +84,11 @@ def _prepare_benign_repo(tmpdir: Path) -> str:
         json.dumps({"branch": "feature/test", "marker_timestamp": marker_timestamp}, indent=2) + "\n",
         encoding="utf-8",
     )
+    failures_header = {"branch": "feature/test", "marker_timestamp": marker_timestamp, "failures": []}
+    if failures_file:
+        failures_header["failures_file"] = failures_file
     (failures_dir / f"{slugged}--{marker_timestamp}.json").write_text(
-        json.dumps({"branch": "feature/test", "marker_timestamp": marker_timestamp, "failures": []}, indent=2)
-        + "\n",
+        json.dumps(failures_header, indent=2) + "\n",
         encoding="utf-8",
     )
     _run(["git", "add", "docs/parallelus/self-improvement"], cwd=tmpdir)
@@ -201,6 +203,20 @@ def test_agents_merge_rejects_non_benign_commit():
         shutil.rmtree(tmpdir)
 
 
+def test_agents_merge_requires_committed_failures_stream():
+    tmpdir = _setup_repo()
+    try:
+        stream = "feature-test--2025-11-02T00:00:00Z.failures.jsonl"
+        slug = _prepare_benign_repo(tmpdir, failures_file=stream)
+        env = os.environ.copy()
+        env.setdefault("AGENTS_ALLOW_MAIN_COMMIT", "1")
+        result = _run(["parallelus/engine/bin/agents-merge", slug], cwd=tmpdir, env=env, check=False)
+        assert result.returncode != 0, "Expected failure when the failures stream is not committed"
+        assert f"Missing docs/parallelus/self-improvement/failures/{stream}" in result.stderr
+    finally:
+        shutil.rmtree(tmpdir)
+
+
 def test_agents_merge_skip_retro_logs_outside_repo():
     tmpdir = _setup_repo()
     state_root = Path(tmpdir).parent / ".parallelus"
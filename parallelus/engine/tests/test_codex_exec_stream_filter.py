@@ -0,0 +1,239 @@
+"""Regression tests for the codex exec JSON stream filter."""
+
+from __future__ import annotations
+
+import io
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BIN_DIR = REPO_ROOT / "parallelus/engine" / "bin"
+FILTER = BIN_DIR / "codex_exec_stream_filter.py"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+import codex_exec_stream_filter as stream_filter  # noqa: E402
+
+EVENTS = [
+    {"type": "thread.started", "thread_id": "0199aaaa-bbbb-cccc-dddd-eeeeffff0000"},
+    {"type": "turn.started"},
+    {"type": "item.started", "item": {"id": "i1", "type": "command_execution", "command": "bash -lc 'make test'"}},
+    {
+        "type": "item.completed",
+        "item": {"id": "i1", "type": "command_execution", "command": "bash -lc 'make test'", "exit_code": 0, "aggregated_output": "ok\n"},
+    },
+    {"type": "item.completed", "item": {"id": "i2", "type": "agent_message", "text": "first"}},
+    {"type": "item.completed", "item": {"id": "i3", "type": "agent_message", "text": "final answer"}},
+    {"type": "turn.completed", "usage": {"input_tokens": 10, "cached_input_tokens": 4, "output_tokens": 2}},
+]
+
+
+def _payload() -> bytes:
+    return b"".join(json.dumps(evt).encode("utf-8") + b"\n" for evt in EVENTS) + b"not json\n"
+
+
+def test_json_mode_captures_events_and_last_message(tmp_path: Path) -> None:
+    events_path = tmp_path / "out" / "events.jsonl"
+    last_path = tmp_path / "out" / "last.txt"
+    sid_path = tmp_path / "out" / "sid.txt"
+    result = subprocess.run(
+        [
+            sys.executable,
+            str(FILTER),
+            "--mode",
+            "json",
+            "--events-path",
+            str(events_path),
+            "--last-message-path",
+            str(last_path),
+            "--session-id-path",
+            str(sid_path),
+            "--flush-bytes",
+            "16",
+        ],
+        input=_payload(),
+        capture_output=True,
+        check=True,
+    )
+    assert events_path.read_bytes() == _payload()
+    assert last_path.read_text(encoding="utf-8") == "final answer\n"
+    assert sid_path.read_text(encoding="utf-8").strip() == EVENTS[0]["thread_id"]
+    stdout = result.stdout.decode("utf-8")
+    assert "- Run make test" in stdout
+    assert "- Turn complete (in=10, cached_in=4, out=2)" in stdout
+
+
+def test_buffered_capture_flushes_while_pipe_is_idle(tmp_path: Path) -> None:
+    events_path = tmp_path / "events.jsonl"
+    last_path = tmp_path / "last.txt"
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            str(FILTER),
+            "--mode",
+            "json",
+            "--events-path",
+            str(events_path),
+            "--last-message-path",
+            str(last_path),
+            "--flush-interval",
+            "0.05",
+            "--no-print-events",
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        line = json.dumps(EVENTS[4]).encode("utf-8") + b"\n"
+        proc.stdin.write(line)
+        proc.stdin.flush()
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not (events_path.exists() and events_path.read_bytes() == line):
+            time.sleep(0.02)
+        assert events_path.read_bytes() == line
+        while time.monotonic() < deadline and not last_path.exists():
+            time.sleep(0.02)
+        assert last_path.read_text(encoding="utf-8") == "first\n"
+    finally:
+        proc.stdin.close()
+        proc.wait(timeout=10)
+    assert proc.returncode == 0
+
+
+class _StalledStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.release.wait(5)
+        return super().write(text)
+
+
+def test_display_writer_drops_detail_then_folds_summaries_when_stdout_stalls() -> None:
+    stream = _StalledStream()
+    display = stream_filter._DisplayWriter(stream, max_pending=4)
+    display.emit("warmup")
+    time.sleep(0.05)  # writer thread is now blocked inside write()
+    for idx in range(6):
+        display.emit_summary(f"- Ran cmd{idx}\n  └ output {idx}")
+    stream.release.set()
+    display.close()
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "warmup"
+    assert lines[1:5] == ["- … 3 more events", "- Ran cmd3", "- Ran cmd4", "- Ran cmd5"]
+    assert not any("└" in line for line in lines)
+    assert display.dropped == 9
+    assert lines[-1] == "- (9 display lines dropped: output was not keeping up)"
+
+
+def test_display_writer_never_evicts_agent_messages() -> None:
+    stream = _StalledStream()
+    display = stream_filter._DisplayWriter(stream, max_pending=2)
+    display.emit("warmup")
+    time.sleep(0.05)
+    display.emit_message("first answer")
+    for idx in range(4):
+        display.emit_summary(f"- Ran cmd{idx}")
+    display.emit_message("second answer")
+    stream.release.set()
+    display.close()
+
+    lines = stream.getvalue().splitlines()
+    assert lines[1:] == [
+        "first answer",
+        "- … 4 more events",
+        "second answer",
+        "- (4 display lines dropped: output was not keeping up)",
+    ]
+
+
+def test_metrics_sidecar_tracks_tokens_commands_and_failures(tmp_path: Path) -> None:
+    metrics_path = tmp_path / "metrics.json"
+    extra = [
+        {"type": "item.started", "item": {"id": "i4", "type": "command_execution", "command": "pytest --token abc"}},
+        {"type": "item.completed", "item": {"id": "i4", "type": "command_execution", "command": "pytest --token abc", "exit_code": 1}},
+        {"type": "item.failed", "item": {"id": "i5", "type": "mcp_tool_call"}},
+        {"type": "turn.completed", "usage": {"input_tokens": 30, "cached_input_tokens": 16, "output_tokens": 1}},
+    ]
+    payload = _payload() + b"".join(json.dumps(evt).encode("utf-8") + b"\n" for evt in extra)
+    subprocess.run(
+        [sys.executable, str(FILTER), "--mode", "json", "--metrics-path", str(metrics_path), "--no-print-events"],
+        input=payload,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    metrics = json.loads(metrics_path.read_text(encoding="utf-8"))
+    assert metrics["session_id"] == EVENTS[0]["thread_id"]
+    assert metrics["events"] == len(EVENTS) + len(extra)
+    assert metrics["turns"] == 2
+    assert metrics["tokens"] == {"input": 40, "cached_input": 20, "output": 3}
+    assert metrics["cache_hit_ratio"] == 0.5
+    assert metrics["commands"]["started"] == 2
+    assert metrics["commands"]["completed"] == 2
+    assert metrics["commands"]["running"] == 0
+    assert [entry["command"] for entry in sorted(metrics["slowest_commands"], key=lambda e: e["command"])] == [
+        "make test",
+        "pytest --token [REDACTED]",
+    ]
+    assert metrics["failures"] == {"commands_nonzero_exit": 1, "items_failed": 1, "turns_failed": 0}
+    assert metrics["display_lines_dropped"] == 0
+
+
+def test_metrics_flushes_report_display_drops_as_they_happen(tmp_path: Path) -> None:
+    metrics_path = tmp_path / "metrics.json"
+    dropped = [0]
+    capture = stream_filter._CaptureWriter(
+        None, None, flush_bytes=1024, flush_interval=0, metrics_path=str(metrics_path), dropped_lines=lambda: dropped[0]
+    )
+    capture.observe(EVENTS[0])
+    dropped[0] = 7
+    capture.flush()
+    assert json.loads(metrics_path.read_text(encoding="utf-8"))["display_lines_dropped"] == 7
+    capture.close()
+
+
+def test_sigterm_flushes_buffered_capture(tmp_path: Path) -> None:
+    events_path = tmp_path / "events.jsonl"
+    metrics_path = tmp_path / "metrics.json"
+    sid_path = tmp_path / "sid.txt"
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            str(FILTER),
+            "--mode",
+            "json",
+            "--events-path",
+            str(events_path),
+            "--metrics-path",
+            str(metrics_path),
+            "--session-id-path",
+            str(sid_path),
+            "--flush-interval",
+            "0",
+            "--no-print-events",
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+    )
+    # thread.started goes last so the session id file marks "everything read".
+    payload = b"".join(json.dumps(evt).encode("utf-8") + b"\n" for evt in [*EVENTS[1:], EVENTS[0]])
+    try:
+        proc.stdin.write(payload)
+        proc.stdin.flush()
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not sid_path.exists():
+            time.sleep(0.02)
+        assert not events_path.exists() or events_path.read_bytes() == b""
+        proc.terminate()
+        proc.wait(timeout=10)
+    finally:
+        proc.kill()
+    assert proc.returncode == 128 + 15
+    assert events_path.read_bytes() == payload
+    assert json.loads(metrics_path.read_text(encoding="utf-8"))["events"] == len(EVENTS)
@@ -0,0 +1,269 @@
+"""Regression tests for failure collection scoping and scanning."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BIN_DIR = REPO_ROOT / "parallelus/engine" / "bin"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+from collect_failures import cluster_failures, merge_clusters, scan_source, write_failures_stream  # noqa: E402
+
+
+def _run(cmd: list[str], cwd: Path) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(cmd, cwd=cwd, text=True, capture_output=True, check=False)
+
+
+def _init_repo(tmp: Path, branch: str) -> None:
+    shutil.copytree(REPO_ROOT / "parallelus/engine", tmp / "parallelus/engine")
+    _run(["git", "init", "-q"], cwd=tmp)
+    _run(["git", "config", "user.name", "Collect Failures"], cwd=tmp)
+    _run(["git", "config", "user.email", "collect.failures@example.com"], cwd=tmp)
+    (tmp / "README.md").write_text("collect-failures\n", encoding="utf-8")
+    _run(["git", "add", "README.md"], cwd=tmp)
+    _run(["git", "commit", "-q", "-m", "init"], cwd=tmp)
+    _run(["git", "checkout", "-q", "-b", branch], cwd=tmp)
+
+
+def _write_marker(repo: Path, slug: str, marker: dict) -> None:
+    marker_dir = repo / "docs" / "parallelus" / "self-improvement" / "markers"
+    marker_dir.mkdir(parents=True, exist_ok=True)
+    (marker_dir / f"{slug}.json").write_text(json.dumps(marker, indent=2) + "\n", encoding="utf-8")
+
+
+def _session(repo: Path, session_id: str, *, branch: str | None, log: str, mtime: float | None = None) -> Path:
+    session_dir = repo / ".parallelus" / "sessions" / session_id
+    session_dir.mkdir(parents=True, exist_ok=True)
+    meta = {"session_id": session_id, "started_at": "2026-02-07T09:00:00+00:00"}
+    if branch is not None:
+        meta["branch"] = branch
+    (session_dir / "meta.json").write_text(json.dumps(meta) + "\n", encoding="utf-8")
+    console = session_dir / "console.log"
+    console.write_text(log, encoding="utf-8")
+    if mtime is not None:
+        os.utime(console, (mtime, mtime))
+    return console
+
+
+def _collect(repo: Path, *args: str) -> dict:
+    """Run the collector and return its summary header with the streamed failures inlined."""
+    result = _run([str(repo / "parallelus/engine" / "bin" / "collect_failures.py"), *args], cwd=repo)
+    assert result.returncode == 0, result.stderr
+    summary_path = repo / result.stdout.strip().split("wrote ", 1)[-1]
+    report = json.loads(summary_path.read_text(encoding="utf-8"))
+    assert "failures" not in report
+    stream = summary_path.with_name(report["failures_file"])
+    report["failures"] = [json.loads(line) for line in stream.read_text(encoding="utf-8").splitlines()]
+    assert len(report["failures"]) == report["cluster_count"]
+    return report
+
+
+def test_collect_failures_scopes_sources_by_marker_window_and_branch() -> None:
+    with tempfile.TemporaryDirectory(prefix="collect-failures-scope-") as tmpdir:
+        repo = Path(tmpdir)
+        branch = "feature/scope"
+        slug = branch.replace("/", "-")
+        _init_repo(repo, branch)
+        marker_ts = "2026-02-07T15:00:00+00:00"
+        marker_epoch = datetime.fromisoformat(marker_ts).timestamp()
+        _write_marker(repo, slug, {"timestamp": marker_ts, "session_id": "010-current"})
+
+        current = _session(repo, "010-current", branch=branch, log="ERROR current\n", mtime=marker_epoch - 3600)
+        ancient = _session(repo, "001-ancient", branch=None, log="ERROR ancient\n", mtime=marker_epoch - 90 * 86400)
+        other = _session(repo, "009-other", branch="feature/other", log="ERROR other branch\n")
+        recent = _session(repo, "008-legacy", branch=None, log="ERROR recent legacy\n")
+
+        events = repo / ".parallelus" / "subagents" / "sandboxes" / "a" / "subagent.exec_events.jsonl"
+        events.parent.mkdir(parents=True, exist_ok=True)
+        events.write_text(json.dumps({"msg": {"type": "exec_command_end", "exit_code": 1, "command": "false"}}) + "\n")
+        stale_events = events.parent.parent / "b" / "subagent.exec_events.jsonl"
+        stale_events.parent.mkdir(parents=True, exist_ok=True)
+        stale_events.write_text(json.dumps({"msg": {"type": "exec_command_end", "exit_code": 1, "command": "old"}}) + "\n")
+        os.utime(stale_events, (marker_epoch - 30 * 86400,) * 2)
+
+        report = _collect(repo, "--jobs", "2")
+        sources = {str(Path(source).resolve()) for source in report["sources"]}
+        assert sources == {str(p.resolve()) for p in (current, recent, events)}
+        assert report["skipped_sources"] == 3
+        assert report["warnings"] == []
+        assert [Path(item["source"]).resolve() for item in report["failures"]] == [
+            p.resolve() for p in (recent, current, events)
+        ]
+
+        everything = _collect(repo, "--all-sources", "--jobs", "1")
+        assert {str(Path(source).resolve()) for source in everything["sources"]} == {
+            str(p.resolve()) for p in (current, ancient, other, recent, events, stale_events)
+        }
+        assert everything["skipped_sources"] == 0
+
+
+def test_collect_failures_ledger_matches_cold_run_across_appends() -> None:
+    with tempfile.TemporaryDirectory(prefix="collect-failures-ledger-") as tmpdir:
+        repo = Path(tmpdir)
+        branch = "feature/ledger"
+        _init_repo(repo, branch)
+        _write_marker(repo, branch.replace("/", "-"), {"timestamp": "2026-02-07T15:00:00Z"})
+        console = _session(repo, "001-ledger", branch=branch, log="ERROR first\nfine\nTraceback partial")
+        events = repo / ".parallelus" / "guardrails" / "runs" / "r1" / "session.jsonl"
+        events.parent.mkdir(parents=True, exist_ok=True)
+        events.write_text(json.dumps({"msg": {"type": "exec_command_end", "exit_code": 1, "command": "a"}}) + "\n")
+
+        def strip_time(report: dict) -> dict:
+            return {key: value for key, value in report.items() if key != "generated_at"}
+
+        first = _collect(repo)
+        assert [item.get("excerpt") for item in first["failures"][:2]] == ["ERROR first", "Traceback partial"]
+        ledger = json.loads((repo / ".parallelus" / "cache" / "failures-ledger.json").read_text(encoding="utf-8"))
+        assert ledger["sources"][str(console)]["offset"] == len("ERROR first\nfine\n")
+
+        with console.open("a", encoding="utf-8") as fh:
+            fh.write(" now complete\nexit code 2\n")
+        with events.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"msg": {"type": "exec_command_end", "exit_code": 3, "command": "b"}}) + "\n")
+        assert strip_time(_collect(repo)) == strip_time(_collect(repo, "--no-ledger"))
+
+        console.write_text("ERROR rewritten\n", encoding="utf-8")
+        incremental = _collect(repo)
+        assert strip_time(incremental) == strip_time(_collect(repo, "--no-ledger"))
+        assert [item.get("excerpt") for item in incremental["failures"] if item["kind"] == "unstructured_log"] == [
+            "ERROR rewritten"
+        ]
+
+
+def test_text_log_scan_matches_per_line_semantics(tmp_path: Path) -> None:
+    log = tmp_path / "console.log"
+    log.write_bytes(
+        b"ok\nerrors everywhere\nstep ERROR: boom\r\n\xc3\xa9ERROR\nexit code\n3\n"
+        b"prefix\rTraceback (most recent call last):\nEX\xc4\xb0T CODE 4\nexit code 0\ntail error"
+    )
+    summary, warnings, entry = scan_source(log)
+    assert summary["count"] == 4
+    assert [item["excerpt"] for item in summary["clusters"].values()] == [
+        "step ERROR: boom",
+        "Traceback (most recent call last):",
+        "EX\u0130T CODE 4",
+        "tail error",
+    ]
+    assert warnings == []
+    assert entry["offset"] == log.stat().st_size - len(b"tail error")
+
+    log.write_bytes(b"ERR\xffOR split by junk\n")
+    assert [item["excerpt"] for item in scan_source(log)[0]["clusters"].values()] == ["ERROR split by junk"]
+
+
+def test_lines_spanning_many_chunks_are_scanned_whole(tmp_path: Path, monkeypatch) -> None:
+    import collect_failures
+
+    monkeypatch.setattr(collect_failures, "LEDGER_CHUNK", 64)
+    log = tmp_path / "console.log"
+    log.write_bytes(b"x" * 1000 + b" error: long\nok\n" + b"y" * 300 + b" error: tail")
+    summary, _, entry = scan_source(log)
+    assert summary["count"] == 2
+    assert entry["offset"] == 1000 + len(b" error: long\nok\n")
+    assert entry["count"] == 1
+
+
+def test_repeated_failures_collapse_into_bounded_clusters() -> None:
+    with tempfile.TemporaryDirectory(prefix="collect-failures-cluster-") as tmpdir:
+        repo = Path(tmpdir)
+        branch = "feature/cluster"
+        _init_repo(repo, branch)
+        _write_marker(repo, branch.replace("/", "-"), {"timestamp": "2026-02-07T15:00:00Z"})
+        events = repo / ".parallelus" / "guardrails" / "runs" / "r1" / "session.jsonl"
+        events.parent.mkdir(parents=True, exist_ok=True)
+        lines = []
+        for idx in range(300):
+            lines.append(
+                {
+                    "timestamp": f"2026-02-07T10:{idx // 60:02d}:{idx % 60:02d}Z",
+                    "msg": {
+                        "type": "exec_command_end",
+                        "exit_code": 1,
+                        "command": f"pytest --basetemp /tmp/pytest-{idx} -k flaky",
+                        "stderr": f"collected 12 items\nFAILED test_flaky.py::test_net - timeout after {idx}.5s",
+                    },
+                }
+            )
+        lines.append({"msg": {"type": "exec_command_end", "exit_code": 2, "command": "make lint", "stderr": "E501"}})
+        events.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+
+        report = _collect(repo, "--max-examples", "2")
+        assert report["failure_count"] == 301
+        flaky, lint = report["failures"]
+        assert flaky["count"] == 300
+        assert flaky["command"] == "pytest --basetemp /tmp/pytest-0 -k flaky"
+        assert flaky["normalized_command"] == "pytest --basetemp /tmp/<tmp> -k flaky"
+        assert flaky["signature"] == "FAILED test_flaky.py::test_net - timeout after <n>.<n>s"
+        assert flaky["first_seen"] == {"source": str(events), "position": 0, "timestamp": "2026-02-07T10:00:00Z"}
+        assert flaky["last_seen"]["position"] == 299
+        assert flaky["last_seen"]["timestamp"] == "2026-02-07T10:04:59Z"
+        assert len(flaky["examples"]) == 2
+        assert lint["count"] == 1
+        assert lint["exit_codes"] == [2]
+
+
+def test_merged_per_source_clusters_match_clustering_everything() -> None:
+    def failure(source: str, idx: int, command: str) -> dict:
+        return {"source": source, "kind": "exec_command_end", "exit_code": idx % 3 + 1, "command": command}
+
+    first = [failure("a", idx, f"pytest -k t{idx % 2}") for idx in range(5)]
+    second = [failure("b", idx, f"pytest -k t{idx % 3}") for idx in range(7)]
+    merged = {item["fingerprint"]: item for item in cluster_failures(first, max_examples=2)}
+    later = {item["fingerprint"]: item for item in cluster_failures(second, max_examples=2)}
+    merge_clusters(merged, later, len(first), 2)
+    assert list(merged.values()) == cluster_failures(first + second, max_examples=2)
+
+
+def test_retro_audit_streams_failures_file_and_checks_count() -> None:
+    with tempfile.TemporaryDirectory(prefix="collect-failures-stream-") as tmpdir:
+        repo = Path(tmpdir)
+        branch = "feature/stream"
+        slug = branch.replace("/", "-")
+        _init_repo(repo, branch)
+        head = _run(["git", "rev-parse", "HEAD"], cwd=repo).stdout.strip()
+        _write_marker(repo, slug, {"timestamp": "2026-02-07T15:00:00Z", "head": head})
+        _session(repo, "001-stream", branch=branch, log="ERROR one\nTraceback two\n")
+
+        summary = _collect(repo)
+        assert summary["failure_count"] == 2
+        audit = _run([str(repo / "parallelus/engine" / "bin" / "retro_audit_local.py")], cwd=repo)
+        assert audit.returncode == 0, audit.stderr
+        report_path = repo / audit.stdout.strip().split("wrote ", 1)[-1]
+        report = json.loads(report_path.read_text(encoding="utf-8"))
+        assert len(report["issues"]) == 2
+
+        stream = repo / "docs" / "parallelus" / "self-improvement" / "failures" / summary["failures_file"]
+        stream.write_text(stream.read_text(encoding="utf-8").splitlines()[0] + "\n", encoding="utf-8")
+        audit = _run([str(repo / "parallelus/engine" / "bin" / "retro_audit_local.py")], cwd=repo)
+        assert audit.returncode != 0
+        assert "summary expects 2" in audit.stderr
+
+
+def test_failures_stream_temp_file_is_per_process_and_cleaned_up(tmp_path: Path) -> None:
+    path = tmp_path / "summary.failures.jsonl"
+    # A leftover temp from another writer must not be clobbered or picked up.
+    foreign = tmp_path / f"{path.name}.tmp"
+    foreign.write_text("other\n", encoding="utf-8")
+    assert write_failures_stream(path, [{"a": 1}, {"b": 2}]) == 2
+    assert [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()] == [{"a": 1}, {"b": 2}]
+    assert foreign.read_text(encoding="utf-8") == "other\n"
+
+    def broken():
+        yield {"c": 3}
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        write_failures_stream(path, broken())
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([path.name, foreign.name])
+    assert path.read_text(encoding="utf-8").count("\n") == 2
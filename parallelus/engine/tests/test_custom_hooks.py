@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import os
 import shutil
 import subprocess
@@ -219,3 +220,37 @@ hooks:
         )
         assert missing_result.returncode == 0, missing_result.stderr
         assert "[custom-hook:" not in missing_result.stderr
+
+
+def test_turn_end_marker_records_head_after_pre_turn_end_hook_commits() -> None:
+    with tempfile.TemporaryDirectory(prefix="custom-hooks-commit-") as tmpdir:
+        repo = Path(tmpdir)
+        branch = "feature/hook-commit"
+        slug = branch.replace("/", "-")
+        _init_repo(repo, branch=branch)
+        _write_hook(
+            repo,
+            "pre_turn_end",
+            'echo hook > "$PARALLELUS_REPO_ROOT/hook.txt"\n'
+            'git -C "$PARALLELUS_REPO_ROOT" add hook.txt\n'
+            'git -C "$PARALLELUS_REPO_ROOT" commit -q -m "hook commit"',
+        )
+
+        start_result = _run([str(repo / "parallelus" / "engine" / "bin" / "agents-session-start")], cwd=repo)
+        assert start_result.returncode == 0, start_result.stderr
+        session_id = _parse_export(start_result.stdout, "SESSION_ID")
+        session_dir = Path(_parse_export(start_result.stdout, "SESSION_DIR"))
+        (session_dir / "console.log").write_text("commit test\n", encoding="utf-8")
+        head_before = _run(["git", "rev-parse", "HEAD"], cwd=repo).stdout.strip()
+
+        turn_result = _run(
+            [str(repo / "parallelus" / "engine" / "bin" / "agents-turn-end"), "hook commit checkpoint"],
+            cwd=repo,
+            env={"SESSION_ID": session_id, "AGENTS_RETRO_SKIP_VALIDATE": "1"},
+        )
+        assert turn_result.returncode == 0, turn_result.stderr
+        head_after = _run(["git", "rev-parse", "HEAD"], cwd=repo).stdout.strip()
+        assert head_after != head_before
+
+        (marker_path,) = repo.glob(f"**/markers/{slug}.json")
+        assert json.loads(marker_path.read_text(encoding="utf-8"))["head"] == head_after
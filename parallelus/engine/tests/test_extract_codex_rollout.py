@@ -0,0 +1,286 @@
+"""Regression tests for Codex rollout lookup and extraction."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BIN_DIR = REPO_ROOT / "parallelus/engine" / "bin"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+import extract_codex_rollout as rollout_extractor  # noqa: E402
+
+NONCE_A = "3e655d20-b117-42c9-94b3-7e4341dbb6d3"
+NONCE_B = "9b1f2c44-7a0e-4d3b-8c5a-1f2e3d4c5b6a"
+SESSION_ID = "0199aa00-1111-7222-8333-444455556666"
+
+
+def _write_rollout(path: Path, *lines: dict) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+    return path
+
+
+def _message(text: str) -> dict:
+    return {"type": "response_item", "payload": {"type": "message", "content": [{"type": "input_text", "text": text}]}}
+
+
+def test_indexed_lookup_only_rescans_changed_rollouts(tmp_path, monkeypatch) -> None:
+    sessions = tmp_path / "sessions"
+    index_path = tmp_path / "index.json"
+    first = _write_rollout(
+        sessions / "2026" / "02" / "01" / "rollout-a.jsonl",
+        {"type": "session_meta", "payload": {"id": SESSION_ID}},
+        _message(f"nonce {NONCE_A}"),
+    )
+    second = _write_rollout(sessions / "2026" / "02" / "02" / "rollout-b.jsonl", _message("no nonce here"))
+
+    assert rollout_extractor.find_rollouts_indexed(sessions, NONCE_A, index_path) == [first]
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    assert index["files"][str(first)]["session_id"] == SESSION_ID
+
+    scanned: list[tuple[Path, int]] = []
+    real_scan = rollout_extractor.scan_rollout_ids
+
+    def recording_scan(path: Path, start: int = 0):
+        scanned.append((path, start))
+        return real_scan(path, start)
+
+    monkeypatch.setattr(rollout_extractor, "scan_rollout_ids", recording_scan)
+    size_before = second.stat().st_size
+    with second.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(_message(f"late {NONCE_B}")) + "\n")
+
+    assert rollout_extractor.find_rollouts_indexed(sessions, NONCE_B, index_path) == [second]
+    assert scanned == [(second, size_before)]
+    assert rollout_extractor.find_rollouts_indexed(sessions, SESSION_ID.upper(), index_path) == [first]
+    assert len(scanned) == 1
+
+
+def test_newest_first_search_stops_at_most_recent_match(tmp_path, monkeypatch) -> None:
+    sessions = tmp_path / "sessions"
+    older = _write_rollout(sessions / "2026" / "01" / "rollout-old.jsonl", _message(f"first {NONCE_A}"))
+    newer = _write_rollout(sessions / "2026" / "02" / "rollout-new.jsonl", _message(f"retry {NONCE_A}"))
+    _write_rollout(sessions / "2026" / "03" / "rollout-other.jsonl", _message("unrelated"))
+    (sessions / "2026" / "03" / "rollout-empty.jsonl").write_bytes(b"")
+    os.utime(older, (1_000_000, 1_000_000))
+    os.utime(newer, (2_000_000, 2_000_000))
+
+    opened: list[str] = []
+    real_open = Path.open
+
+    def recording_open(self, *args, **kwargs):
+        opened.append(self.name)
+        return real_open(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "open", recording_open)
+    assert rollout_extractor.find_newest_rollout(sessions, NONCE_A) == newer
+    assert "rollout-old.jsonl" not in opened
+    assert rollout_extractor.find_newest_rollout(sessions, NONCE_B) is None
+
+
+def test_markdown_is_rendered_while_events_stream(tmp_path) -> None:
+    consumed: list[int] = []
+
+    def events():
+        for idx in range(3):
+            consumed.append(idx)
+            yield {"type": "agent_message", "message": f"step {idx} password=hunter2"}
+
+    lines = rollout_extractor.iter_markdown_lines(events(), tmp_path / "rollout-x.jsonl")
+    for line in lines:
+        if line.startswith("- [message]"):
+            break
+    assert consumed == [0]
+
+    rest = list(lines)
+    assert consumed == [0, 1, 2]
+    assert rest[-1] == "- Events: 3"
+    assert "  step 2 password=[REDACTED]" in rest
+
+
+def test_batch_extraction_resolves_all_nonces_in_one_invocation(tmp_path) -> None:
+    sessions = tmp_path / "sessions"
+    nonce_c = "c0ffee00-0000-4000-8000-000000000001"
+    missing = "deadbeef-0000-4000-8000-000000000002"
+    _write_rollout(sessions / "a" / "rollout-a.jsonl", _message(f"run {NONCE_A} token=abc"))
+    _write_rollout(sessions / "b" / "rollout-b.jsonl", _message(f"run {NONCE_B}"), _message(f"also {nonce_c}"))
+    nonce_file = tmp_path / "nonces.txt"
+    nonce_file.write_text(f"# scenarios\n{NONCE_B}\n{nonce_c}\n{missing}\n", encoding="utf-8")
+    out_dir = tmp_path / "out"
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            str(BIN_DIR / "extract_codex_rollout.py"),
+            "--sessions-root",
+            str(sessions),
+            "--index-path",
+            str(tmp_path / "index.json"),
+            "--output-dir",
+            str(out_dir),
+            "--nonce",
+            NONCE_A,
+            "--nonce-file",
+            str(nonce_file),
+        ],
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+    assert result.returncode == 1, result.stderr
+    assert f"no rollout files contained nonce {missing}" in result.stderr
+
+    rows = [line.split("\t") for line in result.stdout.splitlines()]
+    assert [row[0] for row in rows] == [NONCE_A, NONCE_B, nonce_c]
+    assert rows[1][1:] == rows[2][1:]
+    assert Path(rows[0][1]).name == "codex-rollout-rollout-a.jsonl"
+    assert "token=[REDACTED]" in Path(rows[0][1]).read_text(encoding="utf-8")
+    assert Path(rows[1][2]).read_text(encoding="utf-8").rstrip().endswith("- Events: 2")
+
+
+def test_incremental_extraction_appends_only_new_events(tmp_path, monkeypatch) -> None:
+    rollout = _write_rollout(tmp_path / "rollout-live.jsonl", _message("first"), _message("second"))
+    out_jsonl = tmp_path / "out.jsonl"
+    out_md = tmp_path / "out.md"
+    rollout_extractor.extract_rollout(rollout, out_jsonl, out_md, incremental=True)
+
+    with rollout.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(_message("third password=hunter2")) + "\n")
+        fh.write('{"type": "response_item", "payl')
+
+    rendered: list[dict] = []
+    real_render = rollout_extractor.render_event
+
+    def recording_render(ev):
+        rendered.append(ev)
+        return real_render(ev)
+
+    monkeypatch.setattr(rollout_extractor, "render_event", recording_render)
+    rollout_extractor.extract_rollout(rollout, out_jsonl, out_md, incremental=True)
+    assert len(rendered) == 1
+
+    cold_jsonl = tmp_path / "cold.jsonl"
+    cold_md = tmp_path / "cold.md"
+    complete = rollout.read_bytes().rsplit(b"\n", 1)[0] + b"\n"
+    cold_source = tmp_path / "cold-source" / rollout.name
+    cold_source.parent.mkdir()
+    cold_source.write_bytes(complete)
+    rollout_extractor.extract_rollout(cold_source, cold_jsonl, cold_md)
+    assert out_jsonl.read_text(encoding="utf-8") == cold_jsonl.read_text(encoding="utf-8")
+    assert out_md.read_text(encoding="utf-8").replace(str(rollout), str(cold_source)) == cold_md.read_text(
+        encoding="utf-8"
+    )
+    assert out_md.read_text(encoding="utf-8").endswith("- Events: 3\n")
+
+    # Rewriting history invalidates the prefix hash and forces a full re-extraction.
+    _write_rollout(rollout, _message("rewritten"))
+    rendered.clear()
+    rollout_extractor.extract_rollout(rollout, out_jsonl, out_md, incremental=True)
+    assert len(rendered) == 1
+    assert "rewritten" in out_md.read_text(encoding="utf-8")
+    assert "second" not in out_md.read_text(encoding="utf-8")
+
+
+def test_clean_lines_are_copied_verbatim_and_dirty_lines_redacted(tmp_path) -> None:
+    clean = '{"type":"response_item",  "payload":{"text":"café ran 12 checks"}}'
+    dirty = '{"type":"response_item","payload":{"text":"export GH=ghp_' + "a" * 36 + '"}}'
+    rollout = tmp_path / "rollout-mixed.jsonl"
+    rollout.write_text(clean + "\n" + dirty + "\n", encoding="utf-8")
+
+    out_jsonl = tmp_path / "out.jsonl"
+    rollout_extractor.extract_rollout(rollout, out_jsonl, tmp_path / "out.md")
+    written = out_jsonl.read_text(encoding="utf-8").splitlines()
+    assert written[0] == clean
+    assert json.loads(written[1])["payload"]["text"] == "export GH=[REDACTED_GH_TOKEN]"
+
+
+def test_raw_lines_are_screened_before_they_are_decoded(tmp_path, monkeypatch) -> None:
+    clean = '{"type":"response_item","payload":{"text":"truncated'
+    dirty = '{"type":"response_item","payload":{"text":"export GH=ghp_' + "a" * 36
+    rollout = tmp_path / "rollout-partial.jsonl"
+    rollout.write_text(clean + "\n" + dirty + "\n", encoding="utf-8")
+
+    screened: list[str] = []
+    real_may_contain_secret = rollout_extractor.may_contain_secret
+    real_loads = rollout_extractor.loads
+
+    def may_contain_secret(text):
+        screened.append(text)
+        return real_may_contain_secret(text)
+
+    def loads(text):
+        assert text in screened, "line decoded before the trigger screen"
+        return real_loads(text)
+
+    monkeypatch.setattr(rollout_extractor, "may_contain_secret", may_contain_secret)
+    monkeypatch.setattr(rollout_extractor, "loads", loads)
+    out_jsonl = tmp_path / "out.jsonl"
+    rollout_extractor.extract_rollout(rollout, out_jsonl, tmp_path / "out.md")
+    written = out_jsonl.read_text(encoding="utf-8").splitlines()
+    assert written == [clean, dirty.replace("ghp_" + "a" * 36, "[REDACTED_GH_TOKEN]")]
+    assert "- Events: 0" in (tmp_path / "out.md").read_text(encoding="utf-8")
+
+
+def _realistic_rollout(turns: int) -> list[dict]:
+    """A Codex rollout shaped like real sessions: token_count events, API paths, tool calls."""
+    events: list[dict] = [
+        {"type": "session_meta", "payload": {"id": SESSION_ID, "cwd": "/repo", "cli_version": "0.46.0"}},
+        {
+            "type": "turn_context",
+            "payload": {"cwd": "/repo", "approval_policy": "on-request", "model": "gpt-5-codex", "summary": "auto"},
+        },
+    ]
+    usage = {"input_tokens": 0, "cached_input_tokens": 0, "output_tokens": 0, "reasoning_output_tokens": 0}
+    for turn in range(turns):
+        shell = {"command": ["bash", "-lc", f"rg -n 'refresh_token' src/api/v{turn}"], "workdir": "/repo"}
+        output = {
+            "output": f"src/api/v{turn}/client.py:42:    def refresh_token(self):\nGET /api/v1/tokens 200",
+            "metadata": {"exit_code": 0, "duration_seconds": 0.2},
+        }
+        for key in usage:
+            usage[key] += 1000 + turn
+        events += [
+            {"type": "event_msg", "payload": {"type": "user_message", "message": "Fix the API client's token refresh"}},
+            _message(f"Fix the API client's token refresh in src/api/v{turn}/client.py"),
+            {"type": "response_item", "payload": {"type": "reasoning", "summary": [{"type": "summary_text", "text": "Checking how input_tokens and the secret store interact"}]}},
+            {"type": "response_item", "payload": {"type": "function_call", "name": "shell", "arguments": json.dumps(shell), "call_id": f"call_{turn}"}},
+            {"type": "response_item", "payload": {"type": "function_call_output", "call_id": f"call_{turn}", "output": json.dumps(output)}},
+            {
+                "type": "event_msg",
+                "payload": {
+                    "type": "token_count",
+                    "info": {"total_token_usage": dict(usage), "last_token_usage": dict(usage), "model_context_window": 272000},
+                },
+            },
+            {"type": "event_msg", "payload": {"type": "agent_message", "message": "Updated the API token refresh; tests pass."}},
+        ]
+    return events
+
+
+def test_realistic_rollout_lines_mostly_take_the_verbatim_fast_path(tmp_path, monkeypatch) -> None:
+    events = _realistic_rollout(20)
+    secrets = [
+        _message("export OPENAI_API_KEY=sk-" + "q" * 32),
+        _message("curl -H 'Authorization: Bearer abc.def' https://api.example.com"),
+        _message("config token: hunter2"),
+    ]
+    rollout = _write_rollout(tmp_path / "rollout-real.jsonl", *events, *secrets)
+
+    redacted: list = []
+    real_redact_obj = rollout_extractor.redact_obj
+    monkeypatch.setattr(rollout_extractor, "redact_obj", lambda obj: redacted.append(obj) or real_redact_obj(obj))
+    out_jsonl = tmp_path / "out.jsonl"
+    rollout_extractor.extract_rollout(rollout, out_jsonl, tmp_path / "out.md")
+
+    total = len(events) + len(secrets)
+    fast_path_rate = (total - len(redacted)) / total
+    assert len(redacted) == len(secrets)
+    assert fast_path_rate > 0.97
+    written = out_jsonl.read_text(encoding="utf-8")
+    assert "hunter2" not in written and "abc.def" not in written and "sk-qqq" not in written
@@ -0,0 +1,121 @@
+"""Regression tests for the failures query index."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BIN_DIR = REPO_ROOT / "parallelus/engine" / "bin"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+import failures_query  # noqa: E402
+
+
+def _failures_dir(repo: Path) -> Path:
+    path = repo / "docs" / "parallelus" / "self-improvement" / "failures"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _write_summary(repo: Path, branch: str, marker_ts: str, clusters: list[dict]) -> Path:
+    name = f"{branch.replace('/', '-')}--{marker_ts}"
+    summary_path = _failures_dir(repo) / f"{name}.json"
+    stream_name = f"{name}.failures.jsonl"
+    (summary_path.parent / stream_name).write_text(
+        "".join(json.dumps(cluster) + "\n" for cluster in clusters), encoding="utf-8"
+    )
+    summary = {
+        "branch": branch,
+        "marker_timestamp": marker_ts,
+        "failures_file": stream_name,
+        "failure_count": sum(cluster["count"] for cluster in clusters),
+        "cluster_count": len(clusters),
+        "warnings": [],
+    }
+    summary_path.write_text(json.dumps(summary) + "\n", encoding="utf-8")
+    return summary_path
+
+
+def _cluster(command: str, count: int) -> dict:
+    return {
+        "kind": "exec_command_end",
+        "fingerprint": f"fp-{command}",
+        "normalized_command": command,
+        "signature": "boom",
+        "count": count,
+    }
+
+
+def test_index_refreshes_incrementally_and_aggregates(tmp_path: Path) -> None:
+    repo = tmp_path
+    _write_summary(repo, "feature/a", "2026-02-01T10:00:00+00:00", [_cluster("pytest -q", 3), _cluster("make lint", 1)])
+    _write_summary(repo, "feature/a", "2026-02-02T10:00:00+00:00", [])
+    b_path = _write_summary(repo, "feature/b", "2026-02-02T11:00:00Z", [_cluster("pytest -q", 2)])
+    legacy = _failures_dir(repo) / "feature-c--2026-02-03T09:00:00Z.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "branch": "feature/c",
+                "marker_timestamp": "2026-02-03T09:00:00Z",
+                "failures": [{"kind": "exec_command_end", "command": "pytest   -q", "exit_code": 1}],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    index_path = tmp_path / "index.sqlite"
+    conn = failures_query.connect(index_path)
+    assert failures_query.refresh_index(conn, repo)["added"] == 4
+
+    top = failures_query.query_top_commands(conn)
+    assert (top[0]["command"], top[0]["failures"], top[0]["branches"]) == ("pytest -q", 6, 3)
+    branches = {row["branch"]: row for row in failures_query.query_branches(conn)}
+    assert branches["feature/a"]["reports"] == 2
+    assert branches["feature/a"]["failure_rate"] == 0.5
+    assert branches["feature/a"]["failures"] == 4
+    trend = failures_query.query_trend(conn, by="day", command="pytest")
+    assert [(row["period"], row["failures"]) for row in trend] == [
+        ("2026-02-01", 3),
+        ("2026-02-02", 2),
+        ("2026-02-03", 1),
+    ]
+
+    assert failures_query.refresh_index(conn, repo)["unchanged"] == 4
+    _write_summary(repo, "feature/b", "2026-02-02T11:00:00Z", [_cluster("pytest -q", 5)])
+    os.utime(b_path, ns=(1, 1))
+    legacy.unlink()
+    stats = failures_query.refresh_index(conn, repo)
+    assert (stats["updated"], stats["removed"], stats["unchanged"]) == (1, 1, 2)
+    assert failures_query.query_top_commands(conn, limit=1)[0]["failures"] == 8
+    conn.close()
+
+    conn = sqlite3.connect(index_path)
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+    conn = failures_query.connect(index_path)
+    assert conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0] == 0
+    conn.close()
+
+
+def test_summary_that_becomes_unreadable_drops_its_rows(tmp_path: Path) -> None:
+    repo = tmp_path
+    _write_summary(repo, "feature/a", "2026-02-01T10:00:00Z", [_cluster("pytest -q", 3)])
+    b_path = _write_summary(repo, "feature/b", "2026-02-02T10:00:00Z", [_cluster("pytest -q", 2)])
+    conn = failures_query.connect(tmp_path / "index.sqlite")
+    assert failures_query.refresh_index(conn, repo)["added"] == 2
+
+    b_path.write_text("[]\n", encoding="utf-8")
+    assert failures_query.refresh_index(conn, repo)["unreadable"] == 1
+    assert failures_query.query_top_commands(conn)[0]["failures"] == 3
+    assert [row["branch"] for row in failures_query.query_branches(conn)] == ["feature/a"]
+
+    b_path.write_text("{not json", encoding="utf-8")
+    assert failures_query.refresh_index(conn, repo)["unreadable"] == 1
+    assert failures_query.query_top_commands(conn)[0]["failures"] == 3
+    conn.close()
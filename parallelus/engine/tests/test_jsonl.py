@@ -0,0 +1,46 @@
+"""Regression tests for the shared JSONL decoding helpers."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BIN_DIR = REPO_ROOT / "parallelus/engine" / "bin"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+from parallelus_jsonl import available_backends, get_decoder, iter_jsonl  # noqa: E402
+
+
+def test_every_backend_decodes_like_stdlib() -> None:
+    samples = [b'{"a": [1, 2.5, "caf\\u00e9"], "b": null}', '{"n": NaN}', b'{"i": -9007199254740993}']
+    _, reference = get_decoder("stdlib")
+    for name in available_backends():
+        backend, loads = get_decoder(name)
+        assert backend == name
+        for sample in samples:
+            assert repr(loads(sample)) == repr(reference(sample))
+
+
+def test_iter_jsonl_skips_blank_and_malformed_lines(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    path.write_bytes(b'{"i": 1}\n\n{not json\n{"i": 2}\n{"i": 3')
+    assert [event["i"] for event in iter_jsonl(path) if "i" in event] == [1, 2]
+    assert list(iter_jsonl(tmp_path / "missing.jsonl")) == []
+
+
+def test_unknown_or_missing_backend_warns_and_falls_back() -> None:
+    for requested in ("simdjson", "orjson" if "orjson" not in available_backends() else "bogus"):
+        result = subprocess.run(
+            [sys.executable, "-c", "import parallelus_jsonl as j; print(j.BACKEND, j.loads(b'[1]'))"],
+            cwd=BIN_DIR,
+            env={"PARALLELUS_JSON_BACKEND": requested, "PATH": ""},
+            text=True,
+            capture_output=True,
+            check=False,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split()[0] == available_backends()[0]
+        assert f"JSON backend {requested!r}" in result.stderr
@@ -0,0 +1,90 @@
+"""Regression tests for the shared repository context helper."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BIN_DIR = REPO_ROOT / "parallelus/engine" / "bin"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+import parallelus_repo_context  # noqa: E402
+from parallelus_repo_context import ENV_VAR, repo_context  # noqa: E402
+
+
+def _git(*args: str, cwd: Path) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, text=True, capture_output=True, check=True).stdout.strip()
+
+
+@pytest.fixture()
+def repo(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "repo"
+    root.mkdir()
+    _git("init", "-q", "-b", "feature/ctx", cwd=root)
+    monkeypatch.chdir(root)
+    monkeypatch.delenv(ENV_VAR, raising=False)
+    repo_context.cache_clear()
+    yield root.resolve()
+    repo_context.cache_clear()
+
+
+def test_repo_context_resolves_unborn_then_committed_branch(repo: Path) -> None:
+    context = repo_context()
+    assert (context.root, context.head, context.branch) == (repo, None, "feature/ctx")
+
+    _git("-c", "user.name=ctx", "-c", "user.email=ctx@example.com", "commit", "-q", "--allow-empty", "-m", "init", cwd=repo)
+    repo_context.cache_clear()
+    context = repo_context()
+    assert context.head == _git("rev-parse", "HEAD", cwd=repo)
+    assert context.branch == "feature/ctx"
+
+
+def test_snapshot_is_reused_only_in_the_directory_it_was_taken(repo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(parallelus_repo_context.subprocess, "run", None)
+    snapshot = parallelus_repo_context.RepoContext(repo, "abc123", "feature/snap").snapshot()
+    monkeypatch.setenv(ENV_VAR, snapshot)
+    assert repo_context() == (repo, "abc123", "feature/snap")
+
+    monkeypatch.undo()
+    nested = repo / "nested"
+    nested.mkdir()
+    monkeypatch.chdir(nested)
+    monkeypatch.setenv(ENV_VAR, snapshot)
+    repo_context.cache_clear()
+    assert repo_context().branch == "feature/ctx"
+
+
+def test_pipeline_scripts_skip_git_when_given_a_snapshot(tmp_path: Path) -> None:
+    repo = tmp_path / "pipeline"
+    shutil.copytree(REPO_ROOT / "parallelus/engine", repo / "parallelus/engine")
+    for name in ("PLAN.md", "PROGRESS.md"):
+        path = repo / "docs" / "branches" / "feature-ctx" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {name}\n", encoding="utf-8")
+    _git("init", "-q", "-b", "feature/ctx", cwd=repo)
+    _git("add", ".", cwd=repo)
+    _git("-c", "user.name=ctx", "-c", "user.email=ctx@example.com", "commit", "-q", "-m", "init", cwd=repo)
+
+    shim_dir = tmp_path / "shim"
+    shim_dir.mkdir()
+    log = tmp_path / "git.log"
+    shim = shim_dir / "git"
+    shim.write_text(f'#!/bin/sh\necho "$*" >> "{log}"\nexec "{shutil.which("git")}" "$@"\n', encoding="utf-8")
+    shim.chmod(0o755)
+    facts = _git("rev-parse", "--show-toplevel", "HEAD", "--abbrev-ref", "HEAD", cwd=repo)
+    env = dict(os.environ, PATH=f"{shim_dir}{os.pathsep}{os.environ['PATH']}")
+    env[ENV_VAR] = f"{facts}\n{repo}"
+
+    for script in ("retro-marker", "collect_failures.py", "retro_audit_local.py", "verify-retrospective"):
+        result = subprocess.run(
+            [str(repo / "parallelus/engine/bin" / script)], cwd=repo, env=env, text=True, capture_output=True, check=False
+        )
+        assert result.returncode == 0, (script, result.stderr)
+    assert not log.exists()
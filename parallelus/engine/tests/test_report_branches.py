@@ -0,0 +1,275 @@
+"""Regression tests for the branch/PR snapshot printed by read_bootstrap."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BIN_DIR = REPO_ROOT / "parallelus/engine" / "bin"
+SCRIPT = BIN_DIR / "report_branches.py"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+import report_branches  # noqa: E402
+
+
+def _git(*args: str, cwd: Path) -> None:
+    subprocess.run(["git", *args], cwd=cwd, text=True, capture_output=True, check=True)
+
+
+def _init_repo(repo: Path) -> None:
+    repo.mkdir()
+    _git("init", "-q", "-b", "main", cwd=repo)
+    _git("config", "user.name", "Report Branches", cwd=repo)
+    _git("config", "user.email", "report.branches@example.com", cwd=repo)
+    _git("commit", "-q", "--allow-empty", "-m", "init", cwd=repo)
+    for branch in ("feature/one", "feature/two"):
+        _git("checkout", "-q", "-b", branch, "main", cwd=repo)
+        _git("commit", "-q", "--allow-empty", "-m", branch, cwd=repo)
+    _git("checkout", "-q", "main", cwd=repo)
+
+
+def _shims(tmp: Path, *, git_delay: float, gh_delay: float) -> dict[str, str]:
+    shim_dir = tmp / "shim"
+    shim_dir.mkdir()
+    prs = [{"number": 7, "title": "One", "headRefName": "feature/one", "state": "OPEN", "createdAt": "2026-02-01"}]
+    (shim_dir / "gh").write_text(f"#!/bin/sh\nsleep {gh_delay}\necho '{json.dumps(prs)}'\n", encoding="utf-8")
+    (shim_dir / "git").write_text(f'#!/bin/sh\nsleep {git_delay}\nexec "{shutil.which("git")}" "$@"\n', encoding="utf-8")
+    for shim in shim_dir.iterdir():
+        shim.chmod(0o755)
+    return {"PATH": f"{shim_dir}{os.pathsep}{os.environ['PATH']}"}
+
+
+def _set_gh(tmp: Path, script: str) -> None:
+    gh = tmp / "shim" / "gh"
+    gh.write_text(f"#!/bin/sh\n{script}\n", encoding="utf-8")
+    gh.chmod(0o755)
+
+
+def _report(repo: Path, env: dict[str, str], *args: str) -> tuple[subprocess.CompletedProcess[str], float]:
+    start = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), *args],
+        cwd=repo,
+        env={**os.environ, **env},
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+    return result, time.monotonic() - start
+
+
+def test_queries_run_concurrently(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    env = _shims(tmp_path, git_delay=0.4, gh_delay=1.5)
+    result, elapsed = _report(repo, env)
+    assert result.returncode == 0, result.stderr
+    assert "#7 – One" in result.stdout
+    assert "feature/two" in result.stdout
+    # Sequentially this is >= 1.5s of gh plus eight git calls at 0.4s each; the
+    # longest dependent chain (base detection, for-each-ref and, before git
+    # 2.41, the ahead/behind walk) is five.
+    assert elapsed < 3.2
+
+
+def test_slow_gh_times_out_without_blocking_the_report(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    env = _shims(tmp_path, git_delay=0, gh_delay=10)
+    env["REPORT_BRANCHES_GH_TIMEOUT"] = "0.5"
+    result, elapsed = _report(repo, env)
+    assert result.returncode == 0, result.stderr
+    assert elapsed < 5
+    assert "feature/one" in result.stdout
+    assert "#7" not in result.stdout
+    assert "gh pr list timed out after 0.5s" in result.stderr
+
+
+def test_outside_a_repository_reports_no_branches(tmp_path: Path) -> None:
+    env = _shims(tmp_path, git_delay=0, gh_delay=0)
+    result, _ = _report(tmp_path, {**env, "GIT_CEILING_DIRECTORIES": str(tmp_path.parent)})
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "No branches with unmerged commits relative to main."
+
+
+def test_base_ref_probes_do_not_need_spare_pool_workers(tmp_path: Path, monkeypatch) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    monkeypatch.chdir(repo)
+    # The caller is not a pool worker, so even a single worker cannot deadlock.
+    with report_branches.ThreadPoolExecutor(max_workers=1) as pool:
+        assert report_branches.resolve_base_ref("origin", pool) == ("main", "main")
+
+
+def _cache(repo: Path) -> dict:
+    return json.loads((repo / ".parallelus" / "cache" / "pr-metadata.json").read_text(encoding="utf-8"))
+
+
+def test_pr_cache_is_served_while_gh_is_unavailable(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    env = _shims(tmp_path, git_delay=0, gh_delay=0)
+    result, _ = _report(repo, env)
+    assert result.returncode == 0, result.stderr
+    assert list(_cache(repo)["remotes"]) == ["origin"]
+
+    _set_gh(tmp_path, "sleep 10")
+    result, elapsed = _report(repo, env)
+    assert result.returncode == 0, result.stderr
+    assert elapsed < 5
+    assert "#7 – One" in result.stdout
+    assert "stale" not in result.stdout
+
+    env["REPORT_BRANCHES_GH_TIMEOUT"] = "0.5"
+    result, _ = _report(repo, env, "--refresh-prs")
+    assert result.returncode == 0, result.stderr
+    assert "#7 – One" in result.stdout
+    assert "PR data is stale" in result.stdout
+    assert "gh pr list failed" in result.stdout
+
+
+def test_stale_pr_cache_refreshes_in_background(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    env = _shims(tmp_path, git_delay=0, gh_delay=0)
+    assert _report(repo, env)[0].returncode == 0
+    fetched_at = _cache(repo)["remotes"]["origin"]["fetched_at"]
+
+    prs = [{"number": 8, "title": "Two", "headRefName": "feature/two", "state": "OPEN", "createdAt": "2026-02-02"}]
+    _set_gh(tmp_path, f"echo '{json.dumps(prs)}'")
+    env["REPORT_BRANCHES_PR_TTL"] = "0"
+    result, _ = _report(repo, env)
+    assert result.returncode == 0, result.stderr
+    assert "#7 – One" in result.stdout
+    assert "refreshing in the background" in result.stdout
+
+    deadline = time.monotonic() + 10
+    while _cache(repo)["remotes"]["origin"]["fetched_at"] == fetched_at and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _cache(repo)["remotes"]["origin"]["prs"] == prs
+
+    result, _ = _report(repo, env, "--pr-ttl", "3600")
+    assert "#8 – Two" in result.stdout
+    assert "stale" not in result.stdout
+
+
+def test_stale_pr_cache_note_is_shown_without_branches(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    env = _shims(tmp_path, git_delay=0, gh_delay=0)
+    assert _report(repo, env)[0].returncode == 0
+    fetched_at = _cache(repo)["remotes"]["origin"]["fetched_at"]
+    _git("branch", "-q", "-D", "feature/one", "feature/two", cwd=repo)
+
+    env["REPORT_BRANCHES_PR_TTL"] = "0"
+    result, _ = _report(repo, env)
+    assert result.returncode == 0, result.stderr
+    assert "No branches with unmerged commits relative to main." in result.stdout
+    assert "refreshing in the background" in result.stdout
+
+    deadline = time.monotonic() + 10
+    while _cache(repo)["remotes"]["origin"]["fetched_at"] == fetched_at and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def test_cancelled_background_refresh_leaves_cache_and_lock_clean(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    env = _shims(tmp_path, git_delay=0, gh_delay=0)
+    assert _report(repo, env)[0].returncode == 0
+    cache_dir = repo / ".parallelus" / "cache"
+    before = (cache_dir / "pr-metadata.json").read_bytes()
+
+    _set_gh(tmp_path, "sleep 10")
+    (cache_dir / "pr-metadata.json.refresh").touch()
+    proc = subprocess.Popen(
+        [sys.executable, str(SCRIPT), "--update-pr-cache"], cwd=repo, env={**os.environ, **env}
+    )
+    time.sleep(0.5)
+    proc.terminate()
+    assert proc.wait(timeout=10) == 128 + 15
+    assert (cache_dir / "pr-metadata.json").read_bytes() == before
+    assert sorted(path.name for path in cache_dir.iterdir()) == ["pr-metadata.json"]
+
+
+def test_refresh_prs_bypasses_the_cache(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    env = _shims(tmp_path, git_delay=0, gh_delay=0)
+    assert _report(repo, env)[0].returncode == 0
+    _set_gh(tmp_path, "echo '[]'")
+    assert "#7 – One" in _report(repo, env)[0].stdout
+    result, _ = _report(repo, env, "--refresh-prs")
+    assert "#7" not in result.stdout
+    assert _cache(repo)["remotes"]["origin"]["prs"] == []
+
+
+def _rev_list_counts(repo: Path, branch: str) -> tuple[int, int]:
+    out = subprocess.run(
+        ["git", "rev-list", "--left-right", "--count", f"{branch}...main"],
+        cwd=repo,
+        text=True,
+        capture_output=True,
+        check=True,
+    ).stdout.split()
+    return int(out[0]), int(out[1])
+
+
+def test_ahead_behind_matches_rev_list_counts(tmp_path: Path, monkeypatch) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    # feature/one merged into a side branch, main moving on with a merge of its own,
+    # and a branch with unrelated history.
+    _git("checkout", "-q", "-b", "feature/side", "main", cwd=repo)
+    _git("commit", "-q", "--allow-empty", "-m", "side", cwd=repo)
+    _git("merge", "-q", "--no-edit", "--no-ff", "feature/one", cwd=repo)
+    _git("checkout", "-q", "main", cwd=repo)
+    _git("merge", "-q", "--no-edit", "--no-ff", "feature/two", cwd=repo)
+    _git("commit", "-q", "--allow-empty", "-m", "main moves", cwd=repo)
+    _git("checkout", "-q", "--orphan", "feature/lone", cwd=repo)
+    _git("commit", "-q", "--allow-empty", "-m", "lone", cwd=repo)
+    _git("checkout", "-q", "main", cwd=repo)
+    monkeypatch.chdir(repo)
+
+    _, local = report_branches.scan_branches("main", "origin")
+    assert sorted(local) == ["feature/lone", "feature/one", "feature/side"]
+    for name, tip in local.items():
+        assert (tip.ahead, tip.behind) == _rev_list_counts(repo, name), name
+        assert len(tip.date) == 10
+
+
+def test_native_ahead_behind_skips_the_history_walk(monkeypatch) -> None:
+    calls: list[list[str]] = []
+
+    def fake_run(cmd, timeout=report_branches.GIT_TIMEOUT, input=None):
+        calls.append(cmd)
+        out = "refs/heads/feature/one\tabc123\t2026-02-01\t2 5\nrefs/remotes/origin/HEAD\tdef456\t2026-02-02\t0 0\n"
+        return subprocess.CompletedProcess(cmd, 0, out, "")
+
+    monkeypatch.setattr(report_branches, "run", fake_run)
+    remote, local = report_branches.scan_branches("origin/main", "origin", ahead_behind=True)
+    assert remote == {}
+    assert (local["feature/one"].ahead, local["feature/one"].behind) == (2, 5)
+    assert local["feature/one"].date == "2026-02-01"
+    assert len(calls) == 1
+    assert "%(ahead-behind:origin/main)" in calls[0][2]
+
+
+def test_report_shows_divergence_and_last_commit(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    _init_repo(repo)
+    _git("commit", "-q", "--allow-empty", "-m", "main moves", cwd=repo)
+    env = _shims(tmp_path, git_delay=0, gh_delay=0)
+    result, _ = _report(repo, env)
+    assert result.returncode == 0, result.stderr
+    assert "Ahead/Behind" in result.stdout
+    row = next(line for line in result.stdout.splitlines() if line.startswith("feature/two"))
+    assert "+1/-1" in row
+    assert time.strftime("%Y-%m-%d") in row
@@ -6,6 +6,7 @@ import json
 import os
 import shutil
 import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
@@ -19,6 +20,13 @@ def _run(cmd: list[str], cwd: Path, env: dict[str, str] | None = None) -> subpro
     return subprocess.run(cmd, cwd=cwd, env=run_env, text=True, capture_output=True, check=False)
 
 
+def _registry_rows(repo: Path) -> list[dict]:
+    """Read the registry through its CLI; the JSON file is only written on export."""
+    result = _run([sys.executable, str(repo / "parallelus/engine" / "bin" / "subagent_registry.py"), "list"], cwd=repo)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
 def _init_repo(tmp: Path, branch: str = "feature/preflight") -> None:
     shutil.copytree(REPO_ROOT / "parallelus/engine", tmp / "parallelus/engine")
     shutil.copytree(REPO_ROOT / "parallelus/manuals/templates", tmp / "parallelus/manuals/templates")
@@ -150,8 +158,7 @@ def test_review_preflight_default_launch_marks_awaiting_when_not_started() -> No
         assert cmd.returncode == 0, cmd.stderr
         assert "awaiting_manual_launch" in cmd.stderr
 
-        registry_path = repo / "parallelus" / "manuals" / "subagent-registry.json"
-        data = json.loads(registry_path.read_text(encoding="utf-8"))
+        data = _registry_rows(repo)
         assert data, "expected a launch registry entry"
         entry = data[-1]
         assert entry["launcher"] == "auto"
@@ -215,7 +222,7 @@ def test_review_preflight_auto_cleans_stale_awaiting_entries_before_launch() ->
         assert "auto-cleaning stale awaiting_manual_launch entry" in cmd.stderr
         assert "awaiting_manual_launch" in cmd.stderr
 
-        data = json.loads(registry_path.read_text(encoding="utf-8"))
+        data = _registry_rows(repo)
         stale = next(row for row in data if row.get("id") == stale_id)
         assert stale["status"] == "cleaned"
         newest = data[-1]
@@ -281,8 +288,7 @@ exit 0
         review_file = repo / "docs" / "parallelus" / "reviews" / f"{slug}-2099-01-01.md"
         assert review_file.exists()
 
-        registry_path = repo / "parallelus" / "manuals" / "subagent-registry.json"
-        data = json.loads(registry_path.read_text(encoding="utf-8"))
+        data = _registry_rows(repo)
         assert data, "expected a launch registry entry"
         entry = data[-1]
         assert entry["status"] == "cleaned"
@@ -394,3 +400,58 @@ def test_review_preflight_no_launch_skips_retro_pipeline_when_disabled() -> None
 
         marker_path = repo / "docs" / "parallelus" / "self-improvement" / "markers" / f"{slug}.json"
         assert not marker_path.exists()
+
+
+def test_retro_preflight_runs_pipeline_in_one_process_with_timings() -> None:
+    with tempfile.TemporaryDirectory(prefix="review-preflight-inproc-") as tmpdir:
+        repo = Path(tmpdir)
+        branch = "feature/inproc"
+        slug = branch.replace("/", "-")
+        _init_repo(repo, branch=branch)
+        agentrc = repo / "parallelus/engine/agentrc"
+        agentrc.write_text(
+            agentrc.read_text(encoding="utf-8").replace("AGENTS_REQUIRE_RETRO=0", "AGENTS_REQUIRE_RETRO=1"),
+            encoding="utf-8",
+        )
+        session_log = repo / ".parallelus" / "sessions" / "001-inproc" / "console.log"
+        session_log.parent.mkdir(parents=True, exist_ok=True)
+        session_log.write_text("ERROR flaky network\n", encoding="utf-8")
+
+        result = _run([str(repo / "parallelus/engine" / "bin" / "retro_preflight.py")], cwd=repo)
+        assert result.returncode == 0, result.stderr
+        lines = result.stdout.splitlines()
+        assert [line.split(":", 1)[0] for line in lines] == [
+            "retro-marker",
+            "collect_failures",
+            "retro_audit_local",
+            "verify-retrospective",
+            "retro_preflight",
+        ]
+        for stage in ("setup", "marker", "failures", "audit", "verify", "total"):
+            assert f" {stage}=" in lines[-1]
+
+        marker = json.loads(
+            (repo / "docs/parallelus/self-improvement/markers" / f"{slug}.json").read_text(encoding="utf-8")
+        )
+        report = json.loads(
+            (repo / "docs/parallelus/self-improvement/reports" / f"{slug}--{marker['timestamp']}.json").read_text(
+                encoding="utf-8"
+            )
+        )
+        assert report["marker_timestamp"] == marker["timestamp"]
+        assert len(report["issues"]) == 1
+        assert "ERROR flaky network" in report["issues"][0]["evidence"]
+
+        # The separate scripts accept what the in-process pipeline wrote.
+        audit = _run([str(repo / "parallelus/engine" / "bin" / "retro_audit_local.py")], cwd=repo)
+        assert audit.returncode == 0, audit.stderr
+        rerun = json.loads(
+            (repo / "docs/parallelus/self-improvement/reports" / f"{slug}--{marker['timestamp']}.json").read_text(
+                encoding="utf-8"
+            )
+        )
+        assert {key: value for key, value in rerun.items() if key != "generated_at"} == {
+            key: value for key, value in report.items() if key != "generated_at"
+        }
+        verify = _run([str(repo / "parallelus/engine" / "bin" / "verify-retrospective")], cwd=repo)
+        assert verify.returncode == 0, verify.stderr
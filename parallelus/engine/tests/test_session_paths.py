@@ -55,6 +55,12 @@ def _parse_export(stdout: str, key: str) -> str:
     raise AssertionError(f"missing export for {key}: {stdout}")
 
 
+def _read_failures(summary_path: Path) -> list[dict]:
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    stream = summary_path.with_name(summary["failures_file"])
+    return [json.loads(line) for line in stream.read_text(encoding="utf-8").splitlines() if line]
+
+
 def test_session_start_writes_to_parallelus_sessions_root() -> None:
     with tempfile.TemporaryDirectory(prefix="session-path-start-") as tmpdir:
         repo = Path(tmpdir)
@@ -196,10 +202,8 @@ def test_collect_failures_scans_parallelus_session_logs_only() -> None:
         assert result.returncode == 0, result.stderr
 
         rel_out = result.stdout.strip().split("wrote ", 1)[-1]
-        report = json.loads((repo / rel_out).read_text(encoding="utf-8"))
-        failure_sources = {
-            str(Path(item.get("source", "")).resolve()) for item in report.get("failures", []) if item.get("source")
-        }
+        failures = _read_failures(repo / rel_out)
+        failure_sources = {str(Path(item.get("source", "")).resolve()) for item in failures if item.get("source")}
         assert str(new_log.resolve()) in failure_sources
         assert str(legacy_log.resolve()) not in failure_sources
 
@@ -243,10 +247,9 @@ def test_collect_failures_dedupes_overlapping_parallelus_globs() -> None:
         assert result.returncode == 0, result.stderr
 
         rel_out = result.stdout.strip().split("wrote ", 1)[-1]
-        report = json.loads((repo / rel_out).read_text(encoding="utf-8"))
         matching = [
             item
-            for item in report.get("failures", [])
+            for item in _read_failures(repo / rel_out)
             if Path(item.get("source", "")).resolve() == events_path.resolve()
             and item.get("kind") == "exec_command_end"
         ]
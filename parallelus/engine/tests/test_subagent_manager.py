@@ -6,6 +6,7 @@ import json
 import os
 import shutil
 import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
@@ -37,6 +38,17 @@ def _registry_path(repo: Path) -> Path:
     return repo / "parallelus" / "manuals" / "subagent-registry.json"
 
 
+def _registry_rows(repo: Path) -> list[dict]:
+    """Read the registry through its CLI; the JSON file is only written on export."""
+    result = _run(
+        [sys.executable, str(repo / "parallelus/engine" / "bin" / "subagent_registry.py"), "list"],
+        cwd=repo,
+        env={"SUBAGENT_REGISTRY_FILE": str(_registry_path(repo))},
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
 def _manager_path(repo: Path) -> Path:
     return repo / "parallelus/engine" / "bin" / "subagent_manager.sh"
 
@@ -115,7 +127,7 @@ def test_harvest_detects_changed_baseline_review_file() -> None:
         assert copied_review.exists()
         assert f"Reviewed-Commit: {head}" in copied_review.read_text(encoding="utf-8")
 
-        data = json.loads(registry.read_text(encoding="utf-8"))
+        data = _registry_rows(repo)
         row = data[0]
         deliverable = row["deliverables"][0]
         assert row["deliverables_status"] == "harvested"
@@ -176,7 +188,7 @@ def test_cleanup_blocks_unharvested_deliverables_without_force() -> None:
         assert forced.returncode == 0, forced.stderr
         assert not sandbox.exists()
 
-        data = json.loads(registry.read_text(encoding="utf-8"))
+        data = _registry_rows(repo)
         assert data[0]["status"] == "cleaned"
 
 
@@ -218,7 +230,7 @@ def test_abort_marks_entry_and_preserves_sandbox() -> None:
         assert "Aborted test-abort" in aborted.stdout
         assert sandbox.exists()
 
-        data = json.loads(registry.read_text(encoding="utf-8"))
+        data = _registry_rows(repo)
         row = data[0]
         assert row["status"] == "aborted_timeout"
         assert row.get("aborted_reason") == "timeout"
@@ -0,0 +1,115 @@
+"""Tests for the SQLite-backed subagent registry and its JSON export."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BIN_DIR = REPO_ROOT / "parallelus/engine" / "bin"
+TOOL = BIN_DIR / "subagent_registry.py"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+from subagent_registry import Registry, open_registry  # noqa: E402
+
+
+def _cli(tmp: Path, *args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, str(TOOL), "--registry", str(tmp / "registry.json"), "--db", str(tmp / "registry.sqlite"), *args],
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+
+
+def _entry(index: int, status: str = "running") -> dict:
+    return {"id": f"20260301-{index:06d}-ci-audit", "slug": "ci-audit", "type": "throwaway", "status": status}
+
+
+def test_concurrent_appends_and_updates_are_not_lost(tmp_path: Path) -> None:
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda i: _cli(tmp_path, "append", json.dumps(_entry(i))), range(24)))
+    assert all(result.returncode == 0 for result in results), [r.stderr for r in results]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        fields = ["--set", "status=cleaned", "--set", "note=a=b"]
+        results = list(pool.map(lambda i: _cli(tmp_path, "update", _entry(i)["id"], *fields), range(0, 24, 2)))
+    assert all(result.returncode == 0 for result in results), [r.stderr for r in results]
+
+    # Writes only touch the store; the JSON file appears on export.
+    assert not (tmp_path / "registry.json").exists()
+    assert _cli(tmp_path, "export").returncode == 0
+    exported = json.loads((tmp_path / "registry.json").read_text(encoding="utf-8"))
+    assert sorted(row["id"] for row in exported) == sorted(_entry(i)["id"] for i in range(24))
+    cleaned = [row for row in exported if row["status"] == "cleaned"]
+    assert len(cleaned) == 12
+    assert all(row["note"] == "a=b" for row in cleaned)
+    assert _cli(tmp_path, "update", _entry(1)["id"], "--set", "row['status'] = 'x'").returncode != 0
+
+
+def test_lookups_use_id_slug_and_status(tmp_path: Path) -> None:
+    registry = Registry(tmp_path / "registry.json", tmp_path / "registry.sqlite")
+    registry.append(_entry(1, "Running"))
+    registry.append({**_entry(2, "cleaned"), "slug": "senior-review"})
+    registry.append(_entry(3, "awaiting_manual_launch"))
+
+    assert registry.get(_entry(2)["id"])["slug"] == "senior-review"
+    assert registry.get("missing") is None
+    assert [row["id"] for row in registry.find(slug="ci-audit")] == [_entry(1)["id"], _entry(3)["id"]]
+    assert [row["id"] for row in registry.find(status="running")] == [_entry(1)["id"]]
+    assert registry.find(slug="ci-audit", status="cleaned") == []
+    plan = registry.conn.execute("EXPLAIN QUERY PLAN SELECT data FROM entries WHERE slug = ? AND status = ?", ("a", "b"))
+    assert "entries_slug" in " ".join(str(row) for row in plan)
+    assert registry.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    registry.close()
+
+    missing = _cli(tmp_path, "get", "missing")
+    assert missing.returncode != 0
+    assert "unknown id missing" in missing.stderr
+
+
+def test_existing_json_is_imported_once_and_exported_on_demand(tmp_path: Path) -> None:
+    json_path = tmp_path / "registry.json"
+    json_path.write_text(json.dumps([_entry(1), _entry(2)], indent=2), encoding="utf-8")
+    with Registry(json_path, tmp_path / "registry.sqlite") as registry:
+        assert len(registry.find()) == 2
+        registry.update(_entry(1)["id"], lambda row: row.update(status="verified"))
+    assert [row["status"] for row in json.loads(json_path.read_text(encoding="utf-8"))] == ["running", "running"]
+
+    # e.g. `git checkout -- parallelus/manuals/subagent-registry.json`: the store stays authoritative.
+    json_path.write_text(json.dumps([_entry(7, "awaiting_manual_launch")], indent=2), encoding="utf-8")
+    with Registry(json_path, tmp_path / "registry.sqlite") as registry:
+        assert registry.find(status="awaiting_manual_launch") == []
+        registry.append(_entry(8))
+    assert _cli(tmp_path, "export").returncode == 0
+    exported = json.loads(json_path.read_text(encoding="utf-8"))
+    assert [(row["id"], row["status"]) for row in exported] == [
+        (_entry(1)["id"], "verified"),
+        (_entry(2)["id"], "running"),
+        (_entry(8)["id"], "running"),
+    ]
+
+    # An emptied store after the first open is not refilled from the file.
+    with Registry(json_path, tmp_path / "registry.sqlite") as registry:
+        registry.conn.execute("DELETE FROM entries")
+    assert json.loads(_cli(tmp_path, "list").stdout) == []
+    copy = tmp_path / "copy.json"
+    assert _cli(tmp_path, "export", "--output", str(copy)).returncode == 0
+    assert json.loads(copy.read_text(encoding="utf-8")) == []
+
+
+def test_default_paths_resolve_against_repo_root(tmp_path: Path, monkeypatch) -> None:
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    nested = tmp_path / "docs" / "nested"
+    nested.mkdir(parents=True)
+    monkeypatch.chdir(nested)
+    monkeypatch.delenv("SUBAGENT_REGISTRY_FILE", raising=False)
+    monkeypatch.delenv("SUBAGENT_REGISTRY_DB", raising=False)
+    with open_registry() as registry:
+        assert registry.db_path.resolve() == (tmp_path / ".parallelus/cache/subagent-registry.sqlite").resolve()
+        assert registry.json_path.resolve() == (tmp_path / "parallelus/manuals/subagent-registry.json").resolve()
+    assert not (nested / ".parallelus").exists()
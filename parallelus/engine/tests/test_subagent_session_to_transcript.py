@@ -0,0 +1,107 @@
+"""Tests for the streaming subagent session -> Markdown transcript converter."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BIN_DIR = REPO_ROOT / "parallelus/engine" / "bin"
+SCRIPT = BIN_DIR / "subagent_session_to_transcript.py"
+if str(BIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BIN_DIR))
+
+from subagent_session_to_transcript import ConversionStats, iter_entries  # noqa: E402
+
+
+def _event(msg: dict, ts: str = "2026-03-01T10:00:00Z") -> str:
+    return json.dumps({"ts": ts, "kind": "codex_event", "payload": {"id": "", "msg": msg}}) + "\n"
+
+
+def _agent(text: str) -> str:
+    return _event({"type": "agent_message", "message": text})
+
+
+def test_malformed_lines_are_skipped_and_counted(tmp_path: Path) -> None:
+    session = tmp_path / "session.jsonl"
+    session.write_text(
+        _agent("first")
+        + '{"ts": "2026-03-01T10:00:01Z", "payload": {\n'
+        + "[1, 2, 3]\n"
+        + _event({"type": "exec_command_end", "exit_code": 0, "stdout": ["not", "text"]})
+        + "\n"
+        + _event({"type": "exec_command_begin", "command": ["make", "ci"]})
+        + _agent("last"),
+        encoding="utf-8",
+    )
+    stats = ConversionStats()
+    entries = list(iter_entries(session, stats))
+    assert [role for _, role, _ in entries] == ["Subagent", "Command", "Subagent"]
+    assert entries[1][2] == "make ci"
+    assert stats.skipped == 3
+
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), str(session)], cwd=tmp_path, text=True, capture_output=True, check=False
+    )
+    assert result.returncode == 0, result.stderr
+    assert "skipped 3 malformed line(s)" in result.stderr
+    transcript = (tmp_path / "session-transcript.md").read_text(encoding="utf-8")
+    assert transcript.startswith("# Subagent Session Transcript\n\n")
+    assert "Subagent: last" in transcript
+
+
+def test_follow_appends_as_the_session_grows(tmp_path: Path) -> None:
+    session = tmp_path / "session.jsonl"
+    output = tmp_path / "live.md"
+    session.write_text(_agent("hello"), encoding="utf-8")
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            str(SCRIPT),
+            str(session),
+            "--output",
+            str(output),
+            "--follow",
+            "--interval",
+            "0.05",
+            "--idle-exit",
+            "1.5",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    def wait_for(text: str) -> str:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            content = output.read_text(encoding="utf-8") if output.exists() else ""
+            if text in content:
+                return content
+            time.sleep(0.05)
+        raise AssertionError(f"{text!r} never appeared in {output}")
+
+    try:
+        wait_for("Subagent: hello")
+        line = _event({"type": "exec_command_begin", "command": ["pytest", "-q"]})
+        with session.open("a", encoding="utf-8") as fh:
+            # A line written in two pieces is only converted once it is complete.
+            fh.write(line[:20])
+            fh.flush()
+            time.sleep(0.3)
+            assert "pytest" not in output.read_text(encoding="utf-8")
+            fh.write(line[20:])
+            fh.write("not json\n")
+            fh.write(_agent("still going"))
+        content = wait_for("Subagent: still going")
+        assert content.count("Subagent: hello") == 1
+        assert "Command: pytest -q" in content
+        stdout, stderr = proc.communicate(timeout=10)
+    finally:
+        proc.kill()
+    assert proc.returncode == 0, stderr
+    assert "(3 entries)" in stdout
+    assert "skipped 1 malformed line(s)" in stderr
@@ -16,8 +16,11 @@
 set -euo pipefail
 
 ROOT=$(git rev-parse --show-toplevel 2>/dev/null || pwd)
-REGISTRY="$ROOT/parallelus/manuals/subagent-registry.json"
-REGISTRY_BACKUP=$(mktemp)
+# A scratch registry keeps synthetic entries out of the real store; the
+# monitor loop and subagent_manager.sh pick it up from the environment.
+REGISTRY_DIR=$(mktemp -d)
+export SUBAGENT_REGISTRY_FILE="$REGISTRY_DIR/subagent-registry.json"
+REGISTRY_TOOL="$ROOT/parallelus/engine/bin/subagent_registry.py"
 SANDBOX_ROOT="$ROOT/.parallelus/test-monitor-scenario"
 KEEP_SESSION=${KEEP_SESSION:-1}
 MONITOR_LOG_PATH=${MONITOR_LOG_PATH:-}
@@ -38,8 +41,6 @@ NUDGE_MESSAGE=${NUDGE_MESSAGE:-Proceed}
 HARNESS_TIMEOUT=${HARNESS_TIMEOUT:-0}
 
 mkdir -p "$SANDBOX_ROOT"
-cp "$REGISTRY" "$REGISTRY_BACKUP"
-printf '[]\n' >"$REGISTRY"
 
 WINDOW_ID=""
 MAIN_PANE=""
@@ -202,8 +203,7 @@ cleanup() {
     fi
     echo "When finished, collapse with: tmux kill-pane -a -t $MAIN_PANE" >&2
   fi
-  cp "$REGISTRY_BACKUP" "$REGISTRY"
-  rm -f "$REGISTRY_BACKUP"
+  rm -rf "$REGISTRY_DIR"
   if [[ -z "$MONITOR_LOG_PATH" ]]; then
     rm -f "$MONITOR_LOG"
   fi
@@ -218,39 +218,13 @@ trap cleanup EXIT
 
 python_append_entry() {
   local entry_json=$1
-  python3 - "$REGISTRY" "$entry_json" <<'PY'
-import json
-import sys
-
-path, payload_json = sys.argv[1:3]
-with open(path, 'r', encoding='utf-8') as fh:
-    data = json.load(fh)
-data.append(json.loads(payload_json))
-with open(path, 'w', encoding='utf-8') as fh:
-    json.dump(data, fh, indent=2)
-PY
+  python3 "$REGISTRY_TOOL" append "$entry_json"
 }
 
 python_update_status() {
   local id=$1 status=$2 deliverable_state=${3:-}
-  python3 - "$REGISTRY" "$id" "$status" "$deliverable_state" <<'PY'
-import json
-import sys
-
-path, entry_id, status, deliverable_state = sys.argv[1:5]
-with open(path, 'r', encoding='utf-8') as fh:
-    data = json.load(fh)
-for row in data:
-    if row.get('id') == entry_id:
-        row['status'] = status
-        if deliverable_state:
-            row['deliverables_status'] = deliverable_state
-        break
-else:
-    raise SystemExit(f"entry {entry_id} not found")
-with open(path, 'w', encoding='utf-8') as fh:
-    json.dump(data, fh, indent=2)
-PY
+  python3 "$REGISTRY_TOOL" update "$id" --set "status=$status" \
+    ${deliverable_state:+--set "deliverables_status=$deliverable_state"}
 }
 
 python_expectations() {